@@ -0,0 +1,130 @@
+"""
+Admission control, sheds load before it reaches DB pool.
+Requests are classified by method and path (`classify`), admitted by
+    `AdaptiveLimiter` or answered 503 with `Retry-After` right away when
+    their class's queue is full, or after `ADMISSION_QUEUE_TIMEOUT_MS`
+    of waiting, instead of waiting in pool until they time out.
+Health, metrics, admin and docs are never limited, probes must answer
+    most when worker is saturated.
+Off with `ADMISSION_CONTROL=0`.
+"""
+
+import json
+import math
+import os
+import typing
+
+from loguru import logger
+
+from backend.admission import limiter
+from backend.metrics import prometheus
+
+ENABLED: bool = os.getenv("ADMISSION_CONTROL", "1") != "0"
+RETRY_AFTER_S: int = int(
+    os.getenv("ADMISSION_RETRY_AFTER_S")
+    or math.ceil(limiter.QUEUE_TIMEOUT_MS / 1000)
+)
+EXEMPT_PREFIXES: tuple[str, ...] = (
+    "/health",
+    "/metrics",
+    "/admin",
+    "/about",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+)
+WRITE_METHODS: frozenset[str] = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def classify(method: str, path: str) -> typing.Optional[str]:
+    """Request class of route, None when it isn't limited."""
+    path = path.rstrip("/") or "/"
+    if path.startswith(EXEMPT_PREFIXES):
+        return None
+    # Whole table or whole geometry, streamed
+    if (
+        path == "/projects/export"
+        or path.endswith("/stream")
+        or (method == "DELETE" and path == "/projects")
+    ):
+        return limiter.BULK
+    if method in WRITE_METHODS:
+        return limiter.WRITE
+    return limiter.READ
+
+
+class AdmissionMiddleware:
+    """Pure ASGI, slot is held until response is fully sent."""
+
+    def __init__(
+        self,
+        app: typing.Any,
+        admission: typing.Optional[limiter.AdaptiveLimiter] = None,
+    ) -> None:
+        self.app = app
+        self.limiter = admission or limiter.AdaptiveLimiter()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        request_class = classify(scope["method"], path)
+        if request_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            admitted = await self.limiter.acquire(request_class)
+        except limiter.Rejected as exc:
+            await self._shed(send, request_class, exc.reason)
+            return
+        status_code = None
+        error = None
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Answered 501 by outer exception handler, cause decides
+            error = exc
+            raise
+        finally:
+            self.limiter.release(
+                request_class,
+                admitted,
+                overloaded=limiter.is_overload(status_code, error),
+            )
+
+    async def _shed(self, send, request_class: str, reason: str) -> None:
+        if prometheus.prometheus_client is not None:
+            prometheus.ADMISSION_SHED.labels(request_class, reason).inc()
+        logger.opt(lazy=True).warning(
+            "Shed {request_class} request, {reason}, limit {limit:.1f}",
+            request_class=lambda: request_class,
+            reason=lambda: reason,
+            limit=lambda: self.limiter.limit,
+        )
+        body = json.dumps(
+            {"detail": "Server is busy, retry later.", "reason": reason}
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(RETRY_AFTER_S).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,290 @@
+"""
+Adaptive concurrency limit of worker, shared by all request classes.
+Limit starts at DB pool capacity, requests hold pooled connection for
+    their whole duration, so more in flight would only queue in pool.
+AIMD: latency over `LATENCY_TOLERANCE` times class's long run average
+    (and over `MIN_CONGESTED_MS`) or overload (`is_overload`) multiplies
+    limit by
+    `BACKOFF`, once per round, requests admitted before last decrease
+    don't decrease it again. Requests finishing in time while limit is
+    in use add `1 / limit` each, about one per limit's worth of them.
+Waiting requests are admitted highest priority class first, FIFO within
+    class, each class has own concurrency cap and queue depth.
+"""
+
+import asyncio
+import collections
+import dataclasses
+import os
+import time
+import typing
+
+from sqlalchemy import exc as sa_exc
+
+from backend.database.postgres import config
+from backend.metrics import prometheus
+
+POOL_CAPACITY: int = config.POOL_SIZE + max(config.POOL_MAX_OVERFLOW, 0)
+MAX_LIMIT: int = int(os.getenv("ADMISSION_MAX_LIMIT") or POOL_CAPACITY)
+MIN_LIMIT: int = int(os.getenv("ADMISSION_MIN_LIMIT") or 1)
+BACKOFF: float = 0.9
+LATENCY_TOLERANCE: float = float(
+    os.getenv("ADMISSION_LATENCY_TOLERANCE") or 2.0
+)
+# Below this nothing is congestion, fast routes are noisy in relative terms
+MIN_CONGESTED_MS: float = float(os.getenv("ADMISSION_MIN_CONGESTED_MS") or 50)
+# Weight of new sample in long run latency average
+LATENCY_ALPHA: float = 0.01
+QUEUE_TIMEOUT_MS: float = float(
+    os.getenv("ADMISSION_QUEUE_TIMEOUT_MS") or 2000
+)
+
+READ: str = "read"
+WRITE: str = "write"
+BULK: str = "bulk"
+
+QUEUE_FULL: str = "queue_full"
+QUEUE_TIMEOUT: str = "queue_timeout"
+
+# Other 5xx aren't load: unexpected exceptions are answered 501 and any
+#   client can trigger them, so they mustn't shrink everyone's limit
+OVERLOAD_STATUSES: frozenset[int] = frozenset({503, 504})
+OVERLOAD_ERRORS: tuple[type[BaseException], ...] = (
+    TimeoutError,
+    ConnectionError,
+    sa_exc.TimeoutError,  # Pool checkout
+    sa_exc.DisconnectionError,
+    sa_exc.OperationalError,  # DB connection lost or refused
+)
+
+
+def is_overload(
+    status_code: typing.Optional[int],
+    error: typing.Optional[BaseException] = None,
+) -> bool:
+    """
+    Whether finished request shows worker or DB overload.
+    `DbContext` re-raises errors wrapped, so whole chain is checked.
+    """
+    if status_code in OVERLOAD_STATUSES:
+        return True
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, OVERLOAD_ERRORS) or (
+            isinstance(error, sa_exc.DBAPIError)
+            and error.connection_invalidated
+        ):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+@dataclasses.dataclass
+class RequestClass:
+    """
+    :param priority: Lower is admitted first.
+    :param limit: Most in flight at once, on top of shared limit.
+    :param queue: Most waiting, more are shed at once.
+    :param adaptive: Latency adjusts shared limit, off for classes
+        whose latency follows payload size, not load.
+    """
+
+    name: str
+    priority: int
+    limit: int
+    queue: int
+    adaptive: bool = True
+
+
+def default_classes() -> dict[str, RequestClass]:
+    """Reads ahead of writes, bulk endpoints capped and shallow."""
+    return {
+        READ: RequestClass(
+            READ,
+            priority=0,
+            limit=MAX_LIMIT,
+            queue=int(os.getenv("ADMISSION_READ_QUEUE") or 64),
+        ),
+        WRITE: RequestClass(
+            WRITE,
+            priority=1,
+            limit=int(
+                os.getenv("ADMISSION_WRITE_LIMIT")
+                or max(1, MAX_LIMIT * 2 // 3)
+            ),
+            queue=int(os.getenv("ADMISSION_WRITE_QUEUE") or 32),
+        ),
+        BULK: RequestClass(
+            BULK,
+            priority=2,
+            limit=int(os.getenv("ADMISSION_BULK_LIMIT") or 2),
+            queue=int(os.getenv("ADMISSION_BULK_QUEUE") or 4),
+            adaptive=False,
+        ),
+    }
+
+
+class Rejected(Exception):
+    """Request shed, `reason` is `QUEUE_FULL` or `QUEUE_TIMEOUT`."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdaptiveLimiter:
+    """Per worker, all of it runs on event loop thread, no locks."""
+
+    def __init__(
+        self,
+        classes: typing.Optional[dict[str, RequestClass]] = None,
+        max_limit: int = MAX_LIMIT,
+        min_limit: int = MIN_LIMIT,
+        queue_timeout_ms: float = QUEUE_TIMEOUT_MS,
+    ) -> None:
+        self.classes = classes or default_classes()
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.limit: float = float(max_limit)
+        self.in_flight = 0
+        self.class_in_flight: dict[str, int] = dict.fromkeys(self.classes, 0)
+        self.waiters: dict[str, collections.deque] = {
+            name: collections.deque() for name in self.classes
+        }
+        # Long run latency per class, seconds
+        self.latency: dict[str, typing.Optional[float]] = dict.fromkeys(
+            self.classes
+        )
+        self._last_decrease: float = 0.0
+        self._by_priority = sorted(
+            self.classes.values(), key=lambda c: c.priority
+        )
+        self._report_limit()
+
+    def _has_room(self, request_class: RequestClass) -> bool:
+        return (
+            self.in_flight < int(self.limit)
+            and self.class_in_flight[request_class.name] < request_class.limit
+        )
+
+    def _take(self, name: str) -> None:
+        self.in_flight += 1
+        self.class_in_flight[name] += 1
+
+    async def acquire(self, name: str) -> float:
+        """
+        Waits for slot, at most `queue_timeout`.
+        :return: Admission time, pass it back to `release`.
+        :raises Rejected: When queue is full or wait timed out.
+        """
+        request_class = self.classes[name]
+        waiting = self.waiters[name]
+        # Queued requests of same or higher priority go first
+        ahead = any(
+            self.waiters[other.name]
+            for other in self._by_priority
+            if other.priority <= request_class.priority
+        )
+        if not ahead and self._has_room(request_class):
+            self._take(name)
+            return time.perf_counter()
+        if len(waiting) >= request_class.queue:
+            raise Rejected(QUEUE_FULL)
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiting.append(waiter)
+        self._report_queue(name)
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away, slot granted meanwhile goes to next one
+            self._forget(name, waiter, granted=waiter.done())
+            raise
+        if not waiter.done():
+            self._forget(name, waiter, granted=False)
+            raise Rejected(QUEUE_TIMEOUT)
+        return time.perf_counter()
+
+    def _forget(self, name: str, waiter: asyncio.Future, granted: bool):
+        if granted:
+            self.release(name, admitted=None)
+            return
+        waiter.cancel()
+        try:
+            self.waiters[name].remove(waiter)
+        except ValueError:
+            pass
+        self._report_queue(name)
+
+    def release(
+        self,
+        name: str,
+        admitted: typing.Optional[float],
+        overloaded: bool = False,
+    ) -> None:
+        """
+        Frees slot and feeds latency of finished request to limit.
+        :param admitted: Return value of `acquire`, None skips feedback.
+        :param overloaded: `is_overload` of request, congestion
+            whatever latency.
+        """
+        self.in_flight -= 1
+        self.class_in_flight[name] -= 1
+        if admitted is not None and self.classes[name].adaptive:
+            self._observe(name, admitted, overloaded)
+        self._wake()
+
+    def _observe(self, name: str, admitted: float, overloaded: bool) -> None:
+        now = time.perf_counter()
+        latency = now - admitted
+        average = self.latency[name]
+        congested = overloaded or (
+            average is not None
+            and latency * 1000 > MIN_CONGESTED_MS
+            and latency > average * LATENCY_TOLERANCE
+        )
+        if not overloaded:
+            self.latency[name] = (
+                latency
+                if average is None
+                else average + LATENCY_ALPHA * (latency - average)
+            )
+        if congested:
+            # Requests admitted under old limit report same congestion
+            if admitted >= self._last_decrease:
+                self.limit = max(self.min_limit, self.limit * BACKOFF)
+                self._last_decrease = now
+                self._report_limit()
+        elif self.in_flight + 1 >= int(self.limit) // 2:
+            # Grow only while limit is in use, idle worker stays put
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._report_limit()
+
+    def _wake(self) -> None:
+        """Hands free slots to waiters, by priority."""
+        for request_class in self._by_priority:
+            waiting = self.waiters[request_class.name]
+            while waiting and self._has_room(request_class):
+                waiter = waiting.popleft()
+                if waiter.done():  # Cancelled, not yet forgotten
+                    continue
+                self._take(request_class.name)
+                waiter.set_result(None)
+            self._report_queue(request_class.name)
+            if self.in_flight >= int(self.limit):
+                return
+
+    def queued(self, name: str) -> int:
+        return len(self.waiters[name])
+
+    def _report_limit(self) -> None:
+        if prometheus.prometheus_client is not None:
+            prometheus.ADMISSION_LIMIT.set(self.limit)
+
+    def _report_queue(self, name: str) -> None:
+        if prometheus.prometheus_client is not None:
+            prometheus.ADMISSION_QUEUED.labels(name).set(
+                len(self.waiters[name])
+            )
@@ -0,0 +1,228 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import exc as sa_exc
+
+from backend.admission import admission_middleware, limiter
+
+
+def _limiter(limit: int = 1, queue: int = 4, **kwargs):
+    classes = {
+        name: limiter.RequestClass(
+            name, priority=priority, limit=limit, queue=queue
+        )
+        for priority, name in enumerate(
+            (limiter.READ, limiter.WRITE, limiter.BULK)
+        )
+    }
+    return limiter.AdaptiveLimiter(classes, max_limit=limit, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "method,path,expected",
+    [
+        ("GET", "/project/1", limiter.READ),
+        ("GET", "/projects/list", limiter.READ),
+        ("POST", "/project/", limiter.WRITE),
+        ("DELETE", "/project/1", limiter.WRITE),
+        ("GET", "/project/1/stream", limiter.BULK),
+        ("GET", "/projects/export", limiter.BULK),
+        ("DELETE", "/projects", limiter.BULK),
+        ("GET", "/health/ready", None),
+        ("GET", "/metrics", None),
+        ("PUT", "/admin/log-levels", None),
+    ],
+)
+def test_classify(method, path, expected):
+    assert admission_middleware.classify(method, path) == expected
+
+
+def test_reads_admitted_before_writes():
+    async def run() -> list[str]:
+        admission = _limiter(limit=1)
+        admitted = []
+        held = await admission.acquire(limiter.READ)
+
+        async def request(name: str) -> None:
+            start = await admission.acquire(name)
+            admitted.append(name)
+            admission.release(name, start)
+
+        # Write queued first, read still goes ahead of it
+        write = asyncio.create_task(request(limiter.WRITE))
+        await asyncio.sleep(0)
+        read = asyncio.create_task(request(limiter.READ))
+        await asyncio.sleep(0)
+        admission.release(limiter.READ, held)
+        await asyncio.gather(write, read)
+        return admitted
+
+    assert asyncio.run(run()) == [limiter.READ, limiter.WRITE]
+
+
+def test_shed_when_queue_full_or_wait_too_long():
+    async def run() -> None:
+        admission = _limiter(limit=1, queue=1, queue_timeout_ms=20)
+        await admission.acquire(limiter.READ)
+        waiting = asyncio.create_task(admission.acquire(limiter.READ))
+        await asyncio.sleep(0)
+        with pytest.raises(limiter.Rejected) as full:
+            await admission.acquire(limiter.READ)
+        assert full.value.reason == limiter.QUEUE_FULL
+        with pytest.raises(limiter.Rejected) as timeout:
+            await waiting
+        assert timeout.value.reason == limiter.QUEUE_TIMEOUT
+        assert admission.queued(limiter.READ) == 0
+        assert admission.in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_gives_slot_back():
+    async def run() -> None:
+        admission = _limiter(limit=1)
+        held = await admission.acquire(limiter.READ)
+        waiting = asyncio.create_task(admission.acquire(limiter.READ))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert admission.queued(limiter.READ) == 0
+        admission.release(limiter.READ, held)
+        assert admission.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_limit_backs_off_once_per_round_and_recovers():
+    async def run() -> None:
+        admission = _limiter(limit=10)
+        admission.latency[limiter.READ] = 0.01
+        slow = [await admission.acquire(limiter.READ) for _ in range(2)]
+        time.sleep(0.1)
+        # Both admitted under old limit, one decrease
+        for admitted in slow:
+            admission.release(limiter.READ, admitted)
+        assert admission.limit == pytest.approx(9.0)
+
+        for _ in range(30):
+            held = [await admission.acquire(limiter.READ) for _ in range(8)]
+            for admitted in held:
+                admission.release(limiter.READ, admitted)
+        assert admission.limit == 10.0
+        # Overload is congestion whatever latency
+        admission.release(
+            limiter.READ,
+            await admission.acquire(limiter.READ),
+            overloaded=True,
+        )
+        assert admission.limit == pytest.approx(9.0)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "status_code,error,expected",
+    [
+        (200, None, False),
+        (501, None, False),  # Unexpected exception, client can cause it
+        (500, None, False),
+        (503, None, True),
+        (504, None, True),
+        (None, ValueError("bad cursor"), False),
+        (None, asyncio.TimeoutError(), True),
+        (None, sa_exc.TimeoutError("pool exhausted"), True),
+        (
+            None,
+            sa_exc.OperationalError("SELECT 1", {}, ConnectionRefusedError()),
+            True,
+        ),
+    ],
+)
+def test_is_overload(status_code, error, expected):
+    assert limiter.is_overload(status_code, error) is expected
+
+
+def test_is_overload_follows_wrapped_error():
+    # `DbContext` re-raises as plain Exception
+    try:
+        try:
+            raise sa_exc.TimeoutError("pool exhausted")
+        except sa_exc.TimeoutError:
+            raise Exception({"exc_type": "TimeoutError"})
+    except Exception as exc:
+        assert limiter.is_overload(None, exc)
+
+
+def test_client_errors_keep_limit():
+    app = FastAPI()
+
+    @app.get("/project/{project_id}")
+    async def read(project_id: int):
+        if project_id == 1:
+            raise ValueError("bad cursor")
+        if project_id == 2:
+            return JSONResponse({"detail": "x"}, status_code=501)
+        raise sa_exc.TimeoutError("pool exhausted")
+
+    async def run() -> None:
+        admission = _limiter(limit=10)
+        transport = httpx.ASGITransport(
+            app=admission_middleware.AdmissionMiddleware(app, admission),
+            raise_app_exceptions=False,
+        )
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            for _ in range(5):
+                await client.get("/project/1")
+                await client.get("/project/2")
+            assert admission.limit == 10.0
+            await client.get("/project/3")
+            assert admission.limit == pytest.approx(9.0)
+        assert admission.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_middleware_sheds_with_retry_after():
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.get("/project/{project_id}")
+    async def read(project_id: int):
+        await release.wait()
+        return {"project_id": project_id}
+
+    @app.get("/health/live")
+    async def live():
+        return {"status": "alive"}
+
+    async def run() -> None:
+        admission = _limiter(limit=1, queue=0)
+        transport = httpx.ASGITransport(
+            app=admission_middleware.AdmissionMiddleware(app, admission)
+        )
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            first = asyncio.create_task(client.get("/project/1"))
+            while admission.in_flight == 0:
+                await asyncio.sleep(0)
+            shed = await client.get("/project/2")
+            assert shed.status_code == 503
+            assert shed.headers["retry-after"] == str(
+                admission_middleware.RETRY_AFTER_S
+            )
+            assert shed.json()["reason"] == limiter.QUEUE_FULL
+            # Probes aren't limited
+            assert (await client.get("/health/live")).status_code == 200
+            release.set()
+            assert (await first).status_code == 200
+        assert admission.in_flight == 0
+
+    asyncio.run(run())
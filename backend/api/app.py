@@ -8,39 +8,77 @@ from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
 from starlette import status
 from starlette.exceptions import HTTPException
 from starlette.responses import JSONResponse
 
+from backend.admission import admission_middleware
 from backend.api.routers import (
     about_router,
+    admin_router,
     healthcheck_router,
+    metrics_router,
     project_router,
     projects_router,
 )
 from backend.cache.cache_middleware import CacheMiddleware
 from backend.cache.memory_backend import MemoryBackend
-from backend.database.postgres.session import DbContext, init_db
+from backend.database.postgres import migrations
+from backend.database.postgres.session import dispose_engine, get_engine
 from backend.loguru_logger.logger_setup import log_config, logger_setup
+from backend.metrics import (
+    profiling,
+    prometheus,
+    queries,
+    saturation,
+    slow_queries,
+    startup,
+)
+
+
+async def schema_version() -> typing.Optional[int]:
+    """
+    Version of database schema, None when it can't be read.
+    Schema is managed by `python -m backend.tools.migrate`, run once
+        before workers start, workers never run DDL.
+    """
+    try:
+        version = await migrations.current_version(get_engine())
+    except (OSError, SQLAlchemyError) as exc:
+        logger.warning(f"Schema version unavailable: {exc}")
+        return None
+    if version != migrations.HEAD:
+        logger.warning(
+            f"Schema at version {version}, expected {migrations.HEAD},"
+            " run `python -m backend.tools.migrate`"
+        )
+    return version
 
 
 @asynccontextmanager
 async def lifespan(func_app: FastAPI) -> typing.AsyncContextManager[None]:
     logger_setup()
-    # await init_db(_engine=engine)
-    init_db()
-    db_context = DbContext()
+    prometheus.watch_pool(get_engine().sync_engine.pool)
+    queries.instrument(get_engine().sync_engine)
+    slow_queries.instrument(get_engine().sync_engine, get_engine())
+    # Opens first pooled connection too, first request doesn't pay it
+    await schema_version()
+    saturation.loop_lag.start()
+    startup.mark(startup.READY)
     yield
-    if db_context.engine is not None:
-        # Close the DB connection
-        await db_context.close()
+    await saturation.loop_lag.stop()
+    # Close the DB connections
+    await dispose_engine()
 
 
 _app = FastAPI(lifespan=lifespan, root_path="/api")
 
 
 _app.include_router(router=about_router)
+_app.include_router(router=admin_router)
 _app.include_router(router=healthcheck_router)
+_app.include_router(router=metrics_router)
 _app.include_router(router=project_router)
 _app.include_router(router=projects_router)
 
@@ -56,15 +94,21 @@ _app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["X-Requested-With", "X-Request-ID"],
-    expose_headers=["X-Request-ID"],
+    allow_headers=["X-Requested-With", "X-Request-ID", "X-Profile"],
+    expose_headers=["X-Request-ID", "Server-Timing", "X-Profile-Report"],
 )
 
+if admission_middleware.ENABLED:
+    # Inside cache, hits are answered without taking a slot
+    _app.add_middleware(admission_middleware.AdmissionMiddleware)
+
 cached_endpoints = ["/project", "/projects"]
+excluded_endpoints = ["/stream", "/export", "/changes"]
 backend = MemoryBackend()
 _app.add_middleware(
     CacheMiddleware,
     cached_endpoints=cached_endpoints,
+    excluded_endpoints=excluded_endpoints,
     backend=backend,
 )
 
@@ -73,11 +117,15 @@ _app.add_middleware(
 async def log_user_metadata(
     request: Request, call_next: typing.Any
 ) -> typing.Any:
-    client_ip: str = request.client.host
-    client_port: int = request.client.port
+    # Access line of `exception_logger` carries method and path at INFO
     # client_language = request.headers["accept-language"]
-    logger.info(f"{request.method} {request.url.path}")
-    logger.debug(f"IP={client_ip}, Port={client_port}")
+    logger.opt(lazy=True).debug(
+        "{method} {path} IP={ip}, Port={port}",
+        method=lambda: request.method,
+        path=lambda: request.url.path,
+        ip=lambda: request.client.host,
+        port=lambda: request.client.port,
+    )
     return await call_next(request)
 
 
@@ -86,15 +134,23 @@ async def exception_logger(
     request: Request, call_next: typing.Any
 ) -> typing.Any:
     response = await call_next(request)
-    log_msg: str = (
-        f"{request.method} {request.url.path} {response.status_code}"
-    )
-    metadata_str = log_msg
-    logger.opt(lazy=True).info(log_msg)
+    stats = queries.current()
+
+    def access_line() -> str:
+        log_msg: str = (
+            f"{request.method} {request.url.path} {response.status_code}"
+        )
+        if stats is not None:
+            # Statements of streamed bodies aren't in yet
+            log_msg = f"{log_msg} {stats}"
+        return log_msg
+
+    # Built only when some sink takes INFO
+    logger.opt(lazy=True).info("{x}", x=access_line)
     if response.status_code < 400:
-        # Less than 400
-        logger.opt(lazy=True).debug(metadata_str)
-    elif response.status_code == 422:
+        return response
+    metadata_str = access_line()
+    if response.status_code == 422:
         # 422
         logger.opt(lazy=True).log(
             log_config.request_validation_exception, metadata_str
@@ -104,12 +160,12 @@ async def exception_logger(
         logger.opt(lazy=True).log(log_config.http_exception, metadata_str)
     elif response.status_code == 501:
         # 501
-        logger.opt(lazy=True).exception(
+        logger.opt(lazy=True).log(
             log_config.unexpected_exception, metadata_str
         )
     else:
         # Rest of 500
-        logger.opt(lazy=True).exception(
+        logger.opt(lazy=True).log(
             log_config.handled_internal_exception,
             metadata_str,
         )
@@ -193,6 +249,12 @@ def init_listeners(func_app: FastAPI) -> FastAPI:
 
 _app = init_listeners(_app)
 
+# Inside correlation id, outside every middleware that logs
+_app.add_middleware(queries.QueryStatsMiddleware)
+if profiling.ENABLED:
+    # Not installed at all otherwise, unprofiled requests pay nothing
+    _app.add_middleware(profiling.ProfilingMiddleware)
+
 _app.add_middleware(
     CorrelationIdMiddleware,
     header_name="X-Request-ID",
@@ -203,7 +265,11 @@ _app.add_middleware(
 )
 
 
+# Outermost, so time spent in every other middleware is measured too
+_app.add_middleware(prometheus.MetricsMiddleware)
+
 app: FastAPI = _app
+startup.mark(startup.IMPORTED)
 
 
 # # sudo lsof -i tcp:8080
@@ -0,0 +1,8 @@
+"""Gunicorn server hooks, see `deployment/entrypoints`."""
+
+from backend.metrics import prometheus
+
+
+def child_exit(server, worker) -> None:
+    # Live gauges (in-flight, pool) of dead worker must stop counting
+    prometheus.mark_process_dead(worker.pid)
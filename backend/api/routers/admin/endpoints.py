@@ -0,0 +1,133 @@
+import os
+import secrets
+import typing
+from typing import Annotated
+
+import pydantic
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse
+
+from backend.loguru_logger import logger_setup
+from backend.metrics.slow_queries import slow_query_log
+
+# Unset keeps admin endpoints off, they answer 404
+ADMIN_TOKEN: typing.Optional[str] = os.getenv("ADMIN_TOKEN") or None
+
+
+async def require_admin(
+    authorization: Annotated[typing.Optional[str], Header()] = None,
+) -> None:
+    """
+    Admin endpoints expose SQL parameters (user data) and change
+        logging, `Authorization: Bearer <ADMIN_TOKEN>` is required.
+    :raises HTTPException: 404 when `ADMIN_TOKEN` is not set,
+        401 on missing or wrong token.
+    """
+    if ADMIN_TOKEN is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# Every endpoint below, slow queries and log levels alike
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+
+class LogLevels(pydantic.BaseModel):
+    """Omitted fields keep their current value."""
+
+    level: typing.Optional[str] = None
+    levels: typing.Optional[dict[str, str]] = None
+    sample_rate: typing.Optional[float] = pydantic.Field(None, ge=0, le=1)
+
+
+def _log_levels() -> dict:
+    log_filter = logger_setup.log_filter
+    return {
+        "level": log_filter.level,
+        "levels": log_filter.levels,
+        "sample_rate": log_filter.sample_rate,
+    }
+
+
+@router.get("/slow-queries", include_in_schema=False)
+async def slow_queries(
+    limit: Annotated[
+        typing.Optional[int],
+        Query(ge=1, description="Newest entries only."),
+    ] = None,
+) -> JSONResponse:
+    """
+    Slow statements recorded by this worker, newest first.
+
+    <!--
+    Each entry has statement, truncated parameters, method, route,
+        request id and, for sampled `SELECT`s, `EXPLAIN (ANALYZE, BUFFERS)`
+        plan in JSON format (`null` until captured).
+    Store is per process, other gunicorn workers hold their own,
+        all of them are in warning logs.
+    :param limit: Newest entries only.
+    :return: Threshold and entries.
+    :rtype: JSONResponse
+    """
+    return JSONResponse(
+        content={
+            "threshold_ms": slow_query_log.threshold * 1000,
+            "entries": slow_query_log.snapshot(limit),
+        },
+        status_code=status.HTTP_200_OK,
+    )
+
+
+@router.delete("/slow-queries", include_in_schema=False)
+async def clear_slow_queries() -> Response:
+    """Empties store of this worker, e.g. after fixing an index."""
+    slow_query_log.clear()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/log-levels", include_in_schema=False)
+async def log_levels() -> JSONResponse:
+    """Default level, per-module levels and sample rate of this worker."""
+    return JSONResponse(content=_log_levels())
+
+
+@router.put("/log-levels", include_in_schema=False)
+async def set_log_levels(body: LogLevels) -> JSONResponse:
+    """
+    Changes logging of this worker without restart.
+
+    <!--
+    `levels` replaces all module overrides, e.g.
+        `{"backend.core": "INFO", "backend.api.app": "WARNING"}`.
+    Other gunicorn workers keep theirs, `LOG_LEVELS` and
+        `LOG_SAMPLE_RATE` set every worker at start.
+    :return: Settings now in effect.
+    :rtype: JSONResponse
+    :raises HTTPException: 422 on unknown level.
+    """
+    try:
+        logger_setup.set_levels(body.level, body.levels, body.sample_rate)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc),
+        )
+    return JSONResponse(content=_log_levels())
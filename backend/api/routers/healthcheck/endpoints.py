@@ -5,6 +5,8 @@ from fastapi.responses import JSONResponse
 from loguru import logger
 
 from backend.api.routers.healthcheck import response_examples
+from backend.database.postgres.session import get_engine
+from backend.metrics import saturation
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -22,3 +24,42 @@ async def health() -> JSONResponse:
         content={"data": random.choice(responses)},
         status_code=status.HTTP_200_OK,
     )
+
+
+@router.get("/live", status_code=200, responses=response_examples.live)
+async def live() -> JSONResponse:
+    """
+    Liveness, answered without touching database.
+
+    <!--
+    Failing it means worker should be restarted, dependencies being
+        down doesn't, see `/health/ready` for that.
+    :return: Status.
+    :rtype: JSONResponse
+    """
+    return JSONResponse(
+        content={"status": "alive"}, status_code=status.HTTP_200_OK
+    )
+
+
+@router.get("/ready", status_code=200, responses=response_examples.ready)
+async def ready() -> JSONResponse:
+    """
+    Readiness, 503 takes worker out of load balancer until it recovers.
+
+    <!--
+    Not ready when DB pool utilisation or event loop lag cross their
+        thresholds, or database doesn't answer at expected schema
+        version, see `backend.metrics.saturation`.
+    :return: Report of every check.
+    :rtype: JSONResponse
+    """
+    is_ready, report = await saturation.readiness(get_engine())
+    return JSONResponse(
+        content=report,
+        status_code=(
+            status.HTTP_200_OK
+            if is_ready
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+    )
@@ -41,3 +41,51 @@ health: Optional[Dict[Union[int, str], Dict[str, Any]]] = {
         },
     },
 }
+
+live: Optional[Dict[Union[int, str], Dict[str, Any]]] = {
+    "200": {
+        "description": "Process is up and its event loop responds",
+        "content": {"application/json": {"example": {"status": "alive"}}},
+    },
+}
+
+_ready_report: Dict[str, Any] = {
+    "status": "ready",
+    "reasons": [],
+    "pool": {"checked_out": 2, "capacity": 15, "utilisation": 0.133},
+    "loop_lag_ms": 1.2,
+    "database": {
+        "reachable": True,
+        "schema_version": 2,
+        "expected_version": 2,
+    },
+}
+
+ready: Optional[Dict[Union[int, str], Dict[str, Any]]] = {
+    "200": {
+        "description": "Worker can take traffic",
+        "content": {"application/json": {"example": _ready_report}},
+    },
+    "503": {
+        "description": "Saturated or database unavailable, drain traffic",
+        "content": {
+            "application/json": {
+                "example": {
+                    **_ready_report,
+                    "status": "unavailable",
+                    "reasons": ["pool saturated"],
+                    "pool": {
+                        "checked_out": 15,
+                        "capacity": 15,
+                        "utilisation": 1.0,
+                    },
+                    "database": {
+                        "reachable": None,
+                        "schema_version": None,
+                        "expected_version": 2,
+                    },
+                }
+            }
+        },
+    },
+}
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException, Response, status
+
+from backend.metrics import prometheus
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Prometheus exposition of all workers.
+
+    <!--
+    Latency histograms and status counters per route, in-flight gauge,
+        DB pool gauges and `backend.core.core` timings.
+    :return: Text exposition format.
+    :rtype: Response
+    :raises HTTPException: 501 when `prometheus_client` is not installed.
+    """
+    if prometheus.prometheus_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Metrics need prometheus_client installed.",
+        )
+    content, media_type = prometheus.render()
+    return Response(content=content, media_type=media_type)
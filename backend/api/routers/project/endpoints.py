@@ -1,3 +1,4 @@
+import json
 import typing
 from datetime import datetime
 
@@ -11,12 +12,13 @@ from fastapi import (
     Response,
     status,
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from loguru import logger
 
 from backend.api.routers.project import validators
 from backend.api.routers.project.models import (
     ProjectProtocol,
+    query_params,
     request_models,
     response_models,
 )
@@ -24,8 +26,8 @@ from backend.api.routers.project.swagger_examples import request_examples
 from backend.api.routers.project.swagger_examples.response_examples import (
     get_project_example,
 )
-from backend.core import core
-from backend.database.postgres.session import DBSessionDep
+from backend.core import core, core_models, formats, geometry
+from backend.database.postgres.session import DBSessionDep, DbContext
 
 router = APIRouter(prefix="/project", tags=["project"])
 
@@ -40,9 +42,19 @@ router = APIRouter(prefix="/project", tags=["project"])
                 }
             },
         },
+        406: {
+            "content": {
+                "application/json": {"example": "Supported media types: ..."}
+            },
+        },
         200: {
             "description": "Item requested by ID",
-            "content": {"application/json": get_project_example},
+            "content": {
+                "application/json": get_project_example,
+                formats.MSGPACK: {},
+                formats.WKB: {},
+                formats.ARROW: {},
+            },
         },
     },
 )
@@ -57,12 +69,24 @@ async def read_project(
             openapi_examples=request_examples.project_id,
         ),
     ],
+    precision: query_params.Precision = None,
+    encoding: query_params.Encoding = None,
+    accept: query_params.Accept = None,
+    fields: query_params.Fields = None,
+    include_geometry: query_params.IncludeGeometry = True,
 ) -> response_models.ProjectResponse:
     """
-    @TODO Pagination if geojson is too big
     Returns the details of a project from the database
         with the specified Project ID
     - `project_id` INT: min: **0**, max: **999,999**
+    - `fields` STR: e.g. `name,date_range`, only these are returned
+    - `include_geometry` BOOL: `false` returns project without geojson
+    - `precision` INT: coordinates decimals, min: **0**, max: **15**
+    - `encoding` STR: `polyline` for compact coordinates string
+    - `Accept` header: `application/json` (default), `application/msgpack`,
+        `application/wkb` (geometry only),
+        `application/vnd.apache.arrow.stream`
+    - Big geometries: use `GET /project/{project_id}/stream`
 
     <!--
     Retrieve a project by its ID.
@@ -76,6 +100,28 @@ async def read_project(
         Must be a positive integer between 0 and 999,999.
     :type project_id: int
 
+    :param precision:
+        Optional number of decimals coordinates are rounded to.
+    :type precision: typing.Optional[int]
+
+    :param encoding:
+        Optional compact encoding of coordinates, `polyline`.
+        Ignored for binary media types.
+    :type encoding: typing.Optional[str]
+
+    :param accept:
+        Accept header used to negotiate JSON or binary response.
+    :type accept: typing.Optional[str]
+
+    :param fields:
+        Optional subset of response fields, JSON only.
+        Geometry is not read from database unless `geojson` is in it.
+    :type fields: typing.Optional[frozenset[str]]
+
+    :param include_geometry:
+        When false, geometry is neither read nor returned, JSON only.
+    :type include_geometry: bool
+
     :return:
         A response model containing the details of the requested project:
         - **project_id** (*int*): The ID of the retrieved project.v
@@ -90,11 +136,40 @@ async def read_project(
         - **404 Not Found**: If no project is found with the specified ID.
         - **400 Bad Request**: If the `project_id` is invalid
                                 or out of the allowed range.
+        - **406 Not Acceptable**: If no supported media type is accepted.
     """
-    logger.debug(f"read project id {project_id}")
+    logger.opt(lazy=True).debug(
+        "read project id {project_id}", project_id=lambda: project_id
+    )
+    media_type = formats.negotiate(accept, formats.available())
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Supported media types: {formats.available()}",
+        )
+    if media_type != formats.JSON:
+        project = await core.read_arrays_from_db(
+            session=session,
+            project_id=project_id,
+        )
+        if project == status.HTTP_404_NOT_FOUND:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Project ID: {project_id} Not Found",
+            )
+        if precision is not None:
+            project = project._replace(
+                points=geometry.quantise(project.points, precision)
+            )
+        return Response(
+            content=formats.encode(media_type, project),
+            media_type=media_type,
+        )
+    sparse = query_params.sparse_fields(fields, include_geometry)
     result: ProjectProtocol | int = await core.read_from_db(
         session=session,
         project_id=project_id,
+        include_geometry=sparse is None or "geojson" in sparse,
     )
     if result == status.HTTP_404_NOT_FOUND:
         logger.opt(lazy=True).info(
@@ -109,12 +184,160 @@ async def read_project(
         "Returning project details of project id: {x}",
         x=lambda: f"{project_id}",
     )
-    return response_models.ProjectResponse(
+    project = response_models.ProjectResponse(
         project_id=result.project_id,
         name=result.name,
         description=result.description,
         date_range=(result.start_date, result.end_date),
-        geojson=result.geojson,  # noqa
+        geojson=response_models.GeoJson(
+            type=result.geojson.type,
+            geometry=geometry.format_geometry(
+                result.geojson.geometry,
+                precision=precision,
+                encoding=encoding,
+            ),
+        )
+        if result.geojson is not None
+        else None,
+        summary=response_models.summary_of(result),
+    )
+    if sparse is not None:
+        return JSONResponse(project.model_dump(mode="json", include=sparse))
+    return project
+
+
+async def _stream_project(
+    header: core_models.ProjectHeader,
+    offset: int,
+    limit: typing.Optional[int],
+) -> typing.AsyncIterator[str]:
+    prefix = json.dumps(
+        {
+            "project_id": header.project_id,
+            "name": header.name,
+            "description": header.description,
+            "date_range": [
+                header.start_date.isoformat(),
+                header.end_date.isoformat(),
+            ],
+            "geojson": {
+                "type": header.geojson_type,
+                "geometry": {"type": header.geometry_type, "coordinates": []},
+            },
+        },
+        separators=(",", ":"),
+    )
+    # Split right before closing `]}}}` to append coordinates in between
+    yield prefix[:-4]
+    separator = ""
+    # Request session is closed before the body is sent, stream uses own one
+    async with DbContext() as stream_session:
+        async for rows in core.stream_coordinates(
+            session=stream_session,
+            geometry_id=header.geometry_id,
+            offset=offset,
+            limit=limit,
+        ):
+            chunk = json.dumps(
+                [{"latitude": lat, "longitude": lon} for lat, lon in rows],
+                separators=(",", ":"),
+            )
+            yield separator + chunk[1:-1]
+            separator = ","
+    yield prefix[-4:]
+
+
+@router.get(
+    "/{project_id}/stream",
+    responses={
+        404: {
+            "content": {
+                "application/json": {
+                    "example": "Project ID: {project_id} Not Found"
+                }
+            },
+        },
+        200: {
+            "description": "Item requested by ID, streamed in chunks",
+            "content": {"application/json": get_project_example},
+        },
+    },
+)
+async def stream_project(
+    session: DBSessionDep,
+    project_id: typing.Annotated[
+        int,
+        Path(
+            ...,
+            ge=0,
+            le=999999,
+            openapi_examples=request_examples.project_id,
+        ),
+    ],
+    offset: typing.Annotated[
+        int,
+        Query(ge=0, description="Number of vertices to skip."),
+    ] = 0,
+    limit: typing.Annotated[
+        typing.Optional[int],
+        Query(ge=1, description="Maximum number of vertices to return."),
+    ] = None,
+) -> StreamingResponse:
+    """
+    Streams the details of a project with the specified Project ID.
+    Same body as `GET /project/{project_id}`, but coordinates are written
+        in chunks straight from a DB cursor, memory stays constant.
+    - `project_id` INT: min: **0**, max: **999,999**
+    - `offset` INT: vertices to skip (default 0)
+    - `limit` INT: max vertices to return (default all)
+
+    <!--
+    Stream a project by its ID.
+
+    :param session:
+        The database session dependency used to read project header.
+    :type session: DBSessionDep
+
+    :param project_id:
+        The unique identifier of the project to retrieve.
+        Must be a positive integer between 0 and 999,999.
+    :type project_id: int
+
+    :param offset:
+        Number of vertices to skip, in stored order.
+    :type offset: int
+
+    :param limit:
+        Maximum number of vertices to return. All remaining if not given.
+    :type limit: typing.Optional[int]
+
+    :return:
+        Chunked JSON body matching `response_models.ProjectResponse`.
+    :rtype: StreamingResponse
+
+    :raises HTTPException:
+        - **404 Not Found**: If no project is found with the specified ID.
+    """
+    header: core_models.ProjectHeader | int = await core.read_header_from_db(
+        session=session,
+        project_id=project_id,
+    )
+    if header == status.HTTP_404_NOT_FOUND:
+        logger.opt(lazy=True).info(
+            "Project id {project_id} not found",
+            project_id=lambda: f"{project_id}",
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project ID: {project_id} Not Found",
+        )
+    logger.opt(lazy=True).info(
+        "Streaming project details of project id: {x}",
+        x=lambda: f"{project_id}",
+    )
+    return StreamingResponse(
+        _stream_project(header=header, offset=offset, limit=limit),
+        media_type="application/json",
     )
 
 
@@ -318,7 +541,9 @@ async def delete_project(
         - **400 Bad Request**: If the `project_id` is invalid
                                 or out of the allowed range.
     """
-    logger.debug("Deleting project: {project_id}")
+    logger.opt(lazy=True).debug(
+        "Deleting project: {project_id}", project_id=lambda: project_id
+    )
     result: int = await core.delete_from_db(
         session=session,
         project_id=project_id,
@@ -332,7 +557,10 @@ async def delete_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project ID: {project_id} Not Found",
         )
-    logger.debug("Successfully deleted project: {project_id}")
+    logger.opt(lazy=True).debug(
+        "Successfully deleted project: {project_id}",
+        project_id=lambda: project_id,
+    )
     return Response(status_code=status.HTTP_200_OK)
 
 
@@ -446,7 +674,9 @@ async def create_project(
         # if Model|dict then if model doesn't match,
         # validator tries dict so {} will fly
     )
-    logger.debug(f"Created project with ID: {project_id}")
+    logger.opt(lazy=True).debug(
+        "Created project with ID: {project_id}", project_id=lambda: project_id
+    )
     return JSONResponse(
         content={"Project_id": project_id},
         status_code=status.HTTP_201_CREATED,
@@ -36,6 +36,11 @@ class Project(Protocol):
     end_date: datetime
     description: Optional[str]
     geojson: Geojson
+    area: Optional[float]
+    perimeter: Optional[float]
+    centroid_latitude: Optional[float]
+    centroid_longitude: Optional[float]
+    vertex_count: Optional[int]
 
     def model_dump(self):
         pass
@@ -0,0 +1,61 @@
+import typing
+
+import pydantic
+from fastapi import Header, Query
+
+from backend.api.routers.project import validators
+from backend.api.routers.project.validators.fields_validator import FIELDS
+from backend.core import geometry
+
+Precision = typing.Annotated[
+    typing.Optional[int],
+    Query(
+        ge=0,
+        le=15,
+        description="Round coordinates to given number of decimals. "
+        "6 decimals is ~0.1 m.",
+    ),
+]
+
+Encoding = typing.Annotated[
+    typing.Optional[geometry.ENCODINGS],
+    Query(
+        description="Compact coordinates encoding. "
+        "`polyline`: Google encoded polyline of (lat, lon) pairs, "
+        f"precision defaults to {geometry.POLYLINE_PRECISION}.",
+    ),
+]
+
+Accept = typing.Annotated[
+    typing.Optional[str],
+    Header(
+        description="Response media type: application/json (default), "
+        "application/msgpack, application/wkb, "
+        "application/vnd.apache.arrow.stream",
+    ),
+]
+
+Fields = typing.Annotated[
+    typing.Optional[str],
+    Query(
+        description="Comma separated fields to return, "
+        f"any of {', '.join(FIELDS)}. `project_id` is always returned.",
+    ),
+    pydantic.AfterValidator(validators.fields_validator),
+]
+
+IncludeGeometry = typing.Annotated[
+    bool,
+    Query(description="`false` skips loading geometry altogether."),
+]
+
+
+def sparse_fields(
+    fields: typing.Optional[frozenset[str]],
+    include_geometry: bool,
+) -> typing.Optional[frozenset[str]]:
+    """Effective field set of request, None when all fields are wanted."""
+    if fields is None and include_geometry:
+        return None
+    fields = frozenset(FIELDS) if fields is None else fields
+    return fields if include_geometry else fields - {"geojson"}
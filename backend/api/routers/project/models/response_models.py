@@ -22,13 +22,42 @@ class Geometry(pydantic.BaseModel):
     model_config = {"from_attributes": True}
 
 
+class EncodedGeometry(pydantic.BaseModel):
+    type: str  # @TODO add literal if possible for finite array of types
+    encoding: typing.Literal["polyline"]
+    precision: int
+    coordinates: str
+
+
 class GeoJson(pydantic.BaseModel):
     type: str  # @TODO add literal if possible for finite array of types
-    geometry: Geometry
+    geometry: Geometry | EncodedGeometry
 
     model_config = {"from_attributes": True}
 
 
+class GeometrySummary(pydantic.BaseModel):
+    area: float = pydantic.Field(..., description="Area in m².")
+    perimeter: float = pydantic.Field(..., description="Perimeter in m.")
+    centroid: Coordinate
+    vertex_count: int
+
+
+def summary_of(project) -> typing.Optional[GeometrySummary]:
+    """Summary from stored metrics, None for rows stored before them."""
+    if project.area is None:
+        return None
+    return GeometrySummary(
+        area=project.area,
+        perimeter=project.perimeter,
+        centroid=Coordinate(
+            latitude=project.centroid_latitude,
+            longitude=project.centroid_longitude,
+        ),
+        vertex_count=project.vertex_count,
+    )
+
+
 class ProjectResponse(pydantic.BaseModel):
     project_id: int = pydantic.Field(..., description="Project ID")
     name: str = pydantic.Field(
@@ -44,7 +73,15 @@ class ProjectResponse(pydantic.BaseModel):
         ...,
         description="Date range: tuple of two datetime values (start, end).",
     )
-    geojson: GeoJson
+    geojson: typing.Optional[GeoJson] = pydantic.Field(
+        None,
+        description="Absent when geometry was not requested.",
+    )
+    summary: typing.Optional[GeometrySummary] = pydantic.Field(
+        None,
+        description="Area, perimeter, centroid and vertex count, "
+        "available even without geometry.",
+    )
 
     # model_config = {"from_attributes": True}
     model_config = {
@@ -53,6 +90,59 @@ class ProjectResponse(pydantic.BaseModel):
     }
 
 
+class ProjectSummary(pydantic.BaseModel):
+    """Project without geometry, for lookups returning many projects."""
+
+    project_id: int = pydantic.Field(..., description="Project ID")
+    name: str = pydantic.Field(..., description="Project name.")
+    description: typing.Optional[str] = pydantic.Field(
+        None,
+        description="An optional description of the name.",
+    )
+    date_range: typing.Tuple[datetime, datetime] = pydantic.Field(
+        ...,
+        description="Date range: tuple of two datetime values (start, end).",
+    )
+
+
+class ProjectChange(pydantic.BaseModel):
+    change_seq: int = pydantic.Field(..., description="Change number.")
+    op: typing.Literal["upsert", "delete"]
+    project_id: int = pydantic.Field(..., description="Project ID")
+    updated_at: datetime = pydantic.Field(
+        ...,
+        description="Time of change (UTC), deletion time for deletes.",
+    )
+    project: typing.Optional[ProjectResponse] = pydantic.Field(
+        None,
+        description="Current project, None when deleted.",
+    )
+
+
+class ChangeFeed(pydantic.BaseModel):
+    changes: list[ProjectChange]
+    next: str = pydantic.Field(
+        ...,
+        description="Token for `since` of next call.",
+    )
+    has_more: bool = pydantic.Field(
+        ...,
+        description="More changes are ready, call again right away.",
+    )
+
+
+class DeletedProjects(pydantic.BaseModel):
+    project_ids: list[int] = pydantic.Field(
+        ...,
+        description="IDs of deleted projects, ascending.",
+    )
+    skipped: list[int] = pydantic.Field(
+        default_factory=list,
+        description="IDs matching filters but locked by concurrent writes,"
+        " not deleted, ascending. Retry to delete them.",
+    )
+
+
 # example_return = {
 #     "project_id": 1,
 #     "name": "test_name_return",
@@ -1,4 +1,5 @@
 from .date_validator import date_validator
+from .fields_validator import fields_validator
 from .name_validator import name_validator
 
-__all__ = [date_validator, name_validator]
+__all__ = [date_validator, fields_validator, name_validator]
@@ -0,0 +1,33 @@
+import typing
+
+import fastapi
+from loguru import logger
+
+FIELDS: tuple[str, ...] = (
+    "project_id",
+    "name",
+    "description",
+    "date_range",
+    "geojson",
+    "summary",
+)
+
+
+def fields_validator(
+    fields: typing.Optional[str],
+) -> typing.Optional[frozenset[str]]:
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(FIELDS)
+    if not requested or unknown:
+        logger.opt(lazy=True).debug(
+            "{x}", x=lambda: f"{fields=} has unknown fields {unknown}"
+        )
+        raise fastapi.HTTPException(
+            status_code=422,
+            detail=f"Fields must be comma separated subset of {FIELDS}. "
+            f"Invalid value: {fields}",
+        )
+    # Id always comes back, sparse rows must stay addressable
+    return frozenset(requested | {"project_id"})
@@ -1,16 +1,68 @@
+import json
 import math
 import random
+import typing
+import urllib.parse
+import zlib
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Query, Response, status
+import pydantic
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from backend.api.routers.project.models import response_models
+from backend.api.routers.project.models import query_params, response_models
 from backend.api.routers.project.models.protocols import Project
-from backend.core import core
-from backend.database.postgres.session import DBSessionDep
+from backend.api.routers.projects import validators
+from backend.api.routers.projects.swagger_examples import request_examples
+from backend.api.routers.projects.validators.cursor_validator import (
+    encode_cursor,
+)
+from backend.core import core, formats, geometry
+from backend.database.postgres.session import DBSessionDep, DbContext
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+EXPORT_CHUNK_BYTES: int = 64 * 1024
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": formats.NDJSON,
+    "geojson": formats.GEOJSON,
+}
+
+
+def _empty_page_response() -> Response:
+    response_code: int = random.choice(
+        [
+            status.HTTP_451_UNAVAILABLE_FOR_LEGAL_REASONS,
+            status.HTTP_418_IM_A_TEAPOT,
+        ],
+    )
+    return Response(status_code=response_code)
+
+
+def _to_response(
+    project: Project,
+    precision: typing.Optional[int],
+    encoding: typing.Optional[str],
+) -> response_models.ProjectResponse:
+    return response_models.ProjectResponse(
+        project_id=project.project_id,
+        name=project.name,
+        description=project.description,
+        date_range=(project.start_date, project.end_date),
+        geojson=response_models.GeoJson(
+            type=project.geojson.type,
+            geometry=geometry.format_geometry(
+                project.geojson.geometry,
+                precision=precision,
+                encoding=encoding,
+            ),
+        )
+        if project.geojson is not None
+        else None,
+        summary=response_models.summary_of(project),
+    )
+
 
 @router.get("/list", status_code=200)
 async def list_projects(
@@ -18,11 +70,57 @@ async def list_projects(
     session: DBSessionDep,
     page: Annotated[int, Query(ge=1)] = 1,
     size: Annotated[int, Query(ge=1, le=100)] = 10,
+    active_from: Annotated[
+        typing.Optional[datetime],
+        Query(description="Window start, projects overlapping window."),
+        pydantic.AfterValidator(validators.active_validator),
+    ] = None,
+    active_to: Annotated[
+        typing.Optional[datetime],
+        Query(description="Window end, projects overlapping window."),
+        pydantic.AfterValidator(validators.active_validator),
+    ] = None,
+    active_at: Annotated[
+        typing.Optional[datetime],
+        Query(description="Projects running at this moment."),
+        pydantic.AfterValidator(validators.active_validator),
+    ] = None,
+    min_area: Annotated[
+        typing.Optional[float],
+        Query(ge=0, description="Minimum geometry area in m²."),
+    ] = None,
+    sort: Annotated[
+        core.SORT_KEYS,
+        Query(description="`area` ascending, `-area` descending."),
+    ] = "project_id",
+    count: Annotated[
+        typing.Literal["exact", "estimate"],
+        Query(description="`estimate` reads planner statistics instead."),
+    ] = "exact",
+    precision: query_params.Precision = None,
+    encoding: query_params.Encoding = None,
+    accept: query_params.Accept = None,
+    fields: query_params.Fields = None,
+    include_geometry: query_params.IncludeGeometry = True,
 ) -> list[response_models.ProjectResponse]:
     """
     Returns a paginated list of projects.
     - `page`: Current page number (default 1).
     - `size`: Number of items per page (default 10, max 100).
+    - `fields`: e.g. `name,date_range`, only these are returned.
+    - `include_geometry`: `false` returns projects without geojson,
+        cheapest way to fill a table view.
+    - `active_from`, `active_to`: Projects whose date range overlaps
+        the window, either bound may be omitted.
+    - `active_at`: Projects whose date range contains the moment.
+    - `min_area`: Projects with geometry area of at least this, in m².
+    - `sort`: `project_id` (default), `area` or `-area` (largest first).
+    - `count`: `exact` (default) or `estimate`, total in `X-Total-Count`,
+        kind used in `X-Total-Count-Mode`.
+    - `precision`: Coordinates decimals (default full precision).
+    - `encoding`: `polyline` for compact coordinates string.
+    - `Accept` header: `application/json` (default), `application/msgpack`,
+        `application/vnd.apache.arrow.stream`
 
     <!--
     List all projects
@@ -34,46 +132,548 @@ async def list_projects(
     :type page: Annotated[int, Query(ge=1)]
     :param size: Size of each page (default 10).
     :type size: Annotated[int, Query(ge=1, le=100)]
+    :param active_from: Start of activity window, inclusive.
+    :type active_from: typing.Optional[datetime]
+    :param active_to: End of activity window, inclusive.
+    :type active_to: typing.Optional[datetime]
+    :param active_at: Moment project must be active at.
+    :type active_at: typing.Optional[datetime]
+    :param min_area: Minimum stored geometry area, m².
+    :type min_area: typing.Optional[float]
+    :param sort: Listing order.
+    :type sort: core.SORT_KEYS
+    :param count: Exact total, or estimate when statistics exist.
+    :type count: typing.Literal["exact", "estimate"]
+    :param precision: Number of decimals coordinates are rounded to.
+    :type precision: query_params.Precision
+    :param encoding: Compact encoding of coordinates.
+    :type encoding: query_params.Encoding
+    :param accept: Accept header used to negotiate response media type.
+    :type accept: query_params.Accept
+    :param fields: Subset of response fields, JSON only.
+    :type fields: query_params.Fields
+    :param include_geometry: False skips loading geometry, JSON only.
+    :type include_geometry: query_params.IncludeGeometry
     :return: List of projects.
     :rtype: list[response_models.ProjectResponse]
+    :raises HTTPException: 422 when `active_from` is after `active_to`.
     """
     int_page = page - 1
+    if active_from and active_to and active_from > active_to:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="active_from cannot be after active_to. "
+            f"Invalid values: {active_from}, {active_to}",
+        )
+    # Every filter is index backed, see `core._list_filters`
+    filters = {
+        "active_from": active_from,
+        "active_to": active_to,
+        "active_at": active_at,
+        "min_area": min_area,
+    }
+    filters_query = urllib.parse.urlencode(
+        {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in filters.items()
+            if value is not None
+        }
+    )
+    filters_query = f"&{filters_query}" if filters_query else ""
+    if sort != "project_id":
+        filters_query += f"&sort={sort}"
+    if count != "exact":
+        filters_query += f"&count={count}"
+    sparse = query_params.sparse_fields(fields, include_geometry)
+    if fields is not None:
+        filters_query += f"&fields={','.join(sorted(fields))}"
+    if not include_geometry:
+        filters_query += "&include_geometry=false"
+    # WKB has no container for many geometries, Arrow carries WKB column
+    supported = [x for x in formats.available() if x != formats.WKB]
+    media_type = formats.negotiate(accept, supported)
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Supported media types: {supported}",
+        )
+    if media_type != formats.JSON:
+        arrays = await core.fetch_all_arrays(
+            session=session,
+            page=int_page,
+            size=size,
+            **filters,
+            sort=sort,
+        )
+        if arrays == status.HTTP_404_NOT_FOUND:
+            return _empty_page_response()
+        if precision is not None:
+            arrays = [
+                project._replace(
+                    points=geometry.quantise(project.points, precision)
+                )
+                for project in arrays
+            ]
+        return Response(
+            content=formats.encode(media_type, arrays),
+            media_type=media_type,
+        )
     projects: list[Project] = await core.fetch_all_projects(
         session=session,
         page=int_page,
         size=size,
+        **filters,
+        sort=sort,
+        include_geometry=sparse is None or "geojson" in sparse,
     )
     if projects == status.HTTP_404_NOT_FOUND:
-        response_code: int = random.choice(
-            [
-                status.HTTP_451_UNAVAILABLE_FOR_LEGAL_REASONS,
-                status.HTTP_418_IM_A_TEAPOT,
-            ],
-        )
-        return Response(status_code=response_code)
+        return _empty_page_response()
     # Convert database records to response model
     project_responses = [
-        response_models.ProjectResponse(
-            project_id=project.project_id,
-            name=project.name,
-            description=project.description,
-            date_range=(project.start_date, project.end_date),
-            geojson=project.geojson,  # noqa
-        )
+        _to_response(project, precision=precision, encoding=encoding)
         for project in projects
     ]
-    total_projects: int = await core.get_projects_count(session=session)
+    total_projects: typing.Optional[int] = None
+    if count == "estimate":
+        total_projects = await core.estimate_projects_count(
+            session=session, **filters
+        )
+    count_mode = "exact" if total_projects is None else "estimate"
+    if total_projects is None:
+        total_projects = await core.get_projects_count(
+            session=session, **filters
+        )
     last_page: int = math.ceil(total_projects / size)
     # Paginate results
     link = (
-        f"/api/projects/list?page={page}&size={size}; "
-        f'rel="prev", /api/projects/list?page={page-1}&size={size}; '
-        f'rel="next", /api/projects/list?page={page+1}&size={size}; '
-        f'rel="first, /api/projects/list?page={1}&size={size}; '
-        f'rel="last, /api/projects/list?page={last_page}&size={size}"'
+        f"/api/projects/list?page={page}&size={size}{filters_query}; "
+        f'rel="prev", /api/projects/list?page={page-1}&size={size}'
+        f"{filters_query}; "
+        f'rel="next", /api/projects/list?page={page+1}&size={size}'
+        f"{filters_query}; "
+        f'rel="first, /api/projects/list?page={1}&size={size}'
+        f"{filters_query}; "
+        f'rel="last, /api/projects/list?page={last_page}&size={size}'
+        f'{filters_query}"'
     )
-    response.headers["Link"] = link
-    response.headers["X-Page"] = str(page)
-    response.headers["X-Size"] = str(size)
+    headers = {
+        "Link": link,
+        "X-Page": str(page),
+        "X-Size": str(size),
+        "X-Total-Count": str(total_projects),
+        "X-Total-Count-Mode": count_mode,
+    }
+    if sparse is not None:
+        return JSONResponse(
+            [
+                project.model_dump(mode="json", include=sparse)
+                for project in project_responses
+            ],
+            headers=headers,
+        )
+    response.headers.update(headers)
 
     return project_responses
+
+
+def _matches_key(values: list, types: tuple[type, ...]) -> bool:
+    """Cursor values have JSON types of sort key, ints pass as floats."""
+    if len(values) != len(types):
+        return False
+    return all(
+        not isinstance(value, bool)
+        and isinstance(value, (int, float) if expected is float else expected)
+        for value, expected in zip(values, types)
+    )
+
+
+@router.get("/search", status_code=200)
+async def search_projects(
+    response: Response,
+    session: DBSessionDep,
+    bbox: Annotated[
+        typing.Optional[str],
+        Query(
+            description="minLon,minLat,maxLon,maxLat",
+            openapi_examples=request_examples.bbox,
+        ),
+        pydantic.AfterValidator(validators.bbox_validator),
+    ] = None,
+    name: Annotated[
+        typing.Optional[str],
+        Query(
+            min_length=1,
+            max_length=32,
+            description="Name prefix or approximate name.",
+            openapi_examples=request_examples.name,
+        ),
+    ] = None,
+    cursor: Annotated[
+        typing.Optional[str],
+        Query(description="X-Next-Cursor header of previous page."),
+        pydantic.AfterValidator(validators.cursor_validator),
+    ] = None,
+    size: Annotated[int, Query(ge=1, le=100)] = 10,
+    precision: query_params.Precision = None,
+    encoding: query_params.Encoding = None,
+) -> list[response_models.ProjectResponse]:
+    """
+    Returns projects matching location and/or name, at least one required.
+    - `bbox`: minLon,minLat,maxLon,maxLat, geometry bounding box intersects.
+    - `name`: Case insensitive, names starting with it come first,
+        then similar names (typos) ordered by similarity.
+    - `cursor`: Token from `X-Next-Cursor` header of previous page.
+    - `size`: Number of items per page (default 10, max 100).
+    - `precision`: Coordinates decimals (default full precision).
+    - `encoding`: `polyline` for compact coordinates string.
+
+    <!--
+    Search projects by location and name.
+    Answered from indexed bounding box and name columns, pages are
+        keyset based, so deep pages cost the same as the first one.
+    :param response: Coming from FastAPI to set headers in response.
+    :type response: Response
+    :param session: Coming from FastAPI dependency.
+    :type AsyncSession:
+    :param bbox: Bounding box in GeoJSON order.
+    :type bbox: typing.Optional[tuple[float, float, float, float]]
+    :param name: Name prefix or approximate name.
+    :type name: typing.Optional[str]
+    :param cursor: Opaque keyset pagination token.
+    :type cursor: typing.Optional[str]
+    :param size: Size of each page (default 10).
+    :type size: Annotated[int, Query(ge=1, le=100)]
+    :param precision: Number of decimals coordinates are rounded to.
+    :type precision: query_params.Precision
+    :param encoding: Compact encoding of coordinates.
+    :type encoding: query_params.Encoding
+    :return: List of projects, empty when nothing matches.
+    :rtype: list[response_models.ProjectResponse]
+    :raises HTTPException: 422 without criteria, foreign or malformed cursor.
+    """
+    if bbox is None and name is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="At least one of bbox, name is required.",
+        )
+    # Name search sorts by (rank, similarity, id), location by id only
+    key_types = (float, float, int) if name is not None else (int,)
+    if cursor and not _matches_key(cursor, key_types):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Cursor belongs to a different search.",
+        )
+    hits = await core.search_projects(
+        session=session,
+        bbox=bbox,
+        name=name,
+        after=cursor or None,
+        size=size,
+    )
+    if len(hits) == size:
+        next_cursor = encode_cursor(hits[-1].key)
+        criteria = {
+            "bbox": ",".join(map(str, bbox)) if bbox is not None else None,
+            "name": name,
+        }
+        query = urllib.parse.urlencode(
+            {key: value for key, value in criteria.items() if value}
+        )
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = (
+            f"/api/projects/search?{query}"
+            f'&size={size}&cursor={next_cursor}; rel="next"'
+        )
+    response.headers["X-Size"] = str(size)
+    return [
+        _to_response(hit.project, precision=precision, encoding=encoding)
+        for hit in hits
+    ]
+
+
+@router.get("/changes", status_code=200)
+async def project_changes(
+    session: DBSessionDep,
+    since: Annotated[
+        typing.Optional[str],
+        Query(description="`next` token of previous call."),
+        pydantic.AfterValidator(validators.cursor_validator),
+    ] = None,
+    size: Annotated[int, Query(ge=1, le=1000)] = core.CHANGES_SIZE,
+    include_geometry: query_params.IncludeGeometry = True,
+) -> response_models.ChangeFeed:
+    """
+    Returns projects created, updated or deleted since the token.
+    - `since`: `next` token of previous call, omit for full sync.
+    - `size`: Number of changes per call (default 100, max 1,000).
+    - `include_geometry`: `false` returns projects without geojson.
+
+    Each project appears once, with its latest change.
+    Deleted projects come as `op: delete` without `project`.
+    Call again with `next` while `has_more` is true.
+
+    <!--
+    Incremental sync instead of re-listing all projects.
+    Served from change number indexes of projects and tombstones.
+    :param session: Coming from FastAPI dependency.
+    :type AsyncSession:
+    :param since: Opaque change token.
+    :type since: typing.Optional[str]
+    :param size: Max number of changes returned.
+    :type size: int
+    :param include_geometry: Load geojson of changed projects.
+    :type include_geometry: query_params.IncludeGeometry
+    :return: Changes in order with token of next call.
+    :rtype: response_models.ChangeFeed
+    :raises HTTPException: 422 for malformed token.
+    """
+    if since and (len(since) != 1 or not isinstance(since[0], int)):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid since token.",
+        )
+    page = await core.fetch_changes(
+        session=session,
+        since=since[0] if since else 0,
+        size=size,
+        include_geometry=include_geometry,
+    )
+    return response_models.ChangeFeed(
+        changes=[
+            response_models.ProjectChange(
+                change_seq=change.change_seq,
+                op="delete" if change.project is None else "upsert",
+                project_id=change.project_id,
+                updated_at=change.updated_at,
+                project=None
+                if change.project is None
+                else _to_response(change.project, None, None),
+            )
+            for change in page.changes
+        ],
+        next=encode_cursor([page.next_seq]),
+        has_more=page.has_more,
+    )
+
+
+@router.get("/containing", status_code=200)
+async def containing_projects(
+    session: DBSessionDep,
+    lat: Annotated[float, Query(..., ge=-90, le=90)],
+    lon: Annotated[float, Query(..., ge=-180, le=180)],
+) -> list[response_models.ProjectSummary]:
+    """
+    Returns projects whose geometry covers the point.
+    - `lat`: Latitude, min: **-90**, max: **90**
+    - `lon`: Longitude, min: **-180**, max: **180**
+
+    <!--
+    Point in polygon lookup, e.g. to geotag field data.
+    Bounding boxes are prefiltered through GiST index, then candidates
+        are tested exactly with vectorised ray casting.
+    :param session: Coming from FastAPI dependency.
+    :type AsyncSession:
+    :param lat: Latitude of the point.
+    :type lat: float
+    :param lon: Longitude of the point.
+    :type lon: float
+    :return: Projects containing the point, empty when none.
+    :rtype: list[response_models.ProjectSummary]
+    """
+    headers = await core.find_containing(
+        session=session,
+        latitude=lat,
+        longitude=lon,
+    )
+    return [
+        response_models.ProjectSummary(
+            project_id=header.project_id,
+            name=header.name,
+            description=header.description,
+            date_range=(header.start_date, header.end_date),
+        )
+        for header in headers
+    ]
+
+
+async def _export_lines(export_format: str) -> typing.AsyncIterator[str]:
+    # Request session is closed before the body is sent, export uses own one
+    async with DbContext() as session:
+        if export_format == "geojson":
+            yield '{"type":"FeatureCollection","features":['
+        separator = ""
+        async for project in core.stream_projects(session=session):
+            if export_format == "geojson":
+                yield separator + json.dumps(
+                    formats.to_feature(project), separators=(",", ":")
+                )
+                separator = ","
+            else:
+                yield (
+                    json.dumps(
+                        formats.to_record(project), separators=(",", ":")
+                    )
+                    + "\n"
+                )
+        if export_format == "geojson":
+            yield "]}"
+
+
+async def _export_body(
+    export_format: str,
+    compress: bool,
+) -> typing.AsyncIterator[bytes]:
+    """Batches lines into ~64 kB chunks, gzipped on the fly if asked."""
+    compressor = (
+        zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    )
+    buffer: list[str] = []
+    buffered = 0
+    async for line in _export_lines(export_format):
+        buffer.append(line)
+        buffered += len(line)
+        if buffered < EXPORT_CHUNK_BYTES:
+            continue
+        chunk = "".join(buffer).encode("utf-8")
+        buffer, buffered = [], 0
+        chunk = compressor.compress(chunk) if compressor else chunk
+        if chunk:
+            yield chunk
+    chunk = "".join(buffer).encode("utf-8")
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    yield chunk
+
+
+@router.get(
+    "/export",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "All projects, streamed",
+            "content": {formats.NDJSON: {}, formats.GEOJSON: {}},
+        },
+    },
+)
+async def export_projects(
+    export_format: Annotated[
+        typing.Literal["ndjson", "geojson"],
+        Query(
+            alias="format",
+            description="`ndjson`: one project per line, "
+            "`geojson`: FeatureCollection.",
+        ),
+    ] = "ndjson",
+    accept_encoding: Annotated[typing.Optional[str], Header()] = None,
+) -> StreamingResponse:
+    """
+    Exports all projects in one streamed response.
+    - `format`: `ndjson` (default), lines shaped as `GET /project/{id}`,
+        or `geojson`, RFC 7946 FeatureCollection with [lon, lat] positions
+    - `Accept-Encoding: gzip` header compresses the stream on the fly
+
+    <!--
+    Bulk export for analytics jobs, instead of paging `/projects/list`.
+    Reads from one server-side cursor, memory stays bounded by a cursor
+        chunk plus one geometry, no OFFSET scans or COUNT(*) per page.
+    :param export_format: Output format, `ndjson` or `geojson`.
+    :type export_format: typing.Literal["ndjson", "geojson"]
+    :param accept_encoding: Accept-Encoding header, gzip is honoured.
+    :type accept_encoding: typing.Optional[str]
+    :return: Chunked response of all projects.
+    :rtype: StreamingResponse
+    """
+    compress = "gzip" in (accept_encoding or "").lower()
+    headers = {
+        "Content-Disposition": f'attachment; filename="projects.{export_format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        _export_body(export_format, compress=compress),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@router.delete("", status_code=200)
+async def delete_projects(
+    session: DBSessionDep,
+    ids: Annotated[
+        typing.Optional[list[int]],
+        Query(
+            max_length=1000,
+            description="Project IDs, repeated: `?ids=1&ids=2`.",
+            openapi_examples=request_examples.project_ids,
+        ),
+    ] = None,
+    active_from: Annotated[
+        typing.Optional[datetime],
+        Query(description="Window start, projects overlapping window."),
+        pydantic.AfterValidator(validators.active_validator),
+    ] = None,
+    active_to: Annotated[
+        typing.Optional[datetime],
+        Query(description="Window end, projects overlapping window."),
+        pydantic.AfterValidator(validators.active_validator),
+    ] = None,
+    name_prefix: Annotated[
+        typing.Optional[str],
+        Query(min_length=1, max_length=32),
+    ] = None,
+) -> response_models.DeletedProjects:
+    """
+    Deletes all projects matching every given filter.
+    - `ids`: Up to **1,000** project IDs.
+    - `active_from`, `active_to`: Projects whose date range overlaps
+        the window, either bound may be omitted.
+    - `name_prefix`: Projects whose name starts with it, any case.
+
+    At least one filter is required.
+    Projects being edited at the same time aren't waited for, they
+        are returned in `skipped`, delete is incomplete until retried.
+
+    <!--
+    Set based replacement for many `DELETE /project/{id}` calls.
+    Rows are deleted in batches, each in its own transaction,
+        geometry goes by `ON DELETE CASCADE`.
+    :param session: Coming from FastAPI dependency.
+    :type AsyncSession:
+    :param ids: IDs of projects to delete.
+    :type ids: typing.Optional[list[int]]
+    :param active_from: Start of activity window, inclusive.
+    :type active_from: typing.Optional[datetime]
+    :param active_to: End of activity window, inclusive.
+    :type active_to: typing.Optional[datetime]
+    :param name_prefix: Case insensitive name prefix.
+    :type name_prefix: typing.Optional[str]
+    :return: IDs of deleted and of skipped (locked) projects.
+    :rtype: response_models.DeletedProjects
+    :raises HTTPException:
+        - **422 Unprocessable Entity**: No filter given
+            or `active_from` is after `active_to`.
+    """
+    if ids is None and name_prefix is None and not (active_from or active_to):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="At least one of ids, active_from, active_to "
+            "or name_prefix is required.",
+        )
+    if active_from and active_to and active_from > active_to:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="active_from cannot be after active_to. "
+            f"Invalid values: {active_from}, {active_to}",
+        )
+    result = await core.delete_projects(
+        session=session,
+        project_ids=ids,
+        active_from=active_from,
+        active_to=active_to,
+        name_prefix=name_prefix,
+    )
+    return response_models.DeletedProjects(
+        project_ids=result.deleted, skipped=result.skipped
+    )
@@ -4,3 +4,13 @@ project_ids: dict[str, dict[str, list[str]]] = {
     "date3": {"value": ["10", "15", "20"]},
     "date4": {"value": ["100", "200", "300"]},
 }
+
+bbox: dict[str, dict[str, str]] = {
+    "Around example project": {"value": "-5.7,-52.9,-5.6,-52.7"},
+    "Whole world": {"value": "-180,-90,180,90"},
+}
+
+name: dict[str, dict[str, str]] = {
+    "Prefix": {"value": "Proj"},
+    "Typo": {"value": "Projetc"},
+}
@@ -0,0 +1,5 @@
+from .active_validator import active_validator
+from .bbox_validator import bbox_validator
+from .cursor_validator import cursor_validator
+
+__all__ = [active_validator, bbox_validator, cursor_validator]
@@ -0,0 +1,11 @@
+import typing
+from datetime import datetime, timezone
+
+
+def active_validator(
+    value: typing.Optional[datetime],
+) -> typing.Optional[datetime]:
+    # Dates are stored naive, aware input is compared in UTC
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,37 @@
+import fastapi
+from loguru import logger
+
+
+def bbox_validator(bbox: str) -> tuple[float, float, float, float]:
+    try:
+        min_lon, min_lat, max_lon, max_lat = (
+            float(value) for value in bbox.split(",")
+        )
+    except ValueError:
+        logger.opt(lazy=True).debug("{x}", x=lambda: f"{bbox=} is malformed")
+        raise fastapi.HTTPException(
+            status_code=422,
+            detail="Bbox must be 4 comma separated numbers: "
+            f"minLon,minLat,maxLon,maxLat. Invalid value: {bbox}",
+        )
+    if min_lon > max_lon or min_lat > max_lat:
+        logger.opt(lazy=True).debug(
+            "{x}", x=lambda: f"{bbox=} minimums bigger than maximums"
+        )
+        raise fastapi.HTTPException(
+            status_code=422,
+            detail="Bbox minimum cannot be bigger than maximum. "
+            f"Invalid value: {bbox}",
+        )
+    if not (-180 <= min_lon and max_lon <= 180) or not (
+        -90 <= min_lat and max_lat <= 90
+    ):
+        logger.opt(lazy=True).debug(
+            "{x}", x=lambda: f"{bbox=} out of coordinate range"
+        )
+        raise fastapi.HTTPException(
+            status_code=422,
+            detail="Bbox out of range, longitude [-180, 180], "
+            f"latitude [-90, 90]. Invalid value: {bbox}",
+        )
+    return min_lon, min_lat, max_lon, max_lat
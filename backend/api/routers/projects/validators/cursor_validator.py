@@ -0,0 +1,31 @@
+import base64
+import binascii
+import json
+import typing
+
+import fastapi
+from loguru import logger
+
+
+def encode_cursor(values: list[typing.Any]) -> str:
+    """Opaque keyset pagination token from sort key of last row."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def cursor_validator(cursor: typing.Optional[str]) -> list[typing.Any]:
+    if cursor is None:
+        return []
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        values = None
+    if not isinstance(values, list):
+        logger.opt(lazy=True).debug(
+            "{x}", x=lambda: f"{cursor=} is not a valid cursor"
+        )
+        raise fastapi.HTTPException(
+            status_code=422,
+            detail=f"Invalid cursor: {cursor}",
+        )
+    return values
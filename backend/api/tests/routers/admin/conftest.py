@@ -0,0 +1,15 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.routers.admin import endpoints
+
+ADMIN_TOKEN: str = "test-admin-token"
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    """Client sending admin token, endpoints enabled for the test."""
+    from backend.api.app import app
+
+    monkeypatch.setattr(endpoints, "ADMIN_TOKEN", ADMIN_TOKEN)
+    return TestClient(app, headers={"Authorization": f"Bearer {ADMIN_TOKEN}"})
@@ -0,0 +1,59 @@
+import pytest
+from loguru import logger
+
+from backend.loguru_logger import logger_setup
+
+
+@pytest.fixture
+def restore_levels():
+    log_filter = logger_setup.log_filter
+    saved = log_filter.level, log_filter.levels, log_filter.sample_rate
+    yield
+    logger_setup.set_levels(*saved)
+
+
+def test_set_log_levels(restore_levels, admin_client):
+    response = admin_client.put(
+        "/admin/log-levels",
+        json={"levels": {"backend.core": "trace"}, "sample_rate": 0.25},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "level": logger_setup.log_level,
+        "levels": {"backend.core": "trace"},
+        "sample_rate": 0.25,
+    }
+    # Sinks now take TRACE, so it isn't cut off before filter
+    assert logger._core.min_level == 5
+    assert admin_client.get("/admin/log-levels").json()["sample_rate"] == 0.25
+
+
+@pytest.mark.parametrize(
+    "body", [{"level": "LOUD"}, {"levels": {"x": "?"}}, {"sample_rate": 2}]
+)
+def test_set_log_levels_rejects_invalid(restore_levels, admin_client, body):
+    response = admin_client.put("/admin/log-levels", json=body)
+    assert response.status_code == 422
+    assert admin_client.get("/admin/log-levels").json()["levels"] == {}
+
+
+@pytest.mark.parametrize(
+    "token,headers,status_code",
+    [
+        (None, {}, 404),
+        ("secret", {"Authorization": "Bearer wrong"}, 401),
+    ],
+)
+def test_log_levels_need_admin_token(
+    restore_levels, sync_client, monkeypatch, token, headers, status_code
+):
+    monkeypatch.setattr(
+        "backend.api.routers.admin.endpoints.ADMIN_TOKEN", token
+    )
+    response = sync_client.put(
+        "/admin/log-levels", json={"level": "TRACE"}, headers=headers
+    )
+    assert response.status_code == status_code
+    response = sync_client.get("/admin/log-levels", headers=headers)
+    assert response.status_code == status_code
+    assert logger_setup.log_filter.level != "TRACE"
@@ -0,0 +1,138 @@
+import asyncio
+import contextlib
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from backend.metrics import queries, slow_queries
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    log = slow_queries.SlowQueryLog(threshold_ms=0, size=3, explain_rate=1)
+    monkeypatch.setattr(slow_queries, "slow_query_log", log)
+    monkeypatch.setattr(
+        "backend.api.routers.admin.endpoints.slow_query_log", log
+    )
+    return log
+
+
+def test_slow_queries_recorded_with_route(slow_log, admin_client):
+    engine = create_engine("sqlite://")
+    slow_queries.instrument(engine)
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        with engine.connect() as connection:
+            connection.execute(
+                text("SELECT :id, :blob"), {"id": item_id, "blob": "x" * 500}
+            )
+
+    client = TestClient(queries.QueryStatsMiddleware(app))
+    for item_id in range(4):
+        client.get(f"/items/{item_id}")
+
+    response = admin_client.get("/admin/slow-queries", params={"limit": 2})
+    assert response.status_code == 200
+    entries = response.json()["entries"]
+    # Rolling store keeps 3, newest first
+    assert [entry["id"] for entry in entries] == [4, 3]
+    assert entries[0]["method"] == "GET"
+    assert entries[0]["route"] == "/items/{item_id}"
+    assert entries[0]["statement"] == "SELECT ?, ?"
+    assert entries[0]["parameters"] == [3, "x" * 100 + "..."]
+    # Sync engine outside of event loop, no plan
+    assert entries[0]["plan"] is None
+
+    assert admin_client.delete("/admin/slow-queries").status_code == 204
+    assert admin_client.get("/admin/slow-queries").json()["entries"] == []
+
+
+@pytest.mark.parametrize(
+    "token,headers,status_code",
+    [
+        (None, {"Authorization": "Bearer anything"}, 404),
+        ("secret", {}, 401),
+        ("secret", {"Authorization": "Bearer wrong"}, 401),
+        ("secret", {"Authorization": "Basic secret"}, 401),
+    ],
+)
+def test_slow_queries_need_admin_token(
+    slow_log, sync_client, monkeypatch, token, headers, status_code
+):
+    monkeypatch.setattr(
+        "backend.api.routers.admin.endpoints.ADMIN_TOKEN", token
+    )
+    slow_log.record("SELECT secret", {"email": "user@example.com"}, 1.0)
+    response = sync_client.get("/admin/slow-queries", headers=headers)
+    assert response.status_code == status_code
+    assert "user@example.com" not in response.text
+    response = sync_client.delete("/admin/slow-queries", headers=headers)
+    assert response.status_code == status_code
+    assert len(slow_log.entries) == 1
+
+
+def _explain_engine(plan) -> MagicMock:
+    connection = AsyncMock()
+    connection.exec_driver_sql.return_value = MagicMock(
+        scalar_one=MagicMock(return_value=plan)
+    )
+
+    @contextlib.asynccontextmanager
+    async def connect():
+        yield connection
+
+    engine = MagicMock(connect=connect)
+    engine.connection = connection
+    return engine
+
+
+@pytest.mark.parametrize(
+    "statement, explained",
+    [
+        ("SELECT * FROM project WHERE project_id = $1", True),
+        ("SELECT pg_advisory_xact_lock($1, $2)", False),
+        ("SELECT * FROM project FOR UPDATE", False),
+        ("DELETE FROM project WHERE project_id = $1", False),
+    ],
+)
+def test_explain_sampled_selects(slow_log, statement, explained):
+    slow_log.engine = _explain_engine('[{"Plan": {"Node Type": "Seq Scan"}}]')
+
+    async def record():
+        entry = slow_log.record(statement, (7,), 0.5)
+        await asyncio.gather(*slow_log._explains)
+        return entry
+
+    entry = asyncio.run(record())
+    calls = slow_log.engine.connection.exec_driver_sql.call_args_list
+    if explained:
+        assert entry.plan == [{"Plan": {"Node Type": "Seq Scan"}}]
+        assert calls[-1].args == (
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement,
+            (7,),
+        )
+    else:
+        assert entry.plan is None
+        assert not calls
+
+
+def test_explain_failure_kept_on_entry(slow_log):
+    slow_log.engine = _explain_engine(None)
+    slow_log.engine.connection.exec_driver_sql.side_effect = [
+        None,
+        RuntimeError("canceling statement due to statement timeout"),
+    ]
+
+    async def record():
+        entry = slow_log.record("SELECT 1", (), 0.5)
+        await asyncio.gather(*slow_log._explains)
+        return entry
+
+    entry = asyncio.run(record())
+    assert entry.plan is None
+    assert "statement timeout" in entry.explain_error
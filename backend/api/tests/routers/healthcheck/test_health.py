@@ -0,0 +1,88 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.database.postgres import migrations
+from backend.metrics import saturation
+
+
+@pytest.fixture
+def current_version(mocker):
+    return mocker.patch.object(
+        saturation.migrations,
+        "current_version",
+        AsyncMock(return_value=migrations.HEAD),
+    )
+
+
+def test_live(sync_client):
+    response = sync_client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_ready(sync_client, current_version):
+    response = sync_client.get("/health/ready")
+    assert response.status_code == 200
+    report = response.json()
+    assert report["status"] == "ready"
+    assert report["reasons"] == []
+    assert report["database"]["reachable"] is True
+    assert report["database"]["schema_version"] == migrations.HEAD
+    current_version.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "outcome,reason",
+    [
+        (OSError("connection refused"), "database unreachable"),
+        (asyncio.TimeoutError(), "database unreachable"),
+        (None, "schema outdated"),
+    ],
+)
+def test_not_ready_on_database(sync_client, current_version, outcome, reason):
+    current_version.side_effect = [outcome] if outcome else None
+    current_version.return_value = None
+    response = sync_client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["reasons"] == [reason]
+
+
+def test_not_ready_on_saturated_pool(sync_client, current_version, mocker):
+    mocker.patch.object(saturation, "pool_usage", return_value=(15, 15))
+    response = sync_client.get("/health/ready")
+    assert response.status_code == 503
+    report = response.json()
+    assert report["reasons"] == ["pool saturated"]
+    assert report["pool"]["utilisation"] == 1.0
+    # Saturated pool isn't queued on for probe
+    assert report["database"]["reachable"] is None
+    current_version.assert_not_awaited()
+
+
+def test_not_ready_on_loop_lag(sync_client, current_version, mocker):
+    monitor = saturation.LoopLagMonitor()
+    monitor.samples.append(1.0)
+    mocker.patch.object(saturation, "loop_lag", monitor)
+    response = sync_client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["reasons"] == ["event loop lagging"]
+    assert response.json()["loop_lag_ms"] == 1000.0
+
+
+def test_loop_lag_monitor_sees_blocked_loop():
+    monitor = saturation.LoopLagMonitor(interval=0.01)
+
+    async def block():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)  # Blocking call on event loop
+        await asyncio.sleep(0.05)
+        lag = monitor.lag
+        await monitor.stop()
+        return lag
+
+    assert asyncio.run(block()) >= 0.15
+    assert monitor.lag == 0.0
@@ -0,0 +1,101 @@
+import asyncio
+import sqlite3
+from unittest.mock import AsyncMock
+
+import prometheus_client
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy.pool import QueuePool
+
+from backend.metrics import prometheus
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.database.postgres.session.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+def _samples(sync_client: TestClient) -> dict:
+    response = sync_client.get("/metrics")
+    assert response.status_code == 200
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+    }
+
+
+def test_metrics_route_template(mock_session, mocker, sync_client):
+    mocker.patch(
+        "backend.core.core.read_from_db",
+        AsyncMock(return_value=404),
+    )
+    key = (
+        "http_requests_total",
+        (
+            ("method", "GET"),
+            ("route", "/project/{project_id}"),
+            ("status", "404"),
+        ),
+    )
+    before = _samples(sync_client).get(key, 0)
+
+    sync_client.get("/project/404404")
+    sync_client.get("/project/404405")
+
+    samples = _samples(sync_client)
+    # Path template label, not one series per project id
+    assert samples[key] == before + 2
+    assert (
+        "http_request_duration_seconds_count",
+        (("method", "GET"), ("route", "/project/{project_id}")),
+    ) in samples
+    assert samples[("http_requests_in_flight", ())] >= 0
+
+
+def test_metrics_unmatched_route(sync_client: TestClient):
+    sync_client.get("/no/such/route")
+    key = (
+        "http_requests_total",
+        (("method", "GET"), ("route", "unmatched"), ("status", "404")),
+    )
+    assert _samples(sync_client)[key] >= 1
+
+
+def test_timed_records_failures_too():
+    @prometheus.timed
+    async def failing_core_call():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        asyncio.run(failing_core_call())
+    count = prometheus_client.REGISTRY.get_sample_value(
+        "core_call_duration_seconds_count",
+        {"function": "failing_core_call"},
+    )
+    assert count == 1
+
+
+def test_watch_pool_gauges():
+    pool = QueuePool(
+        lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=2
+    )
+    prometheus.watch_pool(pool)
+    checked_out = prometheus.POOL_CHECKED_OUT._value.get()
+
+    connections = [pool.connect() for _ in range(3)]
+    assert prometheus.POOL_CHECKED_OUT._value.get() == checked_out + 3
+    assert prometheus.POOL_OVERFLOW._value.get() == 2
+
+    for connection in connections:
+        connection.close()
+    assert prometheus.POOL_CHECKED_OUT._value.get() == checked_out
+    assert prometheus.POOL_OVERFLOW._value.get() == 0
@@ -0,0 +1,57 @@
+import pstats
+
+import pytest
+from asgi_correlation_id import CorrelationIdMiddleware
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.metrics import profiling
+
+
+def _client(directory, sample_rate: float = 0.0) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        return sum(range(10_000))
+
+    app.add_middleware(
+        profiling.ProfilingMiddleware,
+        directory=str(directory),
+        sample_rate=sample_rate,
+    )
+    app.add_middleware(CorrelationIdMiddleware, header_name="X-Request-ID")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "header,suffix",
+    [("1", ".html"), ("speedscope", ".speedscope.json")],
+)
+def test_profile_on_header(tmp_path, header, suffix):
+    response = _client(tmp_path).get("/slow", headers={"X-Profile": header})
+    assert response.status_code == 200
+    name = response.headers["x-profile-report"]
+    assert name == response.headers["x-request-id"] + suffix
+    assert (tmp_path / name).stat().st_size > 0
+
+
+def test_no_profile_without_header(tmp_path):
+    response = _client(tmp_path).get("/slow")
+    assert response.status_code == 200
+    assert "x-profile-report" not in response.headers
+    assert not tmp_path.exists() or not any(tmp_path.iterdir())
+
+
+def test_sampled_profile(tmp_path):
+    response = _client(tmp_path, sample_rate=1.0).get("/slow")
+    assert (tmp_path / response.headers["x-profile-report"]).exists()
+
+
+def test_cprofile_fallback(tmp_path, mocker):
+    mocker.patch.object(profiling, "PYINSTRUMENT", False)
+    response = _client(tmp_path).get("/slow", headers={"X-Profile": "1"})
+    name = response.headers["x-profile-report"]
+    assert name.endswith(".prof")
+    stats = pstats.Stats(str(tmp_path / name))
+    assert any(function == "slow" for _, _, function in stats.stats)
@@ -0,0 +1,63 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from loguru import logger
+from sqlalchemy import create_engine, text
+
+from backend.metrics import queries
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.database.postgres.session.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+def test_server_timing_header(mock_session, mocker, sync_client):
+    mocker.patch(
+        "backend.core.core.read_from_db",
+        AsyncMock(return_value=404),
+    )
+    response = sync_client.get("/project/41041")
+    assert response.status_code == 404
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="0 queries"')
+
+
+def test_query_budget_exceeded():
+    engine = create_engine("sqlite://")
+    queries.instrument(engine)
+    app = FastAPI()
+
+    @app.get("/n-plus-one")
+    def n_plus_one():
+        with engine.connect() as connection:
+            for project_id in range(3):
+                connection.execute(text("SELECT :id"), {"id": project_id})
+        return queries.current().count
+
+    messages = []
+    sink = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        client = TestClient(queries.QueryStatsMiddleware(app, budget=2))
+        response = client.get("/n-plus-one")
+    finally:
+        logger.remove(sink)
+
+    assert response.json() == 3
+    assert response.headers["server-timing"].endswith('desc="3 queries"')
+    assert len(messages) == 1
+    assert "over query budget of 2: queries=3" in messages[0]
+    assert "most repeated (3x): SELECT ?" in messages[0]
+    # Outside of request nothing is collected
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert queries.current() is None
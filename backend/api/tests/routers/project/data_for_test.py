@@ -1,6 +1,6 @@
 import datetime
 
-from backend.core.core_models import ProjectCore
+from backend.core.core_models import ProjectCore, ProjectHeader
 
 read_from_db_1 = ProjectCore(
     **{
@@ -78,3 +78,14 @@ flattened_geojson: dict = {
         ],
     },
 }
+
+read_header_from_db_1 = ProjectHeader(
+    project_id=read_from_db_1.project_id,
+    name=read_from_db_1.name,
+    start_date=read_from_db_1.start_date,
+    end_date=read_from_db_1.end_date,
+    description=read_from_db_1.description,
+    geojson_type=read_from_db_1.geojson.type,
+    geometry_type=read_from_db_1.geojson.geometry.type,
+    geometry_id=7,
+)
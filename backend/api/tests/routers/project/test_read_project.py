@@ -1,10 +1,15 @@
 from datetime import datetime
 from unittest.mock import AsyncMock
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
-from backend.api.tests.routers.project.data_for_test import read_from_db_1
+from backend.api.tests.routers.project.data_for_test import (
+    read_from_db_1,
+    read_header_from_db_1,
+)
+from backend.core.core_models import ProjectArrays
 
 
 @pytest.fixture
@@ -108,3 +113,134 @@ async def test_read_project_missing_id(mock_session, sync_client: TestClient):
     response = sync_client.get("/project/")
     assert response.status_code == 405
     assert response.json() == {"detail": "Method Not Allowed"}
+
+
+@pytest.mark.asyncio
+async def test_read_project_precision(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mocker.patch(
+        "backend.core.core.read_from_db",
+        AsyncMock(return_value=read_from_db_1),
+    )
+    response = sync_client.get("/project/2", params={"precision": 2})
+    assert response.status_code == 200
+    geometry = response.json()["geojson"]["geometry"]
+    assert geometry["coordinates"][0] == {
+        "latitude": -52.84,
+        "longitude": -5.63,
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_project_polyline(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mocker.patch(
+        "backend.core.core.read_from_db",
+        AsyncMock(return_value=read_from_db_1),
+    )
+    response = sync_client.get("/project/3", params={"encoding": "polyline"})
+    assert response.status_code == 200
+    geometry = response.json()["geojson"]["geometry"]
+    assert geometry["type"] == read_from_db_1.geojson.geometry.type
+    assert geometry["encoding"] == "polyline"
+    assert geometry["precision"] == 5
+    assert isinstance(geometry["coordinates"], str)
+
+
+@pytest.mark.asyncio
+async def test_read_project_msgpack(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    msgpack = pytest.importorskip("msgpack")
+    mocker.patch(
+        "backend.core.core.read_arrays_from_db",
+        AsyncMock(
+            return_value=ProjectArrays(
+                header=read_header_from_db_1,
+                points=np.array([(-52.8430645648562, -5.63351005831322)]),
+            )
+        ),
+    )
+    response = sync_client.get(
+        "/project/4", headers={"Accept": "application/msgpack"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    data = msgpack.unpackb(response.content)
+    assert data["project_id"] == read_header_from_db_1.project_id
+    assert data["geojson"]["geometry"]["coordinates"] == [
+        [-52.8430645648562, -5.63351005831322]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_project_not_acceptable(
+    mock_session,
+    sync_client: TestClient,
+):
+    response = sync_client.get("/project/5", headers={"Accept": "text/html"})
+    assert response.status_code == 406
+
+
+@pytest.mark.asyncio
+async def test_read_project_fields(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_read = mocker.patch(
+        "backend.core.core.read_from_db",
+        AsyncMock(
+            return_value=read_from_db_1.model_copy(update={"geojson": None})
+        ),
+    )
+    response = sync_client.get(
+        "/project/6", params={"fields": "name,date_range"}
+    )
+    assert response.status_code == 200
+    assert set(response.json()) == {"project_id", "name", "date_range"}
+    # Geometry not requested, so not loaded
+    assert mock_read.call_args.kwargs["include_geometry"] is False
+
+
+@pytest.mark.asyncio
+async def test_read_project_without_geometry(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_read = mocker.patch(
+        "backend.core.core.read_from_db",
+        AsyncMock(
+            return_value=read_from_db_1.model_copy(update={"geojson": None})
+        ),
+    )
+    response = sync_client.get(
+        "/project/7", params={"include_geometry": "false"}
+    )
+    assert response.status_code == 200
+    assert set(response.json()) == {
+        "project_id",
+        "name",
+        "description",
+        "date_range",
+        "summary",
+    }
+    assert mock_read.call_args.kwargs["include_geometry"] is False
+
+
+@pytest.mark.asyncio
+async def test_read_project_unknown_field(
+    mock_session,
+    sync_client: TestClient,
+):
+    response = sync_client.get("/project/8", params={"fields": "name,owner"})
+    assert response.status_code == 422
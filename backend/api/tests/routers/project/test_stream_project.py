@@ -0,0 +1,91 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.tests.routers.project.data_for_test import (
+    read_from_db_1,
+    read_header_from_db_1,
+)
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.database.postgres.session.DbContext",
+        return_value=async_mock,
+    )
+    mocker.patch(
+        "backend.api.routers.project.endpoints.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+def coordinate_chunks(chunk_size: int):
+    coordinates = [
+        (coordinate.latitude, coordinate.longitude)
+        for coordinate in read_from_db_1.geojson.geometry.coordinates
+    ]
+
+    async def stream_coordinates(**kwargs):
+        for i in range(0, len(coordinates), chunk_size):
+            yield coordinates[i : i + chunk_size]
+
+    return stream_coordinates
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 10])
+@pytest.mark.asyncio
+async def test_stream_project_matches_read(
+    mock_session,
+    mocker,
+    chunk_size,
+    sync_client: TestClient,
+):
+    mocker.patch(
+        "backend.core.core.read_header_from_db",
+        AsyncMock(return_value=read_header_from_db_1),
+    )
+    mock_stream = mocker.patch(
+        "backend.core.core.stream_coordinates",
+        side_effect=coordinate_chunks(chunk_size),
+    )
+    response = sync_client.get(
+        "/project/12/stream",
+        params={"offset": 1, "limit": 2},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["project_id"] == read_from_db_1.project_id
+    assert data["name"] == read_from_db_1.name
+    assert data["geojson"] == read_from_db_1.geojson.model_dump()
+    mock_stream.assert_called_once_with(
+        session=mock_session,
+        geometry_id=read_header_from_db_1.geometry_id,
+        offset=1,
+        limit=2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_project_not_found(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mocker.patch(
+        "backend.core.core.read_header_from_db",
+        AsyncMock(return_value=404),
+    )
+    response = sync_client.get("/project/9999/stream")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Project ID: 9999 Not Found"}
+
+
+def test_stream_project_negative_offset(sync_client: TestClient):
+    response = sync_client.get("/project/12/stream", params={"offset": -1})
+    assert response.status_code == 422
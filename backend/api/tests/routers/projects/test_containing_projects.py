@@ -0,0 +1,60 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.tests.routers.project.data_for_test import (
+    read_header_from_db_1,
+)
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.database.postgres.session.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+@pytest.mark.asyncio
+async def test_containing_projects(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_find = mocker.patch(
+        "backend.core.core.find_containing",
+        AsyncMock(return_value=[read_header_from_db_1]),
+    )
+    response = sync_client.get(
+        "/projects/containing", params={"lat": -52.82, "lon": -5.65}
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "project_id": read_header_from_db_1.project_id,
+            "name": read_header_from_db_1.name,
+            "description": read_header_from_db_1.description,
+            "date_range": [
+                read_header_from_db_1.start_date.isoformat(),
+                read_header_from_db_1.end_date.isoformat(),
+            ],
+        }
+    ]
+    mock_find.assert_called_once_with(
+        session=mock_session,
+        latitude=-52.82,
+        longitude=-5.65,
+    )
+
+
+@pytest.mark.parametrize("lat, lon", [(91, 0), (0, -181)])
+def test_containing_projects_out_of_range(lat, lon, sync_client: TestClient):
+    response = sync_client.get(
+        "/projects/containing", params={"lat": lat, "lon": lon}
+    )
+    assert response.status_code == 422
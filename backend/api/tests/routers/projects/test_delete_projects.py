@@ -0,0 +1,112 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core import core_models
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.database.postgres.session.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+@pytest.mark.asyncio
+async def test_delete_projects_by_ids(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_delete = mocker.patch(
+        "backend.core.core.delete_projects",
+        AsyncMock(return_value=core_models.DeleteResult([1, 3], [])),
+    )
+
+    response = sync_client.delete("/projects?ids=1&ids=2&ids=3")
+
+    assert response.status_code == 200
+    assert response.json() == {"project_ids": [1, 3], "skipped": []}
+    mock_delete.assert_called_once_with(
+        session=mock_session,
+        project_ids=[1, 2, 3],
+        active_from=None,
+        active_to=None,
+        name_prefix=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_projects_by_filter(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_delete = mocker.patch(
+        "backend.core.core.delete_projects",
+        AsyncMock(return_value=core_models.DeleteResult([], [])),
+    )
+
+    response = sync_client.delete(
+        "/projects",
+        params={
+            "active_from": "2023-01-01T00:00:00+02:00",
+            "name_prefix": "North",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"project_ids": [], "skipped": []}
+    assert mock_delete.call_args.kwargs == {
+        "session": mock_session,
+        "project_ids": None,
+        "active_from": datetime(2022, 12, 31, 22),
+        "active_to": None,
+        "name_prefix": "North",
+    }
+
+
+@pytest.mark.asyncio
+async def test_delete_projects_reports_locked_as_skipped(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    # Project 2 is being edited concurrently, its row is locked
+    mocker.patch(
+        "backend.core.core.delete_projects",
+        AsyncMock(return_value=core_models.DeleteResult([1, 3], [2])),
+    )
+
+    response = sync_client.delete("/projects?ids=1&ids=2&ids=3")
+
+    assert response.status_code == 200
+    assert response.json() == {"project_ids": [1, 3], "skipped": [2]}
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"active_from": "2023-03-01", "active_to": "2023-01-01"},
+        {"name_prefix": ""},
+        {"ids": list(range(1001))},
+    ],
+)
+def test_delete_projects_invalid(mocker, params, sync_client: TestClient):
+    mock_delete = mocker.patch(
+        "backend.core.core.delete_projects",
+        AsyncMock(return_value=[]),
+    )
+
+    response = sync_client.delete("/projects", params=params)
+
+    assert response.status_code == 422
+    mock_delete.assert_not_called()
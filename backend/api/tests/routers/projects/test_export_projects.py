@@ -0,0 +1,99 @@
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.routers.projects.endpoints import _export_body
+from backend.api.tests.routers.project.data_for_test import (
+    read_from_db_1,
+    read_header_from_db_1,
+)
+from backend.core import geometry
+from backend.core.core_models import ProjectArrays
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = mocker.AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.api.routers.projects.endpoints.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+@pytest.fixture
+def mock_stream(mocker):
+    points = geometry.coordinates_to_array(
+        read_from_db_1.geojson.geometry.coordinates
+    )
+    projects = [
+        ProjectArrays(
+            header=read_header_from_db_1.model_copy(
+                update={"project_id": project_id}
+            ),
+            points=points,
+        )
+        for project_id in (1, 2, 3)
+    ]
+
+    async def stream_projects(**kwargs):
+        for project in projects:
+            yield project
+
+    return mocker.patch(
+        "backend.core.core.stream_projects",
+        side_effect=stream_projects,
+    )
+
+
+def test_export_projects_ndjson(
+    mock_session,
+    mock_stream,
+    sync_client: TestClient,
+):
+    response = sync_client.get(
+        "/projects/export", headers={"Accept-Encoding": "identity"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["project_id"] for line in lines] == [1, 2, 3]
+    # Same shape as GET /project/{id}
+    assert lines[0]["geojson"]["geometry"]["coordinates"] == [
+        coordinate.model_dump()
+        for coordinate in read_from_db_1.geojson.geometry.coordinates
+    ]
+
+
+def test_export_projects_geojson_gzip(
+    mock_session,
+    mock_stream,
+    sync_client: TestClient,
+):
+    response = sync_client.get(
+        "/projects/export",
+        params={"format": "geojson"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    # httpx decodes gzip transparently
+    collection = json.loads(response.content)
+    assert collection["type"] == "FeatureCollection"
+    feature = collection["features"][0]
+    ring = feature["geometry"]["coordinates"][0][0]
+    first = read_from_db_1.geojson.geometry.coordinates[0]
+    assert ring[0] == [first.longitude, first.latitude]
+    assert ring[0] == ring[-1]
+    assert len(collection["features"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_export_body_gzip_roundtrip(mock_session, mock_stream):
+    chunks = [chunk async for chunk in _export_body("ndjson", compress=True)]
+    lines = gzip.decompress(b"".join(chunks)).splitlines()
+    assert [json.loads(line)["project_id"] for line in lines] == [1, 2, 3]
@@ -0,0 +1,248 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.tests.routers.project.data_for_test import read_from_db_1
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.database.postgres.session.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+@pytest.mark.asyncio
+async def test_list_projects_active_window(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_fetch = mocker.patch(
+        "backend.core.core.fetch_all_projects",
+        AsyncMock(return_value=[read_from_db_1]),
+    )
+    mock_count = mocker.patch(
+        "backend.core.core.get_projects_count",
+        AsyncMock(return_value=1),
+    )
+    response = sync_client.get(
+        "/projects/list",
+        params={
+            "active_from": "2023-01-01T00:00:00",
+            "active_to": "2023-01-31T12:00:00+02:00",
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["project_id"] == read_from_db_1.project_id
+    active = {
+        "active_from": datetime(2023, 1, 1),
+        # Aware input is normalised to naive UTC, as dates are stored
+        "active_to": datetime(2023, 1, 31, 10),
+        "active_at": None,
+        "min_area": None,
+    }
+    mock_fetch.assert_called_once_with(
+        session=mock_session,
+        page=0,
+        size=10,
+        **active,
+        sort="project_id",
+        include_geometry=True,
+    )
+    mock_count.assert_called_once_with(session=mock_session, **active)
+    # Pagination links keep filters
+    assert "active_from=2023-01-01T00%3A00%3A00" in response.headers["Link"]
+
+
+@pytest.mark.asyncio
+async def test_list_projects_active_at(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_fetch = mocker.patch(
+        "backend.core.core.fetch_all_projects",
+        AsyncMock(return_value=[read_from_db_1]),
+    )
+    mocker.patch(
+        "backend.core.core.get_projects_count",
+        AsyncMock(return_value=1),
+    )
+    response = sync_client.get(
+        "/projects/list",
+        params={"active_at": "2023-02-01T00:00:00"},
+    )
+    assert response.status_code == 200
+    assert mock_fetch.call_args.kwargs["active_at"] == datetime(2023, 2, 1)
+    assert mock_fetch.call_args.kwargs["active_from"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_projects_active_window_reversed(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_fetch = mocker.patch(
+        "backend.core.core.fetch_all_projects",
+        AsyncMock(return_value=[read_from_db_1]),
+    )
+    response = sync_client.get(
+        "/projects/list",
+        params={
+            "active_from": "2023-03-01T00:00:00",
+            "active_to": "2023-02-01T00:00:00",
+        },
+    )
+    assert response.status_code == 422
+    mock_fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_projects_without_geometry(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_fetch = mocker.patch(
+        "backend.core.core.fetch_all_projects",
+        AsyncMock(
+            return_value=[read_from_db_1.model_copy(update={"geojson": None})]
+        ),
+    )
+    mocker.patch(
+        "backend.core.core.get_projects_count",
+        AsyncMock(return_value=1),
+    )
+    response = sync_client.get(
+        "/projects/list",
+        params={"fields": "name", "include_geometry": "false"},
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"project_id": read_from_db_1.project_id, "name": read_from_db_1.name}
+    ]
+    assert mock_fetch.call_args.kwargs["include_geometry"] is False
+    # Sparse responses keep pagination headers
+    assert response.headers["X-Page"] == "1"
+    assert "fields=name,project_id" in response.headers["Link"]
+
+
+@pytest.mark.asyncio
+async def test_list_projects_sort_by_area(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    project = read_from_db_1.model_copy(
+        update={
+            "area": 1200.5,
+            "perimeter": 140.0,
+            "centroid_latitude": -52.8,
+            "centroid_longitude": -5.6,
+            "vertex_count": 4,
+        }
+    )
+    mock_fetch = mocker.patch(
+        "backend.core.core.fetch_all_projects",
+        AsyncMock(return_value=[project]),
+    )
+    mock_count = mocker.patch(
+        "backend.core.core.get_projects_count",
+        AsyncMock(return_value=1),
+    )
+    response = sync_client.get(
+        "/projects/list",
+        params={"sort": "-area", "min_area": 1000},
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["summary"] == {
+        "area": 1200.5,
+        "perimeter": 140.0,
+        "centroid": {"latitude": -52.8, "longitude": -5.6},
+        "vertex_count": 4,
+    }
+    assert mock_fetch.call_args.kwargs["sort"] == "-area"
+    assert mock_fetch.call_args.kwargs["min_area"] == 1000
+    assert mock_count.call_args.kwargs["min_area"] == 1000
+    assert "sort=-area" in response.headers["Link"]
+
+
+def test_list_projects_invalid_sort(sync_client: TestClient):
+    response = sync_client.get("/projects/list", params={"sort": "name"})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "page, count, estimate, expected_total, expected_mode",
+    [
+        (1, "exact", None, "42", "exact"),
+        (2, "estimate", 40, "40", "estimate"),
+        # Never analyzed table has no statistics, exact count is used
+        (3, "estimate", None, "42", "exact"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_list_projects_total_count(
+    mock_session,
+    mocker,
+    page,
+    count,
+    estimate,
+    expected_total,
+    expected_mode,
+    sync_client: TestClient,
+):
+    mocker.patch(
+        "backend.core.core.fetch_all_projects",
+        AsyncMock(return_value=[read_from_db_1]),
+    )
+    mock_count = mocker.patch(
+        "backend.core.core.get_projects_count",
+        AsyncMock(return_value=42),
+    )
+    mock_estimate = mocker.patch(
+        "backend.core.core.estimate_projects_count",
+        AsyncMock(return_value=estimate),
+    )
+    response = sync_client.get(
+        "/projects/list",
+        params={"count": count, "page": page, "size": 7, "min_area": 1.5},
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == expected_total
+    assert response.headers["X-Total-Count-Mode"] == expected_mode
+    assert mock_estimate.called == (count == "estimate")
+    assert mock_count.called == (expected_mode == "exact")
+
+
+@pytest.mark.asyncio
+async def test_list_projects_cache_hit_keeps_headers(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mocker.patch(
+        "backend.core.core.fetch_all_projects",
+        AsyncMock(return_value=[read_from_db_1]),
+    )
+    mock_count = mocker.patch(
+        "backend.core.core.get_projects_count",
+        AsyncMock(return_value=42),
+    )
+    params = {"count": "exact", "page": 2, "size": 3, "min_area": 7.25}
+    first = sync_client.get("/projects/list", params=params)
+    second = sync_client.get("/projects/list", params=params)
+    assert mock_count.await_count == 1  # Second one is cache hit
+    assert second.content == first.content
+    for header in ("Link", "X-Page", "X-Size", "X-Total-Count"):
+        assert second.headers[header] == first.headers[header]
+    assert second.headers["X-Total-Count-Mode"] == "exact"
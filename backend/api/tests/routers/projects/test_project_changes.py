@@ -0,0 +1,103 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.routers.projects.validators.cursor_validator import (
+    encode_cursor,
+)
+from backend.api.tests.routers.project.data_for_test import read_from_db_1
+from backend.core import core_models
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.database.postgres.session.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+@pytest.mark.asyncio
+async def test_project_changes(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    changed_at = datetime(2024, 5, 1, 12)
+    mock_changes = mocker.patch(
+        "backend.core.core.fetch_changes",
+        AsyncMock(
+            return_value=core_models.ChangePage(
+                changes=[
+                    core_models.Change(41, 12, changed_at, read_from_db_1),
+                    core_models.Change(42, 7, changed_at, None),
+                ],
+                next_seq=42,
+                has_more=True,
+            )
+        ),
+    )
+
+    response = sync_client.get(
+        "/projects/changes",
+        params={"since": encode_cursor([40]), "size": 2},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [
+        (change["change_seq"], change["op"], change["project_id"])
+        for change in body["changes"]
+    ] == [(41, "upsert", 12), (42, "delete", 7)]
+    assert body["changes"][0]["project"]["name"] == read_from_db_1.name
+    assert body["changes"][1]["project"] is None
+    assert body["next"] == encode_cursor([42])
+    assert body["has_more"] is True
+    mock_changes.assert_called_once_with(
+        session=mock_session,
+        since=40,
+        size=2,
+        include_geometry=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_project_changes_full_sync(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_changes = mocker.patch(
+        "backend.core.core.fetch_changes",
+        AsyncMock(
+            return_value=core_models.ChangePage(
+                changes=[], next_seq=0, has_more=False
+            )
+        ),
+    )
+
+    response = sync_client.get("/projects/changes?include_geometry=false")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "changes": [],
+        "next": encode_cursor([0]),
+        "has_more": False,
+    }
+    assert mock_changes.call_args.kwargs["since"] == 0
+    assert mock_changes.call_args.kwargs["include_geometry"] is False
+
+
+@pytest.mark.parametrize(
+    "since",
+    ["not-a-token", encode_cursor([1, 2]), encode_cursor(["1"])],
+)
+def test_project_changes_invalid_token(since, sync_client: TestClient):
+    response = sync_client.get("/projects/changes", params={"since": since})
+    assert response.status_code == 422
@@ -0,0 +1,150 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.routers.projects.validators.cursor_validator import (
+    encode_cursor,
+)
+from backend.api.tests.routers.project.data_for_test import read_from_db_1
+from backend.core.core_models import SearchHit
+
+
+@pytest.fixture
+def mock_session(mocker):
+    async_mock = AsyncMock()
+    async_mock.__aenter__.return_value = async_mock
+    async_mock.__aexit__.return_value = None  # Mock the exit
+    mocker.patch(
+        "backend.database.postgres.session.DbContext",
+        return_value=async_mock,
+    )
+    return async_mock
+
+
+@pytest.mark.asyncio
+async def test_search_projects_bbox(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_search = mocker.patch(
+        "backend.core.core.search_projects",
+        AsyncMock(
+            return_value=[
+                SearchHit(read_from_db_1, [read_from_db_1.project_id])
+            ]
+        ),
+    )
+    response = sync_client.get(
+        "/projects/search",
+        params={"bbox": "-5.7,-52.9,-5.6,-52.7", "size": 1},
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["project_id"] == read_from_db_1.project_id
+    mock_search.assert_called_once_with(
+        session=mock_session,
+        bbox=(-5.7, -52.9, -5.6, -52.7),
+        name=None,
+        after=None,
+        size=1,
+    )
+    # Full page means there may be more, cursor points after last row
+    assert response.headers["X-Next-Cursor"] == encode_cursor(
+        [read_from_db_1.project_id]
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_projects_cursor(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    mock_search = mocker.patch(
+        "backend.core.core.search_projects",
+        AsyncMock(return_value=[]),
+    )
+    response = sync_client.get(
+        "/projects/search",
+        params={"bbox": "-180,-90,180,90", "cursor": encode_cursor([12])},
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+    assert mock_search.call_args.kwargs["after"] == [12]
+
+
+@pytest.mark.parametrize(
+    "bbox",
+    ["1,2,3", "a,b,c,d", "10,0,-10,5", "-181,0,0,1", "0,-91,1,1"],
+)
+def test_search_projects_invalid_bbox(bbox, sync_client: TestClient):
+    response = sync_client.get("/projects/search", params={"bbox": bbox})
+    assert response.status_code == 422
+
+
+def test_search_projects_invalid_cursor(sync_client: TestClient):
+    response = sync_client.get(
+        "/projects/search",
+        params={"bbox": "-180,-90,180,90", "cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_projects_name(
+    mock_session,
+    mocker,
+    sync_client: TestClient,
+):
+    key = [1, -0.5, read_from_db_1.project_id]
+    mock_search = mocker.patch(
+        "backend.core.core.search_projects",
+        AsyncMock(return_value=[SearchHit(read_from_db_1, key)]),
+    )
+    response = sync_client.get(
+        "/projects/search",
+        params={"name": "Projetc", "size": 1},
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["project_id"] == read_from_db_1.project_id
+    mock_search.assert_called_once_with(
+        session=mock_session,
+        bbox=None,
+        name="Projetc",
+        after=None,
+        size=1,
+    )
+    # Cursor carries whole sort key, not just id
+    assert response.headers["X-Next-Cursor"] == encode_cursor(key)
+    assert "name=Projetc" in response.headers["Link"]
+
+
+def test_search_projects_requires_criteria(sync_client: TestClient):
+    response = sync_client.get("/projects/search", params={"size": 3})
+    assert response.status_code == 422
+
+
+def test_search_projects_foreign_cursor(sync_client: TestClient):
+    response = sync_client.get(
+        "/projects/search",
+        params={"name": "Proj", "cursor": encode_cursor([12])},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"name": "Proj", "cursor": encode_cursor(["a", "b", "c"])},
+        {"name": "Proj", "cursor": encode_cursor([0, -0.5, "12"])},
+        {"name": "Proj", "cursor": encode_cursor([0, -0.5, 1.5])},
+        {"bbox": "-180,-90,180,90", "cursor": encode_cursor(["12"])},
+        {"bbox": "-180,-90,180,90", "cursor": encode_cursor([True])},
+        {"bbox": "-180,-90,180,90", "cursor": encode_cursor([None])},
+    ],
+)
+def test_search_projects_malformed_cursor(params, sync_client: TestClient):
+    response = sync_client.get("/projects/search", params=params)
+    assert response.status_code == 422
@@ -0,0 +1,139 @@
+"""
+Time and peak memory of `backend.core` functions across geometry sizes.
+API tests mock `core` entirely, these run it against Postgres.
+Not collected by plain `pytest`, run with `make bench` (compare against
+    saved run) or `make bench-baseline` (save new baseline).
+Vertex counts above `BENCH_MAX_VERTICES` (default 100 000) are skipped,
+    `make bench-full` goes up to 1M.
+"""
+
+import itertools
+import os
+from datetime import datetime
+
+import pytest
+
+from backend.api.routers.project.models import request_models
+from backend.benchmarks.conftest import project_kwargs, ring
+from backend.core import core
+
+pytest.importorskip("pytest_benchmark")
+
+MAX_VERTICES: int = int(os.getenv("BENCH_MAX_VERTICES") or 100_000)
+VERTICES: list[int] = [
+    count
+    for count in (10, 1_000, 10_000, 100_000, 1_000_000)
+    if count <= MAX_VERTICES
+]
+PAGE_SIZES: list[int] = [10, 50, 100]
+LIST_PROJECTS: int = 200
+LIST_VERTICES: int = 1_000
+# No other benchmark writes projects active this year
+LIST_YEAR: int = 2010
+
+
+def _rounds(vertices: int) -> int:
+    """Fewer rounds for large geometries, so suite stays in minutes."""
+    return max(1, min(20, 200_000 // vertices))
+
+
+@pytest.mark.parametrize("vertices", VERTICES)
+def test_model_flatten(benchmark, peak_memory, vertices):
+    geojson = request_models.GeoJson(
+        type="Feature",
+        geometry={
+            "type": "MultiPolygon",
+            "coordinates": [[ring(vertices).tolist()]],
+        },
+    )
+    peak_memory(geojson.model_flatten)
+    flattened = benchmark(geojson.model_flatten)
+    assert len(flattened["geometry"]["coordinates"]) == vertices
+
+
+@pytest.mark.parametrize("vertices", VERTICES)
+def test_dict_hash(benchmark, peak_memory, vertices):
+    kwargs = project_kwargs(ring(vertices))
+    inputs = {
+        "name": kwargs["name"],
+        "start_date": str(kwargs["start_date"]),
+        "end_date": str(kwargs["end_date"]),
+        "description": kwargs["description"],
+        "geojson": kwargs["flattened_geojson"],
+    }
+    peak_memory(core.dict_hash, inputs)
+    assert len(benchmark(core.dict_hash, inputs)) == 64
+
+
+@pytest.mark.parametrize("vertices", VERTICES)
+def test_read_from_db(benchmark, peak_memory, run, seed, vertices):
+    (project_id,) = seed(vertices)
+    peak_memory(run, core.read_from_db, project_id=project_id)
+    project = benchmark.pedantic(
+        run,
+        args=(core.read_from_db,),
+        kwargs={"project_id": project_id},
+        rounds=_rounds(vertices),
+    )
+    assert len(project.geojson.geometry.coordinates) == vertices
+
+
+@pytest.mark.parametrize("vertices", VERTICES)
+def test_add_to_db(benchmark, peak_memory, run, vertices):
+    kwargs = project_kwargs(ring(vertices))
+    peak_memory(run, core.add_to_db, **kwargs)
+    project_id = benchmark.pedantic(
+        run,
+        args=(core.add_to_db,),
+        kwargs=kwargs,
+        rounds=_rounds(vertices),
+    )
+    assert isinstance(project_id, int)
+
+
+@pytest.mark.parametrize("vertices", VERTICES)
+def test_edit_in_db(benchmark, peak_memory, run, vertices):
+    points = ring(vertices)
+    project_id = run(core.add_to_db, **project_kwargs(points))
+    # New description every round, so edit is never a no-op
+    edits = itertools.count()
+
+    def setup():
+        kwargs = project_kwargs(points, description=f"edit {next(edits)}")
+        return (core.edit_in_db,), {"project_id": project_id, **kwargs}
+
+    args, kwargs = setup()
+    peak_memory(run, *args, **kwargs)
+    result = benchmark.pedantic(run, setup=setup, rounds=_rounds(vertices))
+    assert result == 200
+
+
+@pytest.mark.parametrize("vertices", VERTICES)
+def test_delete_from_db(benchmark, peak_memory, run, vertices):
+    kwargs = project_kwargs(ring(vertices))
+
+    def setup():
+        # Untimed, every round deletes project of its own
+        project_id = run(core.add_to_db, **kwargs)
+        return (core.delete_from_db,), {"project_id": project_id}
+
+    args, delete_kwargs = setup()
+    peak_memory(run, *args, **delete_kwargs)
+    result = benchmark.pedantic(run, setup=setup, rounds=_rounds(vertices))
+    assert result == 200
+
+
+@pytest.mark.parametrize("include_geometry", [True, False])
+@pytest.mark.parametrize("size", PAGE_SIZES)
+def test_fetch_all_projects(
+    benchmark, peak_memory, run, seed, size, include_geometry
+):
+    seed(LIST_VERTICES, LIST_PROJECTS, year=LIST_YEAR)
+    kwargs = {
+        "size": size,
+        "include_geometry": include_geometry,
+        "active_at": datetime(LIST_YEAR, 6, 1),
+    }
+    peak_memory(run, core.fetch_all_projects, **kwargs)
+    projects = benchmark(run, core.fetch_all_projects, **kwargs)
+    assert len(projects) == size
@@ -0,0 +1,66 @@
+"""
+Cold start of API worker, each round in fresh interpreter.
+`test_import_app` is interpreter start plus `backend.api.app` import,
+    `test_first_request` adds lifespan startup and one request, so
+    phases of `backend.metrics.startup` are kept in `extra_info`.
+Run with `make bench` next to `bench_core.py`, same baseline compare.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT: Path = Path(__file__).resolve().parents[2]
+ROUNDS: int = 5
+
+FIRST_REQUEST: str = """
+import json
+from fastapi.testclient import TestClient
+from backend.api.app import app
+from backend.metrics import startup
+with TestClient(app) as client:
+    assert client.get("/health/").status_code == 200
+print(json.dumps(startup.phases))
+"""
+
+
+def _python(code: str, cwd: Path) -> str:
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "LOG_LEVEL": "WARNING"}
+    # Own cwd, app's log files don't land in repository
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout
+
+
+def test_import_app(benchmark, tmp_path):
+    benchmark.pedantic(
+        _python,
+        args=("import backend.api.app", tmp_path),
+        rounds=ROUNDS,
+        warmup_rounds=1,
+    )
+
+
+def test_first_request(benchmark, database, tmp_path):
+    output = benchmark.pedantic(
+        _python,
+        args=(FIRST_REQUEST, tmp_path),
+        rounds=ROUNDS,
+        warmup_rounds=1,
+    )
+    phases = json.loads(output.splitlines()[-1])
+    benchmark.extra_info.update(
+        {phase: round(seconds, 3) for phase, seconds in phases.items()}
+    )
@@ -0,0 +1,213 @@
+"""
+Fixtures of `bench_core.py`, see `make bench`.
+Benchmarks run against Postgres from `backend.database.postgres.config`
+    and are skipped when it can't be reached.
+Peak memory (tracemalloc) is compared against `baseline/memory.json`,
+    which is committed, as Python allocations don't depend on machine.
+    Time baselines do, pytest-benchmark keeps them in `.benchmarks`.
+"""
+
+import asyncio
+import json
+import os
+import tracemalloc
+import typing
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from backend.core import core
+from backend.database.postgres import config
+from backend.database.postgres.session import (
+    DbContext,
+    dispose_engine,
+    init_db,
+)
+from backend.tools import importer
+
+NAME_PREFIX: str = "bench-core-"
+MEMORY_BASELINE: Path = Path(__file__).parent / "baseline" / "memory.json"
+# Peak may grow this much over baseline before benchmark fails
+MEMORY_TOLERANCE: float = float(os.getenv("BENCH_MEMORY_TOLERANCE") or 0.25)
+UPDATE_BASELINE: bool = bool(os.getenv("BENCH_UPDATE_BASELINE"))
+
+
+def ring(vertices: int, seed: int = 0) -> np.ndarray:
+    """(N, 2) (lat, lon) star shaped ring, noisy so it isn't trivial."""
+    rng = np.random.default_rng(seed)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, vertices))
+    radii = rng.uniform(0.5, 1.0, vertices)
+    return np.column_stack(
+        (50 + radii * np.sin(angles), 20 + radii * np.cos(angles))
+    )
+
+
+def project_kwargs(points: np.ndarray, description: str = "bench") -> dict:
+    """Keyword arguments of `core.add_to_db` / `core.edit_in_db`."""
+    return {
+        "name": f"{NAME_PREFIX}{len(points)}",
+        "start_date": datetime(2020, 1, 1),
+        "end_date": datetime(2021, 1, 1),
+        "description": description,
+        "flattened_geojson": {
+            "type": "Feature",
+            "geometry": {
+                "type": "MultiPolygon",
+                "coordinates": [
+                    {"latitude": lat, "longitude": lon}
+                    for lat, lon in points.tolist()
+                ],
+            },
+        },
+    }
+
+
+class MemoryBaseline:
+    """Peak KiB per benchmark, read from and written to `MEMORY_BASELINE`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.peaks: dict[str, float] = (
+            json.loads(path.read_text()) if path.exists() else {}
+        )
+
+    def check(self, name: str, peak_kib: float) -> None:
+        if UPDATE_BASELINE:
+            self.peaks[name] = round(peak_kib, 1)
+            return
+        baseline = self.peaks.get(name)
+        if baseline is not None and peak_kib > baseline * (
+            1 + MEMORY_TOLERANCE
+        ):
+            pytest.fail(
+                f"Peak memory {peak_kib:.1f} KiB over baseline"
+                f" {baseline:.1f} KiB (+{MEMORY_TOLERANCE:.0%} allowed)"
+            )
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(dict(sorted(self.peaks.items())), indent=2) + "\n"
+        )
+
+
+@pytest.fixture(scope="session")
+def memory_baseline() -> typing.Iterator[MemoryBaseline]:
+    baseline = MemoryBaseline(MEMORY_BASELINE)
+    yield baseline
+    if UPDATE_BASELINE:
+        baseline.save()
+
+
+@pytest.fixture
+def peak_memory(request, benchmark, memory_baseline) -> typing.Callable:
+    """Runs function once under tracemalloc, outside of timed rounds."""
+
+    def measure(function: typing.Callable, *args, **kwargs) -> typing.Any:
+        tracemalloc.start()
+        try:
+            result = function(*args, **kwargs)
+            peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_kib"] = round(peak_kib, 1)
+        memory_baseline.check(request.node.name, peak_kib)
+        return result
+
+    return measure
+
+
+@pytest.fixture(scope="session")
+def loop() -> typing.Iterator[asyncio.AbstractEventLoop]:
+    """One loop for whole run, pooled asyncpg connections are bound to it."""
+    event_loop = asyncio.new_event_loop()
+    yield event_loop
+    event_loop.run_until_complete(dispose_engine())
+    event_loop.close()
+
+
+@pytest.fixture(scope="session")
+def database(loop) -> typing.Iterator[None]:
+    try:
+        init_db()
+    except OperationalError as exc:
+        pytest.skip(f"Postgres not reachable: {exc.orig}")
+    # Pool connections and compiled statement cache, not first benchmark
+    loop.run_until_complete(_warm_up())
+    yield
+    loop.run_until_complete(_cleanup())
+
+
+async def _warm_up() -> None:
+    async with DbContext() as session:
+        await core.read_from_db(session=session, project_id=0)
+
+
+async def _cleanup() -> None:
+    async with DbContext() as session:
+        await core.delete_projects(session=session, name_prefix=NAME_PREFIX)
+
+
+@pytest.fixture
+def run(loop, database) -> typing.Callable:
+    """Runs `core` coroutine function with fresh session, synchronously."""
+
+    def call(function: typing.Callable, **kwargs) -> typing.Any:
+        async def with_session():
+            async with DbContext() as session:
+                return await function(session=session, **kwargs)
+
+        return loop.run_until_complete(with_session())
+
+    return call
+
+
+@pytest.fixture(scope="session")
+def seed(database) -> typing.Callable:
+    """
+    Loads projects through COPY (`tools.importer`), cached per shape.
+    Projects are active through given year, so listings can select them.
+    :return: Function returning ids of seeded projects.
+    """
+    import psycopg2
+
+    connection = psycopg2.connect(
+        host=config.POSTGRES_HOSTNAME,
+        port=config.POSTGRES_PORT,
+        user=config.POSTGRES_USER,
+        password=config.POSTGRES_PASSWORD,
+        dbname=config.POSTGRES_DB,
+    )
+    seeded: dict[tuple[int, int, int], list[int]] = {}
+
+    def load(vertices: int, projects: int = 1, year: int = 2020) -> list[int]:
+        key = (vertices, projects, year)
+        if key not in seeded:
+            name = f"{NAME_PREFIX}seed-{vertices}-{projects}-{year}"
+            records = [
+                importer.ImportRecord(
+                    name=name,
+                    description="bench",
+                    start_date=datetime(year, 1, 1),
+                    end_date=datetime(year, 12, 31),
+                    geojson_type="Feature",
+                    geometry_type="MultiPolygon",
+                    points=ring(vertices, seed=number),
+                )
+                for number in range(projects)
+            ]
+            importer.load_records(connection, records)
+            with connection, connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT project_id FROM project WHERE name = %s"
+                    " ORDER BY project_id",
+                    (name,),
+                )
+                seeded[key] = [row[0] for row in cursor.fetchall()]
+        return seeded[key]
+
+    yield load
+    connection.close()
@@ -0,0 +1,124 @@
+"""
+Point in polygon lookup latency against a seeded Postgres.
+Seeds N triangle projects server side (generate_series, no round trips),
+    so half of every bounding box is outside its geometry and exact
+    ray casting step is exercised, then times `core.find_containing`.
+Seeded rows are named `bench-*` and removed afterwards.
+
+Usage: python -m backend.benchmarks.containing [projects] [queries]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from backend.core import core
+from backend.database.postgres.session import DbContext, init_db
+
+DEFAULT_PROJECTS: int = 100_000
+DEFAULT_QUERIES: int = 1_000
+NAME_PREFIX: str = "bench-"
+
+SEED_SQL = text(
+    """
+    WITH boxes AS (
+        SELECT g,
+               random() * 170 - 85 AS lat,
+               random() * 350 - 175 AS lon,
+               0.01 + random() * 0.5 AS size
+        FROM generate_series(1, :projects) AS g
+    ), p AS (
+        INSERT INTO project (
+            name, start_date, end_date, description,
+            min_latitude, min_longitude, max_latitude, max_longitude
+        )
+        SELECT :prefix || g, now() - interval '1 year', now(), NULL,
+               lat, lon, lat + size, lon + size
+        FROM boxes
+        RETURNING project_id, min_latitude, min_longitude,
+                  max_latitude, max_longitude
+    ), gj AS (
+        INSERT INTO geojson (type, project_id)
+        SELECT 'Feature', project_id FROM p
+        RETURNING geojson_id, project_id
+    ), ge AS (
+        INSERT INTO geometry (type, geojson_id)
+        SELECT 'MultiPolygon', geojson_id FROM gj
+        RETURNING geometry_id, geojson_id
+    )
+    INSERT INTO coordinate (latitude, longitude, geometry_id)
+    SELECT v.lat, v.lon, ge.geometry_id
+    FROM ge
+    JOIN gj USING (geojson_id)
+    JOIN p USING (project_id)
+    CROSS JOIN LATERAL (
+        VALUES (p.min_latitude, p.min_longitude),
+               (p.min_latitude, p.max_longitude),
+               (p.max_latitude, p.max_longitude)
+    ) AS v(lat, lon)
+    """
+)
+CLEANUP_SQL = text("DELETE FROM project WHERE name LIKE :prefix || '%'")
+
+
+async def run(projects: int, queries: int) -> dict:
+    init_db()
+    async with DbContext() as session:
+        start = time.perf_counter()
+        await session.execute(
+            SEED_SQL, {"projects": projects, "prefix": NAME_PREFIX}
+        )
+        await session.commit()
+        await session.execute(text("ANALYZE project"))
+        seeded_in = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform((-85, -175), (85, 175), size=(queries, 2))
+    timings = []
+    found = 0
+    try:
+        async with DbContext() as session:
+            for latitude, longitude in points.tolist():
+                start = time.perf_counter()
+                result = await core.find_containing(
+                    session=session,
+                    latitude=latitude,
+                    longitude=longitude,
+                )
+                timings.append(time.perf_counter() - start)
+                found += len(result)
+    finally:
+        async with DbContext() as session:
+            await session.execute(CLEANUP_SQL, {"prefix": NAME_PREFIX})
+    timings.sort()
+    return {
+        "projects": projects,
+        "queries": queries,
+        "seed_s": seeded_in,
+        "hits": found,
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+        "max_ms": timings[-1] * 1000,
+    }
+
+
+def main(argv: list[str]) -> None:
+    projects = int(argv[0]) if argv else DEFAULT_PROJECTS
+    queries = int(argv[1]) if len(argv) > 1 else DEFAULT_QUERIES
+    result = asyncio.run(run(projects, queries))
+    print(
+        " ".join(
+            f"{key}={value:.3f}"
+            if isinstance(value, float)
+            else f"{key}={value}"
+            for key, value in result.items()
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,108 @@
+"""
+Compares response size and encode time of JSON path against binary formats.
+JSON path mirrors `read_project`: ORM-like rows validated into core models,
+    wrapped in ProjectResponse, dumped to JSON.
+Binary formats encode straight from (N, 2) coordinate array.
+
+Usage: python -m backend.benchmarks.encoding_formats [vertices ...]
+"""
+
+import json
+import sys
+import time
+import typing
+from datetime import datetime
+
+import numpy as np
+
+from backend.api.routers.project.models import response_models
+from backend.core import core_models, formats
+
+DEFAULT_VERTICES: list[int] = [1_000, 10_000, 100_000, 1_000_000]
+REPEATS: int = 3
+
+
+def _header() -> core_models.ProjectHeader:
+    return core_models.ProjectHeader(
+        project_id=1,
+        name="Benchmark",
+        start_date=datetime(2020, 1, 1),
+        end_date=datetime(2021, 1, 1),
+        description="Encoding formats benchmark",
+        geojson_type="Feature",
+        geometry_type="MultiPolygon",
+        geometry_id=1,
+    )
+
+
+def _json_path(project: core_models.ProjectArrays) -> bytes:
+    header = project.header
+    core = core_models.ProjectCore(
+        project_id=header.project_id,
+        name=header.name,
+        start_date=header.start_date,
+        end_date=header.end_date,
+        description=header.description,
+        geojson={
+            "type": header.geojson_type,
+            "geometry": {
+                "type": header.geometry_type,
+                "coordinates": [
+                    {"latitude": lat, "longitude": lon}
+                    for lat, lon in project.points.tolist()
+                ],
+            },
+        },
+    )
+    response = response_models.ProjectResponse(
+        project_id=core.project_id,
+        name=core.name,
+        description=core.description,
+        date_range=(core.start_date, core.end_date),
+        geojson=core.geojson,
+    )
+    return json.dumps(response.model_dump(mode="json")).encode("utf-8")
+
+
+def _timed(func: typing.Callable[[], bytes]) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        size = len(func())
+        best = min(best, time.perf_counter() - start)
+    return best, size
+
+
+def run(vertices: list[int]) -> list[dict]:
+    rng = np.random.default_rng(0)
+    results = []
+    for count in vertices:
+        points = rng.uniform((-90, -180), (90, 180), size=(count, 2))
+        project = core_models.ProjectArrays(header=_header(), points=points)
+        candidates = {"json": lambda: _json_path(project)}
+        for media_type in formats.available():
+            if media_type != formats.JSON:
+                candidates[media_type] = lambda m=media_type: formats.encode(
+                    m, project
+                )
+        for name, func in candidates.items():
+            seconds, size = _timed(func)
+            results.append(
+                {"vertices": count, "format": name, "s": seconds, "b": size}
+            )
+    return results
+
+
+def main(argv: list[str]) -> None:
+    vertices = [int(arg) for arg in argv] or DEFAULT_VERTICES
+    print(f"{'vertices':>10} {'format':<38} {'encode ms':>10} {'bytes':>12}")
+    for row in run(vertices):
+        print(
+            f"{row['vertices']:>10} {row['format']:<38} "
+            f"{row['s'] * 1000:>10.2f} {row['b']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -2,7 +2,7 @@
 
 import hashlib
 import json
-from typing import List
+from typing import List, Optional
 
 from cache_fastapi.Backends.base_backend import BaseBackend
 from fastapi import Request
@@ -11,15 +11,37 @@ from starlette.concurrency import iterate_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response, StreamingResponse
 
+# Set by endpoints themselves, stored with body and replayed on hits.
+#   Headers of middlewares inside this one (CORS) depend on request
+REPLAYED_HEADERS: tuple[str, ...] = (
+    "link",
+    "x-page",
+    "x-size",
+    "x-total-count",
+    "x-total-count-mode",
+    "x-next-cursor",
+)
+
 
 class CacheMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, cached_endpoints: List[str], backend: BaseBackend):
+    def __init__(
+        self,
+        app,
+        cached_endpoints: List[str],
+        backend: BaseBackend,
+        excluded_endpoints: Optional[List[str]] = None,
+    ):
         super().__init__(app)
         self.cached_endpoints = cached_endpoints
+        # Streamed responses must not be buffered for caching
+        self.excluded_endpoints = excluded_endpoints or []
         self.backend = backend
         self.cache_age: int = 60
 
     def matches_any_path(self, path_url):
+        for pattern in self.excluded_endpoints:
+            if pattern in path_url:
+                return False
         for pattern in self.cached_endpoints:
             if pattern in path_url:
                 return True
@@ -56,9 +78,15 @@ class CacheMiddleware(BaseHTTPMiddleware):
         cache_control = request.headers.get("Cache-Control", "max-age=60")
 
         path_params_str: str = str(request.path_params)
-        query_params_str: str = str(request.query_params)
+        # Sorted, so reordered params (e.g. fields=, include_geometry=)
+        #   share one entry while different field sets never do
+        query_params_str: str = str(sorted(request.query_params.multi_items()))
+        # Same URL can be negotiated into different media types
+        accept_str: str = request.headers.get("Accept", "")
         request_body = await self.get_request_body(request)
-        combined_params = path_params_str + query_params_str + request_body
+        combined_params = (
+            path_params_str + query_params_str + accept_str + request_body
+        )
 
         # Generate a fixed-length hash for the body
         params_hash = self.generate_hash(combined_params)
@@ -75,8 +103,8 @@ class CacheMiddleware(BaseHTTPMiddleware):
         cache_key = await self.backend.retrieve(key)
         if cache_key:
             # If the response is cached, return it directly
-            json_data_str = cache_key[0]
-            headers = {"Cache-Control": f"max-age:{cache_key[1]}"}
+            json_data_str, headers = cache_key[0]
+            headers = {**headers, "Cache-Control": f"max-age:{cache_key[1]}"}
             return StreamingResponse(
                 iter([json_data_str]),
                 media_type="application/json",
@@ -94,6 +122,12 @@ class CacheMiddleware(BaseHTTPMiddleware):
             # Skip caching for no-store
             return response
 
+        if not response.headers.get("content-type", "").startswith(
+            "application/json"
+        ):
+            # Cached hits are always replayed as JSON
+            return response
+
         if 300 > response.status_code >= 200:
             logger.debug("Creating cache of request")
             # Determine max-age
@@ -101,8 +135,13 @@ class CacheMiddleware(BaseHTTPMiddleware):
             if "max-age" in cache_control:
                 max_age = int(cache_control.split("=")[1])
             # Cache the response
+            headers = {
+                name: response.headers[name]
+                for name in REPLAYED_HEADERS
+                if name in response.headers
+            }
             await self.backend.create(
-                response_body[0],
+                (response_body[0], headers),
                 key,
                 max_age,
             )
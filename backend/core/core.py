@@ -1,18 +1,71 @@
 import hashlib
 import json
 from datetime import datetime
-from typing import Annotated, Any, Optional
+from typing import Annotated, Any, AsyncIterator, Literal, Optional
 
+import numpy as np
 import pydantic
 from fastapi import status
 from loguru import logger
-from sqlalchemy.orm import joinedload
-from sqlmodel import delete, func, select
+from sqlalchemy import DateTime, case, cast, or_, text, tuple_
+from sqlalchemy.orm import joinedload, noload
+from sqlmodel import delete, func, insert, select
 
-from backend.core import core_models
+from backend.core import core_models, geometry
 from backend.database.postgres import project_models
+from backend.metrics import prometheus
 
 PROJECT_ID = int
+STREAM_CHUNK_SIZE: int = 10_000
+DELETE_BATCH_SIZE: int = 500
+CHANGES_SIZE: int = 100
+SORT_KEYS = Literal["project_id", "area", "-area"]
+
+
+def _list_filters(
+    active_from: Optional[datetime] = None,
+    active_to: Optional[datetime] = None,
+    active_at: Optional[datetime] = None,
+    min_area: Optional[float] = None,
+) -> list:
+    """
+    Where clauses of project listing, each backed by an index.
+    Date filters use `project_models.active_range` (GiST), missing
+        window bound is unbounded, `tsrange(NULL, x)` is `(,x]`.
+    """
+    filters = []
+    if active_from is not None or active_to is not None:
+        window = func.tsrange(active_from, active_to, "[]")
+        filters.append(project_models.active_range().op("&&")(window))
+    if active_at is not None:
+        filters.append(
+            project_models.active_range().op("@>")(cast(active_at, DateTime))
+        )
+    if min_area is not None:
+        filters.append(project_models.Project.area >= min_area)
+    return filters
+
+
+def _list_order(sort: SORT_KEYS) -> list:
+    """Order of project listing, `-` prefix is descending."""
+    if sort == "project_id":
+        return [project_models.Project.project_id]
+    column = getattr(project_models.Project, sort.lstrip("-"))
+    if sort.startswith("-"):
+        # `ix_project_area_project_id` scanned backwards, rows without
+        #   stored metrics (NULL) come first, as postgres orders them
+        return [column.desc(), project_models.Project.project_id.desc()]
+    return [column, project_models.Project.project_id]
+
+
+async def _lock_changes(session: Any) -> None:
+    """
+    Change floor lock, held until end of transaction.
+    Every write takes it before drawing change numbers, so while it
+        is held none of them is at or below its key, see
+        `fetch_changes`.
+    """
+    await session.execute(text(project_models.LOCK_CHANGE_FLOOR))
 
 
 def dict_hash(d):
@@ -22,6 +75,7 @@ def dict_hash(d):
 
 
 # @pydantic.validate_call
+@prometheus.timed
 async def read_from_db(
     *,
     session: Any,  # AsyncSession
@@ -33,6 +87,7 @@ async def read_from_db(
             description="Project ID cannot be lower than 0",
         ),
     ],
+    include_geometry: bool = True,
 ) -> core_models.ProjectCore | int:
     logger.debug("Reading project data from db")
     # statement = select(project_models.Project).where(
@@ -41,11 +96,7 @@ async def read_from_db(
     statement = (
         select(project_models.Project)
         .where(project_models.Project.project_id == project_id)
-        .options(
-            joinedload(project_models.Project.geojson)
-            .joinedload(project_models.GeoJson.geometry)
-            .joinedload(project_models.Geometry.coordinates)
-        )
+        .options(_geometry_loader(include_geometry))
     )
     res = await session.execute(statement)
     result = res.scalar()
@@ -54,6 +105,196 @@ async def read_from_db(
     return core_models.ProjectCore.model_validate(result)
 
 
+def _geometry_loader(include_geometry: bool):
+    """Eager load of whole geometry tree, or no load at all.
+    Relationships default to selectin, so skipping must be explicit."""
+    if not include_geometry:
+        return noload(project_models.Project.geojson)
+    return (
+        joinedload(project_models.Project.geojson)
+        .joinedload(project_models.GeoJson.geometry)
+        .joinedload(project_models.Geometry.coordinates)
+    )
+
+
+def _header_statement():
+    """Project columns joined with geojson/geometry, without coordinates.
+    Selecting plain columns skips the selectin relationship loaders."""
+    return (
+        select(
+            project_models.Project.project_id,
+            project_models.Project.name,
+            project_models.Project.start_date,
+            project_models.Project.end_date,
+            project_models.Project.description,
+            project_models.GeoJson.type.label("geojson_type"),
+            project_models.Geometry.type.label("geometry_type"),
+            project_models.Geometry.geometry_id,
+        )
+        .join(
+            project_models.GeoJson,
+            project_models.GeoJson.project_id
+            == project_models.Project.project_id,
+        )
+        .join(
+            project_models.Geometry,
+            project_models.Geometry.geojson_id
+            == project_models.GeoJson.geojson_id,
+        )
+    )
+
+
+async def _fetch_points(
+    *,
+    session: Any,  # AsyncSession
+    geometry_ids: list[int],
+) -> dict[int, np.ndarray]:
+    """Reads coordinates of many geometries with one query,
+    returns (N, 2) arrays of (lat, lon) keyed by geometry_id."""
+    statement = (
+        select(
+            project_models.Coordinate.geometry_id,
+            project_models.Coordinate.latitude,
+            project_models.Coordinate.longitude,
+        )
+        .where(project_models.Coordinate.geometry_id.in_(geometry_ids))
+        .order_by(
+            project_models.Coordinate.geometry_id,
+            project_models.Coordinate.coord_id,
+        )
+    )
+    res = await session.execute(statement)
+    rows = np.array(res.all(), dtype=np.float64).reshape(-1, 3)
+    return geometry.split_by_key(rows[:, 0].astype(np.int64), rows[:, 1:])
+
+
+# @pydantic.validate_call
+async def read_header_from_db(
+    *,
+    session: Any,  # AsyncSession
+    project_id: Annotated[
+        int,
+        pydantic.Field(
+            ge=0,
+            le=999999,
+            description="Project ID cannot be lower than 0",
+        ),
+    ],
+) -> core_models.ProjectHeader | int:
+    logger.debug("Reading project header from db")
+    statement = _header_statement().where(
+        project_models.Project.project_id == project_id
+    )
+    res = await session.execute(statement)
+    result = res.first()
+    if not result:
+        return status.HTTP_404_NOT_FOUND
+    return core_models.ProjectHeader.model_validate(result)
+
+
+# @pydantic.validate_call
+async def read_arrays_from_db(
+    *,
+    session: Any,  # AsyncSession
+    project_id: Annotated[
+        int,
+        pydantic.Field(
+            ge=0,
+            le=999999,
+            description="Project ID cannot be lower than 0",
+        ),
+    ],
+) -> core_models.ProjectArrays | int:
+    """Project with coordinates as numpy buffer, bypassing ORM models."""
+    header = await read_header_from_db(session=session, project_id=project_id)
+    if header == status.HTTP_404_NOT_FOUND:
+        return status.HTTP_404_NOT_FOUND
+    points = await _fetch_points(
+        session=session,
+        geometry_ids=[header.geometry_id],
+    )
+    return core_models.ProjectArrays(
+        header=header,
+        points=points.get(header.geometry_id, geometry.EMPTY_POINTS),
+    )
+
+
+async def stream_coordinates(
+    *,
+    session: Any,  # AsyncSession
+    geometry_id: int,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[list[tuple[float, float]]]:
+    """Yields (latitude, longitude) rows in chunks of `chunk_size`
+    from a server-side cursor, so only one chunk is held in memory."""
+    statement = (
+        select(
+            project_models.Coordinate.latitude,
+            project_models.Coordinate.longitude,
+        )
+        .where(project_models.Coordinate.geometry_id == geometry_id)
+        .order_by(project_models.Coordinate.coord_id)
+        .offset(offset)
+        .limit(limit)
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await session.stream(statement)
+    async for partition in result.partitions():
+        yield [(row.latitude, row.longitude) for row in partition]
+
+
+async def stream_projects(
+    *,
+    session: Any,  # AsyncSession
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[core_models.ProjectArrays]:
+    """
+    Yields every project with its coordinates, in project_id order.
+    Whole dataset is read through one server-side cursor of
+        project and coordinate rows joined, `chunk_size` rows at a time,
+        so memory is bounded by a chunk plus one geometry.
+    """
+    statement = (
+        _header_statement()
+        .add_columns(
+            project_models.Coordinate.latitude,
+            project_models.Coordinate.longitude,
+        )
+        .outerjoin(
+            project_models.Coordinate,
+            project_models.Coordinate.geometry_id
+            == project_models.Geometry.geometry_id,
+        )
+        .order_by(
+            project_models.Project.project_id,
+            project_models.Coordinate.coord_id,
+        )
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await session.stream(statement)
+    header, points = None, []
+    async for partition in result.partitions():
+        for row in partition:
+            # Rows of one project are adjacent and may span partitions
+            if header is None or row.project_id != header.project_id:
+                if header is not None:
+                    yield core_models.ProjectArrays(
+                        header=header,
+                        points=np.array(points, np.float64).reshape(-1, 2),
+                    )
+                header = core_models.ProjectHeader.model_validate(row)
+                points = []
+            if row.latitude is not None:
+                points.append((row.latitude, row.longitude))
+    if header is not None:
+        yield core_models.ProjectArrays(
+            header=header,
+            points=np.array(points, np.float64).reshape(-1, 2),
+        )
+
+
 # @pydantic.validate_call
 async def delete_from_db(
     *,
@@ -67,15 +308,25 @@ async def delete_from_db(
         ),
     ],
     commit: Optional[bool] = True,
+    tombstone: bool = True,  # False when edit re-adds same id
 ) -> int:
-    statement = delete(project_models.Project).where(
-        project_models.Project.project_id == project_id  # noqa
+    # Children go by `ON DELETE CASCADE`, RETURNING tells if row existed
+    statement = (
+        delete(project_models.Project)
+        .where(project_models.Project.project_id == project_id)  # noqa
+        .returning(project_models.Project.project_id)
     )
-    result = await read_from_db(session=session, project_id=project_id)
-    if result == status.HTTP_404_NOT_FOUND:
-        return status.HTTP_404_NOT_FOUND
     try:
-        await session.execute(statement)
+        await _lock_changes(session)
+        result = await session.execute(statement)
+        if result.scalar_one_or_none() is None:
+            return status.HTTP_404_NOT_FOUND
+        if tombstone:
+            await session.execute(
+                insert(project_models.ProjectTombstone).values(
+                    project_id=project_id
+                )
+            )
         if commit:
             await session.commit()
     except Exception as exc_info:  # noqa: F841
@@ -86,6 +337,85 @@ async def delete_from_db(
     return status.HTTP_200_OK
 
 
+# @pydantic.validate_call
+async def delete_projects(
+    *,
+    session: Any,  # AsyncSession
+    project_ids: Optional[list[int]] = None,
+    active_from: Optional[datetime] = None,
+    active_to: Optional[datetime] = None,
+    name_prefix: Optional[str] = None,
+    batch_size: int = DELETE_BATCH_SIZE,
+) -> core_models.DeleteResult:
+    """
+    Set based delete of all projects matching every given filter.
+    Runs `DELETE ... WHERE project_id IN (SELECT ... LIMIT n
+        FOR UPDATE SKIP LOCKED) RETURNING project_id` per batch,
+        each batch committed on its own so locks are held briefly.
+    Children go by `ON DELETE CASCADE`, nothing is loaded,
+        tombstones are written by the same statement.
+    Rows locked by concurrent writers are skipped, not waited for,
+        matching rows left after last batch are reported as skipped.
+    Filters are same as listing, name prefix is case insensitive.
+    :return: Deleted and skipped project ids, both ascending.
+    """
+    project = project_models.Project
+    filters = _list_filters(active_from=active_from, active_to=active_to)
+    if project_ids is not None:
+        filters.append(project.project_id.in_(project_ids))
+    if name_prefix is not None:
+        filters.append(
+            project_models.name_lower().startswith(
+                name_prefix.lower(), autoescape=True
+            )
+        )
+    deleted: list[int] = []
+    while True:
+        batch = (
+            select(project.project_id)
+            .where(*filters)
+            .order_by(project.project_id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        removed = (
+            delete(project)
+            .where(project.project_id.in_(batch.scalar_subquery()))
+            .returning(project.project_id)
+            .cte("deleted")
+        )
+        # One statement deletes and records tombstones
+        statement = (
+            insert(project_models.ProjectTombstone)
+            .from_select(["project_id"], select(removed.c.project_id))
+            .add_cte(removed)
+            .returning(project_models.ProjectTombstone.project_id)
+        )
+        await _lock_changes(session)
+        result = await session.execute(statement)
+        batch_ids = result.scalars().all()
+        await session.commit()
+        deleted.extend(batch_ids)
+        logger.opt(lazy=True).debug(
+            "{x}",
+            x=lambda: f"Deleted batch of {len(batch_ids)} projects",
+        )
+        if len(batch_ids) < batch_size:
+            break
+    # Plain read doesn't wait on row locks, sees rows still there
+    result = await session.execute(
+        select(project.project_id).where(*filters).order_by(project.project_id)
+    )
+    skipped = list(result.scalars().all())
+    if skipped:
+        logger.opt(lazy=True).warning(
+            "{x}",
+            x=lambda: f"Bulk delete skipped {len(skipped)} locked projects",
+        )
+    return core_models.DeleteResult(sorted(deleted), skipped)
+
+
+@prometheus.timed
 @pydantic.validate_call
 async def add_to_db(
     *,
@@ -106,18 +436,30 @@ async def add_to_db(
     commit: Optional[bool] = True,
 ) -> PROJECT_ID:
     logger.debug("Adding geojson to db")
-    logger.debug(
-        f"New project: {name=}, {start_date=},{end_date=} {description=}"
+    logger.opt(lazy=True).debug(
+        "{x}",
+        x=lambda: f"New project: {name=}, {start_date=},{end_date=} "
+        f"{description=}",
+    )
+    points = geometry.coordinates_to_array(
+        flattened_geojson.geometry.coordinates
     )
+    min_lat, min_lon, max_lat, max_lon = geometry.bounds(points)
     project = project_models.Project(
         name=name,
         start_date=start_date,
         end_date=end_date,
         description=description,
+        min_latitude=min_lat,
+        min_longitude=min_lon,
+        max_latitude=max_lat,
+        max_longitude=max_lon,
+        **geometry.metrics(points).model_dump(),
     )
     if __project_id:
         # use only with edit, which first removes given id
         project.project_id = __project_id
+    await _lock_changes(session)
     session.add(project)
     await session.flush()
     geo_json = project_models.GeoJson(
@@ -126,16 +468,16 @@ async def add_to_db(
     )
     session.add(geo_json)
     await session.flush()
-    geometry = project_models.Geometry(
+    geometry_row = project_models.Geometry(
         geojson_id=geo_json.geojson_id,
         type=flattened_geojson.geometry.type,
     )
-    session.add(geometry)
+    session.add(geometry_row)
     await session.flush()
 
     coordinates = [
         project_models.Coordinate(
-            geometry_id=geometry.geometry_id,
+            geometry_id=geometry_row.geometry_id,
             latitude=coordinate.latitude,
             longitude=coordinate.longitude,
         )
@@ -145,10 +487,14 @@ async def add_to_db(
     if commit:
         await session.commit()
         await session.refresh(project)
-        logger.debug(f"Added successfully. Project ID: {project.project_id}")
+        logger.opt(lazy=True).debug(
+            "Added successfully. Project ID: {project_id}",
+            project_id=lambda: project.project_id,
+        )
     return project.project_id
 
 
+@prometheus.timed
 @pydantic.validate_call
 async def edit_in_db(
     *,
@@ -168,6 +514,13 @@ async def edit_in_db(
     flattened_geojson: core_models.GeoJson,
 ) -> int | bool:
     logger.debug("Reading project data from db")
+    await session.execute(
+        select(
+            func.pg_advisory_xact_lock(
+                project_models.PROJECT_EDIT_LOCK, project_id
+            )
+        )
+    )
     statement = select(project_models.Project).where(
         project_models.Project.project_id == project_id
     )
@@ -198,7 +551,12 @@ async def edit_in_db(
     if dict_hash(inputs_dict) == dict_hash(results_dict):
         # Dicts are the same, no changes
         return status.HTTP_204_NO_CONTENT
-    await delete_from_db(session=session, project_id=project_id, commit=False)
+    await delete_from_db(
+        session=session,
+        project_id=project_id,
+        commit=False,
+        tombstone=False,
+    )
     await add_to_db(
         session=session,
         __project_id=project_id,
@@ -214,22 +572,26 @@ async def edit_in_db(
 
 
 # @pydantic.validate_call
+@prometheus.timed
 async def fetch_all_projects(
     *,
     session: Any,  # AsyncSession
     page: Annotated[int, pydantic.Field(ge=0, default=0)] = 0,
     size: Annotated[int, pydantic.Field(ge=1, le=100, default=10)] = 10,
+    active_from: Optional[datetime] = None,
+    active_to: Optional[datetime] = None,
+    active_at: Optional[datetime] = None,
+    min_area: Optional[float] = None,
+    sort: SORT_KEYS = "project_id",
+    include_geometry: bool = True,
 ):
     statement = (
         select(project_models.Project)
-        .order_by(project_models.Project.project_id)
+        .where(*_list_filters(active_from, active_to, active_at, min_area))
+        .order_by(*_list_order(sort))
         .offset(page * size)
         .limit(size)
-        .options(
-            joinedload(project_models.Project.geojson)
-            .joinedload(project_models.GeoJson.geometry)
-            .joinedload(project_models.Geometry.coordinates)
-        )
+        .options(_geometry_loader(include_geometry))
     )
 
     res = await session.execute(statement)
@@ -243,7 +605,286 @@ async def fetch_all_projects(
 
 
 # @pydantic.validate_call
-async def get_projects_count(session: Any) -> int:
-    statement = select(func.count(project_models.Project.project_id))
+async def fetch_all_arrays(
+    *,
+    session: Any,  # AsyncSession
+    page: Annotated[int, pydantic.Field(ge=0, default=0)] = 0,
+    size: Annotated[int, pydantic.Field(ge=1, le=100, default=10)] = 10,
+    active_from: Optional[datetime] = None,
+    active_to: Optional[datetime] = None,
+    active_at: Optional[datetime] = None,
+    min_area: Optional[float] = None,
+    sort: SORT_KEYS = "project_id",
+) -> list[core_models.ProjectArrays] | int:
+    """Page of projects with coordinates as numpy buffers.
+    Two queries per page regardless of size, no ORM objects built."""
+    statement = (
+        _header_statement()
+        .where(*_list_filters(active_from, active_to, active_at, min_area))
+        .order_by(*_list_order(sort))
+        .offset(page * size)
+        .limit(size)
+    )
+    res = await session.execute(statement)
+    headers = [
+        core_models.ProjectHeader.model_validate(row) for row in res.all()
+    ]
+    if not headers:
+        return status.HTTP_404_NOT_FOUND
+    points = await _fetch_points(
+        session=session,
+        geometry_ids=[header.geometry_id for header in headers],
+    )
+    return [
+        core_models.ProjectArrays(
+            header=header,
+            points=points.get(header.geometry_id, geometry.EMPTY_POINTS),
+        )
+        for header in headers
+    ]
+
+
+# @pydantic.validate_call
+async def search_projects(
+    *,
+    session: Any,  # AsyncSession
+    bbox: Optional[tuple[float, float, float, float]] = None,
+    name: Optional[str] = None,
+    after: Optional[list] = None,
+    size: Annotated[int, pydantic.Field(ge=1, le=100, default=10)] = 10,
+) -> list[core_models.SearchHit]:
+    """
+    Projects matching all given criteria, keyset paginated after `after`.
+    - `bbox`: stored bounding box intersects it, ordered by project_id.
+    - `name`: prefix matches first, then trigram similar names
+        by descending similarity, ties by project_id.
+    Both predicates are served from indexes, see `project_models`.
+    :param bbox: (min_lon, min_lat, max_lon, max_lat), GeoJSON order.
+    :param after: `key` (order_by values) of last hit of previous page.
+    """
+    project = project_models.Project
+    order_by = [project.project_id]
+    statement = select(project)
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        query_box = func.box(
+            func.point(min_lon, min_lat),
+            func.point(max_lon, max_lat),
+        )
+        statement = statement.where(
+            project_models.bbox_box().op("&&")(query_box)
+        )
+    if name is not None:
+        query = name.lower()
+        prefix = project_models.name_lower().startswith(query, autoescape=True)
+        rank = case((prefix, 0), else_=1)
+        # Negated so whole key sorts ascending, keyset is one row compare
+        dissimilarity = -func.similarity(project_models.name_lower(), query)
+        statement = statement.add_columns(rank, dissimilarity).where(
+            or_(prefix, project_models.name_lower().op("%")(query))
+        )
+        order_by = [rank, dissimilarity, project.project_id]
+    if after is not None:
+        statement = statement.where(tuple_(*order_by) > tuple_(*after))
+    statement = (
+        statement.order_by(*order_by)
+        .limit(size)
+        .options(
+            joinedload(project.geojson)
+            .joinedload(project_models.GeoJson.geometry)
+            .joinedload(project_models.Geometry.coordinates)
+        )
+    )
+    res = await session.execute(statement)
+    hits = []
+    for row in res.unique().all():
+        result, *scores = row
+        hits.append(
+            core_models.SearchHit(
+                project=core_models.ProjectCore.model_validate(result),
+                key=[*scores, result.project_id],
+            )
+        )
+    return hits
+
+
+# @pydantic.validate_call
+async def find_containing(
+    *,
+    session: Any,  # AsyncSession
+    latitude: Annotated[float, pydantic.Field(ge=-90, le=90)],
+    longitude: Annotated[float, pydantic.Field(ge=-180, le=180)],
+) -> list[core_models.ProjectHeader]:
+    """
+    Projects whose geometry contains the point.
+    Candidates come from GiST bounding box index (logarithmic lookup),
+        then exact ray casting runs over their coordinates only.
+    """
+    statement = (
+        _header_statement()
+        .where(
+            project_models.bbox_box().op("@>")(
+                project_models.point_box(longitude, latitude)
+            )
+        )
+        .order_by(project_models.Project.project_id)
+    )
+    res = await session.execute(statement)
+    candidates = [
+        core_models.ProjectHeader.model_validate(row) for row in res.all()
+    ]
+    if not candidates:
+        return []
+    rings = await _fetch_points(
+        session=session,
+        geometry_ids=[candidate.geometry_id for candidate in candidates],
+    )
+    inside = set(geometry.rings_containing(rings, latitude, longitude))
+    return [
+        candidate
+        for candidate in candidates
+        if candidate.geometry_id in inside
+    ]
+
+
+# @pydantic.validate_call
+async def get_projects_count(
+    session: Any,
+    active_from: Optional[datetime] = None,
+    active_to: Optional[datetime] = None,
+    active_at: Optional[datetime] = None,
+    min_area: Optional[float] = None,
+) -> int:
+    """
+    Exact number of projects matching list filters.
+    Unfiltered total is sum of trigger kept `project_counter` slots,
+        constant cost whatever the table size.
+    """
+    filters = _list_filters(active_from, active_to, active_at, min_area)
+    if not filters:
+        result = await session.execute(
+            select(func.sum(project_models.ProjectCounter.total))
+        )
+        total = result.scalar()
+        if total is not None:  # Counter not seeded, e.g. before migration
+            return int(total)
+    statement = select(func.count(project_models.Project.project_id)).where(
+        *filters
+    )
     result = await session.execute(statement)
     return result.scalar()
+
+
+async def estimate_projects_count(
+    session: Any,
+    active_from: Optional[datetime] = None,
+    active_to: Optional[datetime] = None,
+    active_at: Optional[datetime] = None,
+    min_area: Optional[float] = None,
+) -> Optional[int]:
+    """
+    Planner estimate of number of projects matching list filters,
+        from `pg_class.reltuples` or row estimate of EXPLAIN.
+    Nothing is scanned, accuracy is that of last ANALYZE.
+    :return: Estimate, None when table was never analyzed.
+    """
+    filters = _list_filters(active_from, active_to, active_at, min_area)
+    result = await session.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = 'project'::regclass")
+    )
+    reltuples = result.scalar()
+    if reltuples is None or reltuples < 0:
+        return None
+    if not filters:
+        return int(reltuples)
+    statement = select(project_models.Project.project_id).where(*filters)
+    connection = await session.connection()
+    compiled = statement.compile(dialect=connection.dialect)
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", parameters
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+_SEQUENCE_VALUE = text(
+    "SELECT CASE WHEN is_called THEN last_value ELSE 0 END "
+    "FROM project_change_seq"
+)
+# Bigint advisory key is split into classid (high) and objid (low)
+_LOWEST_FLOOR = text(
+    "SELECT min((classid::bigint << 32 | objid::bigint) - "
+    f"{project_models.CHANGE_FLOOR_BASE}) FROM pg_locks "
+    "WHERE locktype = 'advisory' AND objsubid = 1 "
+    f"AND classid >= {project_models.CHANGE_FLOOR_BASE >> 32} "
+    "AND database = "
+    "(SELECT oid FROM pg_database WHERE datname = current_database())"
+)
+
+
+# @pydantic.validate_call
+async def fetch_changes(
+    *,
+    session: Any,  # AsyncSession
+    since: int = 0,
+    size: int = CHANGES_SIZE,
+    include_geometry: bool = True,
+) -> core_models.ChangePage:
+    """
+    Projects created, updated or deleted after change number `since`.
+    Live projects and tombstones are both read by change number index.
+    Watermark is sequence value capped by lowest change floor of
+        writers still in flight, no change at or below it is
+        uncommitted, so client resuming from `next_seq` misses nothing.
+        Sequence is read first: writer locking after floors are read
+        draws numbers above sequence value read before.
+    """
+    watermark = (await session.execute(_SEQUENCE_VALUE)).scalar_one()
+    floor = (await session.execute(_LOWEST_FLOOR)).scalar_one()
+    if floor is not None:
+        watermark = min(watermark, floor)
+    project = project_models.Project
+    tombstone = project_models.ProjectTombstone
+    live = await session.execute(
+        select(project)
+        .where(project.change_seq > since, project.change_seq <= watermark)
+        .order_by(project.change_seq)
+        .limit(size + 1)
+        .options(_geometry_loader(include_geometry))
+    )
+    deleted = await session.execute(
+        select(tombstone)
+        .where(tombstone.change_seq > since, tombstone.change_seq <= watermark)
+        .order_by(tombstone.change_seq)
+        .limit(size + 1)
+    )
+    changes = sorted(
+        [
+            core_models.Change(
+                change_seq=row.change_seq,
+                project_id=row.project_id,
+                updated_at=row.updated_at,
+                project=core_models.ProjectCore.model_validate(row),
+            )
+            for row in live.unique().scalars().all()
+        ]
+        + [
+            core_models.Change(
+                change_seq=row.change_seq,
+                project_id=row.project_id,
+                updated_at=row.deleted_at,
+                project=None,
+            )
+            for row in deleted.scalars().all()
+        ]
+    )
+    has_more = len(changes) > size
+    changes = changes[:size]
+    return core_models.ChangePage(
+        changes=changes,
+        next_seq=changes[-1].change_seq if has_more else max(since, watermark),
+        has_more=has_more,
+    )
@@ -1,5 +1,7 @@
+import typing
 from datetime import datetime
 
+import numpy as np
 import pydantic
 
 
@@ -24,12 +26,78 @@ class GeoJson(pydantic.BaseModel):
     model_config = {"from_attributes": True}
 
 
-class ProjectCore(pydantic.BaseModel):
+class GeometryMetrics(pydantic.BaseModel):
+    """Stored ring measures, area in m², perimeter in m."""
+
+    area: typing.Optional[float] = None
+    perimeter: typing.Optional[float] = None
+    centroid_latitude: typing.Optional[float] = None
+    centroid_longitude: typing.Optional[float] = None
+    vertex_count: typing.Optional[int] = None
+
+    model_config = {"from_attributes": True}
+
+
+class ProjectCore(GeometryMetrics):
     project_id: int
     name: str
     start_date: datetime
     end_date: datetime
-    description: str
-    geojson: GeoJson
+    description: typing.Optional[str]
+    geojson: typing.Optional[GeoJson] = None  # None when not loaded
 
     model_config = {"from_attributes": True}
+
+
+class ProjectHeader(pydantic.BaseModel):
+    """Project row joined with its geojson/geometry types, no coordinates."""
+
+    project_id: int
+    name: str
+    start_date: datetime
+    end_date: datetime
+    description: str | None
+    geojson_type: str
+    geometry_type: str
+    geometry_id: int
+
+    model_config = {"from_attributes": True}
+
+
+class ProjectArrays(typing.NamedTuple):
+    """Project header with its coordinates as (N, 2) (lat, lon) array."""
+
+    header: ProjectHeader
+    points: np.ndarray
+
+
+class SearchHit(typing.NamedTuple):
+    """Search result with its sort key, last key is next page cursor."""
+
+    project: ProjectCore
+    key: list
+
+
+class Change(typing.NamedTuple):
+    """Change feed entry, `project` is None for deleted project."""
+
+    change_seq: int
+    project_id: int
+    updated_at: datetime
+    project: typing.Optional[ProjectCore]
+
+
+class ChangePage(typing.NamedTuple):
+    """Changes after token, `next_seq` is token of following page."""
+
+    changes: list[Change]
+    next_seq: int
+    has_more: bool
+
+
+class DeleteResult(typing.NamedTuple):
+    """Bulk delete outcome, `skipped` still match but were locked by
+    concurrent writes, so weren't deleted."""
+
+    deleted: list[int]
+    skipped: list[int]
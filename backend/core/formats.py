@@ -0,0 +1,225 @@
+import importlib.util
+import struct
+import typing
+
+import numpy as np
+
+from backend.core import core_models
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+# Optional and heavy to import, loaded on first Arrow response only
+ARROW_AVAILABLE: bool = importlib.util.find_spec("pyarrow") is not None
+
+JSON: str = "application/json"
+MSGPACK: str = "application/msgpack"
+WKB: str = "application/wkb"
+# Stream format only, file format readers reject it, so `.file` is 406
+ARROW: str = "application/vnd.apache.arrow.stream"
+NDJSON: str = "application/x-ndjson"
+GEOJSON: str = "application/geo+json"
+
+# Aliases clients send in the wild, mapped onto canonical media type
+_ALIASES: dict[str, str] = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+_WKB_LITTLE_ENDIAN: int = 1
+_WKB_POLYGON: int = 3
+_WKB_MULTIPOLYGON: int = 6
+
+
+def available() -> list[str]:
+    """Media types this process can produce, JSON always first."""
+    media_types = [JSON, WKB]
+    if msgpack is not None:
+        media_types.append(MSGPACK)
+    if ARROW_AVAILABLE:
+        media_types.append(ARROW)
+    return media_types
+
+
+def negotiate(
+    accept: typing.Optional[str],
+    supported: typing.Iterable[str],
+) -> typing.Optional[str]:
+    """
+    Picks media type from Accept header, honouring q-values.
+    Missing header or any wildcard falls back to JSON.
+    :return: Chosen media type or None when nothing acceptable.
+    """
+    if not accept:
+        return JSON
+    supported = list(supported)
+    best, best_q = None, 0.0
+    for part in accept.split(","):
+        media_type, *params = (p.strip() for p in part.split(";"))
+        media_type = _ALIASES.get(media_type.lower(), media_type.lower())
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in ("*/*", "application/*"):
+            media_type = JSON
+        if media_type in supported and q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def encode_wkb(geometry_type: str, points: np.ndarray) -> bytes:
+    """
+    Encodes stored ring as little endian WKB, closed as OGC requires.
+    Points are stored as (lat, lon), WKB is (x, y) so (lon, lat).
+    `MultiPolygon` (default GeoJSON type here) wraps one polygon.
+    """
+    xy = np.ascontiguousarray(points[:, ::-1], dtype="<f8")
+    if len(xy) and not np.array_equal(xy[0], xy[-1]):
+        xy = np.vstack([xy, xy[:1]])
+    polygon = struct.pack(
+        "<BIII", _WKB_LITTLE_ENDIAN, _WKB_POLYGON, 1, len(xy)
+    )
+    polygon += xy.tobytes()
+    if geometry_type == "Polygon":
+        return polygon
+    return (
+        struct.pack("<BII", _WKB_LITTLE_ENDIAN, _WKB_MULTIPOLYGON, 1) + polygon
+    )
+
+
+def _to_dict(
+    project: core_models.ProjectArrays,
+    coordinates: typing.Optional[list] = None,
+) -> dict:
+    header = project.header
+    return {
+        "project_id": header.project_id,
+        "name": header.name,
+        "description": header.description,
+        "date_range": [
+            header.start_date.isoformat(),
+            header.end_date.isoformat(),
+        ],
+        "geojson": {
+            "type": header.geojson_type,
+            "geometry": {
+                "type": header.geometry_type,
+                # [[lat, lon], ...], same order as JSON objects
+                "coordinates": project.points.tolist()
+                if coordinates is None
+                else coordinates,
+            },
+        },
+    }
+
+
+def to_record(project: core_models.ProjectArrays) -> dict:
+    """Project shaped exactly as JSON response, one NDJSON line."""
+    return _to_dict(
+        project,
+        coordinates=[
+            {"latitude": lat, "longitude": lon}
+            for lat, lon in project.points.tolist()
+        ],
+    )
+
+
+def to_feature(project: core_models.ProjectArrays) -> dict:
+    """
+    RFC 7946 Feature, positions are [lon, lat] and ring is closed.
+    `MultiPolygon` (default type here) wraps one polygon.
+    """
+    header = project.header
+    ring = project.points[:, ::-1]
+    if len(ring) and not np.array_equal(ring[0], ring[-1]):
+        ring = np.vstack([ring, ring[:1]])
+    coordinates = [ring.tolist()]
+    if header.geometry_type != "Polygon":
+        coordinates = [coordinates]
+    return {
+        "type": "Feature",
+        "id": header.project_id,
+        "geometry": {"type": header.geometry_type, "coordinates": coordinates},
+        "properties": {
+            "name": header.name,
+            "description": header.description,
+            "start_date": header.start_date.isoformat(),
+            "end_date": header.end_date.isoformat(),
+        },
+    }
+
+
+def encode_msgpack(
+    projects: core_models.ProjectArrays | list[core_models.ProjectArrays],
+) -> bytes:
+    """MessagePack document shaped as JSON response,
+    coordinates packed as [lat, lon] pairs instead of objects."""
+    if isinstance(projects, list):
+        return msgpack.packb([_to_dict(project) for project in projects])
+    return msgpack.packb(_to_dict(projects))
+
+
+def encode_arrow(
+    projects: core_models.ProjectArrays | list[core_models.ProjectArrays],
+) -> bytes:
+    """Arrow IPC stream, one row per project, geometry as WKB column
+    tagged with `geoarrow.wkb` extension name."""
+    import pyarrow as pa
+
+    if not isinstance(projects, list):
+        projects = [projects]
+    headers = [project.header for project in projects]
+    schema = pa.schema(
+        [
+            pa.field("project_id", pa.int64()),
+            pa.field("name", pa.string()),
+            pa.field("description", pa.string()),
+            pa.field("start_date", pa.timestamp("us")),
+            pa.field("end_date", pa.timestamp("us")),
+            pa.field("geojson_type", pa.string()),
+            pa.field(
+                "geometry",
+                pa.binary(),
+                metadata={"ARROW:extension:name": "geoarrow.wkb"},
+            ),
+        ]
+    )
+    table = pa.table(
+        [
+            [header.project_id for header in headers],
+            [header.name for header in headers],
+            [header.description for header in headers],
+            [header.start_date for header in headers],
+            [header.end_date for header in headers],
+            [header.geojson_type for header in headers],
+            [
+                encode_wkb(project.header.geometry_type, project.points)
+                for project in projects
+            ],
+        ],
+        schema=schema,
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode(
+    media_type: str,
+    projects: core_models.ProjectArrays | list[core_models.ProjectArrays],
+) -> bytes:
+    """Dispatches to encoder of negotiated binary media type."""
+    if media_type == MSGPACK:
+        return encode_msgpack(projects)
+    if media_type == ARROW:
+        return encode_arrow(projects)
+    if media_type == WKB:
+        return encode_wkb(projects.header.geometry_type, projects.points)
+    raise ValueError(f"No binary encoder for {media_type}")
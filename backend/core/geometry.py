@@ -0,0 +1,199 @@
+import typing
+
+import numpy as np
+
+from backend.core import core_models
+
+POLYLINE_PRECISION: int = 5  # Google polyline default, ~1.1 m
+POLYLINE: str = "polyline"
+ENCODINGS = typing.Literal["polyline"]
+EMPTY_POINTS: np.ndarray = np.empty((0, 2), dtype=np.float64)
+EARTH_RADIUS: float = 6_371_008.8  # Mean radius (IUGG), metres
+
+
+def coordinates_to_array(
+    coordinates: typing.Iterable[core_models.Coordinate],
+) -> np.ndarray:
+    """Packs coordinate models into (N, 2) float array of (lat, lon)."""
+    return np.array(
+        [(c.latitude, c.longitude) for c in coordinates],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+
+def bounds(
+    points: np.ndarray,
+) -> tuple[typing.Optional[float], ...]:
+    """(min_lat, min_lon, max_lat, max_lon) of points, Nones if empty."""
+    if not len(points):
+        return None, None, None, None
+    min_lat, min_lon = points.min(axis=0).tolist()
+    max_lat, max_lon = points.max(axis=0).tolist()
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def metrics(points: np.ndarray) -> core_models.GeometryMetrics:
+    """
+    Area, perimeter, centroid and vertex count of ring, all vectorised.
+    Area and centroid come from shoelace formulas on sinusoidal
+        (equal-area) projection centred on first vertex, so areas stay
+        accurate for project sized polygons, antimeridian included.
+    Perimeter is sum of haversine edge lengths.
+    Rings may be open or closed, closing edge is implied.
+    """
+    if not len(points):
+        return core_models.GeometryMetrics(vertex_count=0)
+    if len(points) > 1 and np.array_equal(points[0], points[-1]):
+        points = points[:-1]
+    lat = np.radians(points[:, 0])
+    lon = np.radians(points[:, 1])
+    # Longitudes relative to first vertex, wrapped into [-pi, pi)
+    d_lon = (lon - lon[0] + np.pi) % (2 * np.pi) - np.pi
+    x = EARTH_RADIUS * d_lon * np.cos(lat)
+    y = EARTH_RADIUS * lat
+    next_x, next_y = np.roll(x, -1), np.roll(y, -1)
+    cross = x * next_y - next_x * y
+    signed_area = cross.sum() / 2
+    next_lat, next_lon = np.roll(lat, -1), np.roll(d_lon, -1)
+    haversine = (
+        np.sin((next_lat - lat) / 2) ** 2
+        + np.cos(lat) * np.cos(next_lat) * np.sin((next_lon - d_lon) / 2) ** 2
+    )
+    edges = 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(haversine, 0, 1)))
+    if signed_area:
+        centroid_x = ((x + next_x) * cross).sum() / (6 * signed_area)
+        centroid_y = ((y + next_y) * cross).sum() / (6 * signed_area)
+    else:  # Degenerate ring (point, line), vertex mean
+        centroid_x, centroid_y = x.mean(), y.mean()
+    centroid_lat = centroid_y / EARTH_RADIUS
+    centroid_lon = lon[0] + centroid_x / (EARTH_RADIUS * np.cos(centroid_lat))
+    return core_models.GeometryMetrics(
+        area=float(abs(signed_area)),
+        perimeter=float(edges.sum()) if len(points) > 1 else 0.0,
+        centroid_latitude=float(np.degrees(centroid_lat)),
+        centroid_longitude=float((np.degrees(centroid_lon) + 180) % 360 - 180),
+        vertex_count=len(points),
+    )
+
+
+def split_by_key(
+    keys: np.ndarray,
+    points: np.ndarray,
+) -> dict[int, np.ndarray]:
+    """Splits points sorted by key into per-key views, without copying."""
+    if not len(keys):
+        return {}
+    boundaries = np.flatnonzero(np.diff(keys)) + 1
+    starts = np.concatenate(([0], boundaries))
+    return dict(
+        zip(keys[starts].tolist(), np.split(points, boundaries), strict=True)
+    )
+
+
+def rings_containing(
+    rings: dict[int, np.ndarray],
+    latitude: float,
+    longitude: float,
+) -> list[int]:
+    """
+    Exact point in polygon test by ray casting, for many rings at once.
+    All edges of all rings are tested in one vectorised pass,
+        a ray cast towards +longitude crossing odd number of edges is inside.
+    Rings may be open or closed, closing edge is implied.
+    :return: Keys of rings containing the point.
+    """
+    rings = {key: ring for key, ring in rings.items() if len(ring)}
+    if not rings:
+        return []
+    keys = np.fromiter(rings.keys(), dtype=np.int64, count=len(rings))
+    lengths = np.fromiter(
+        (len(ring) for ring in rings.values()),
+        dtype=np.int64,
+        count=len(rings),
+    )
+    points = np.concatenate(list(rings.values()))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    # Edge i goes to i + 1, last vertex of each ring wraps to its first
+    following = np.arange(1, len(points) + 1)
+    following[starts + lengths - 1] = starts
+    lat, lon = points[:, 0], points[:, 1]
+    next_lat, next_lon = lat[following], lon[following]
+    crosses = (lat > latitude) != (next_lat > latitude)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intersect_lon = lon + (latitude - lat) * (next_lon - lon) / (
+            next_lat - lat
+        )
+    hits = crosses & (longitude < intersect_lon)
+    counts = np.add.reduceat(hits.astype(np.int64), starts)
+    return keys[counts % 2 == 1].tolist()
+
+
+def quantise(points: np.ndarray, precision: int) -> np.ndarray:
+    """Rounds all points to `precision` decimals in one vectorised step."""
+    return np.round(points, precision)
+
+
+def polyline_encode(points: np.ndarray, precision: int) -> str:
+    """
+    Encodes (N, 2) points with Google encoded polyline algorithm.
+    Values are scaled to integers, delta encoded against previous point,
+    zigzag encoded, then split into 5-bit chunks offset by 63.
+    Every step runs on whole arrays, there is no per-point python loop.
+    """
+    if not len(points):
+        return ""
+    scaled = np.round(points * 10**precision).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=np.zeros((1, 2), np.int64))
+    deltas = deltas.ravel()
+    zigzag = ((deltas << 1) ^ (deltas >> 63)).astype(np.uint64)
+    max_chunks = max(1, -(-int(zigzag.max()).bit_length() // 5))
+    shifts = np.arange(0, 5 * max_chunks, 5, dtype=np.uint64)
+    remaining = zigzag[:, None] >> shifts
+    lengths = np.maximum(1, np.count_nonzero(remaining, axis=1))
+    positions = np.arange(max_chunks)
+    continuation = (positions < (lengths[:, None] - 1)) * 0x20
+    chars = (remaining & 0x1F) + continuation.astype(np.uint64) + 63
+    mask = positions < lengths[:, None]
+    return chars[mask].astype(np.uint8).tobytes().decode("ascii")
+
+
+def polyline_decode(encoded: str, precision: int) -> list[tuple[float, ...]]:
+    """Reverse of `polyline_encode`, kept for clients and tests."""
+    values: list[int] = []
+    result = shift = 0
+    for char in encoded:
+        byte = ord(char) - 63
+        result |= (byte & 0x1F) << shift
+        shift += 5
+        if byte < 0x20:
+            values.append(~(result >> 1) if result & 1 else result >> 1)
+            result = shift = 0
+    points = np.cumsum(np.array(values, np.int64).reshape(-1, 2), axis=0)
+    return [tuple(point) for point in (points / 10**precision).tolist()]
+
+
+def format_geometry(
+    geometry: core_models.Geometry,
+    precision: typing.Optional[int] = None,
+    encoding: typing.Optional[ENCODINGS] = None,
+) -> core_models.Geometry | dict:
+    """Applies output precision/encoding to geometry coordinates.
+    Untouched geometry is returned as is to keep default path free."""
+    if precision is None and encoding is None:
+        return geometry
+    points = coordinates_to_array(geometry.coordinates)
+    if encoding == POLYLINE:
+        precision = POLYLINE_PRECISION if precision is None else precision
+        return {
+            "type": geometry.type,
+            "encoding": encoding,
+            "precision": precision,
+            "coordinates": polyline_encode(points, precision),
+        }
+    return {
+        "type": geometry.type,
+        "coordinates": [
+            {"latitude": lat, "longitude": lon}
+            for lat, lon in quantise(points, precision).tolist()
+        ],
+    }
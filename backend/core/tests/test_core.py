@@ -0,0 +1,76 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.core import core, core_models
+from backend.database.postgres import project_models
+
+GEOJSON = core_models.GeoJson.model_validate(
+    {
+        "type": "Feature",
+        "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [
+                {"latitude": 1.0, "longitude": 2.0},
+                {"latitude": 1.5, "longitude": 2.5},
+                {"latitude": 1.0, "longitude": 2.5},
+            ],
+        },
+    }
+)
+
+
+class FakeSession:
+    """Assigns primary keys on flush, like database would."""
+
+    def __init__(self):
+        self.rows = []
+        self.committed = False
+
+    def add(self, row):
+        self.rows.append(row)
+
+    def add_all(self, rows):
+        self.rows.extend(rows)
+
+    async def flush(self):
+        for number, row in enumerate(self.rows, start=1):
+            key = type(row).__table__.primary_key.columns.keys()[0]
+            if getattr(row, key) is None:
+                setattr(row, key, number)
+
+    async def execute(self, *args, **kwargs):
+        return MagicMock()
+
+    async def commit(self):
+        await self.flush()
+        self.committed = True
+
+    async def refresh(self, row):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_add_to_db_writes_project_tree():
+    session = FakeSession()
+    project_id = await core.add_to_db(
+        session=session,
+        name="Project",
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 2, 1),
+        flattened_geojson=GEOJSON,
+    )
+    assert session.committed
+    project, geojson, geometry_row, *coordinates = session.rows
+    assert project_id == project.project_id
+    assert (project.min_latitude, project.max_longitude) == (1.0, 2.5)
+    assert geojson.project_id == project.project_id
+    assert isinstance(geometry_row, project_models.Geometry)
+    assert geometry_row.geojson_id == geojson.geojson_id
+    assert [(c.latitude, c.longitude) for c in coordinates] == [
+        (1.0, 2.0),
+        (1.5, 2.5),
+        (1.0, 2.5),
+    ]
+    assert {c.geometry_id for c in coordinates} == {geometry_row.geometry_id}
@@ -0,0 +1,75 @@
+import struct
+
+import numpy as np
+import pytest
+
+from backend.api.tests.routers.project.data_for_test import (
+    read_header_from_db_1,
+)
+from backend.core import core_models, formats
+
+POINTS = np.array([(-5.6, -52.8), (-5.7, -52.9), (-5.6, -52.8)])
+PROJECT = core_models.ProjectArrays(
+    header=read_header_from_db_1, points=POINTS
+)
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, formats.JSON),
+        ("*/*", formats.JSON),
+        ("application/msgpack", formats.MSGPACK),
+        ("application/x-msgpack", formats.MSGPACK),
+        ("application/json;q=0.5, application/wkb", formats.WKB),
+        ("application/wkb;q=0.1, */*;q=0.9", formats.JSON),
+        ("text/html", None),
+    ],
+)
+def test_negotiate(accept, expected):
+    supported = [formats.JSON, formats.MSGPACK, formats.WKB]
+    assert formats.negotiate(accept, supported) == expected
+
+
+def test_negotiate_arrow_file_unsupported():
+    supported = [formats.JSON, formats.ARROW]
+    assert formats.negotiate(formats.ARROW, supported) == formats.ARROW
+    accept = "application/vnd.apache.arrow.file"
+    assert formats.negotiate(accept, supported) is None
+
+
+def test_encode_wkb_multipolygon():
+    wkb = formats.encode_wkb("MultiPolygon", POINTS)
+    assert struct.unpack_from("<BIIBIII", wkb) == (1, 6, 1, 1, 3, 1, 3)
+    xy = np.frombuffer(wkb, dtype="<f8", offset=22).reshape(-1, 2)
+    # WKB is (x, y) which is (lon, lat)
+    np.testing.assert_array_equal(xy, POINTS[:, ::-1])
+
+
+def test_encode_wkb_closes_open_ring():
+    # API accepts unclosed rings, WKB must repeat first point
+    open_ring = np.array([(0.0, 0.0), (0.0, 1.0), (1.0, 1.0), (1.0, 0.0)])
+    wkb = formats.encode_wkb("Polygon", open_ring)
+    assert struct.unpack_from("<BIII", wkb) == (1, 3, 1, 5)
+    xy = np.frombuffer(wkb, dtype="<f8", offset=13).reshape(-1, 2)
+    assert len(wkb) == 13 + 5 * 16
+    np.testing.assert_array_equal(xy[0], xy[-1])
+    np.testing.assert_array_equal(xy[:-1], open_ring[:, ::-1])
+
+
+def test_encode_msgpack_roundtrip():
+    msgpack = pytest.importorskip("msgpack")
+    data = msgpack.unpackb(formats.encode_msgpack([PROJECT]))
+    assert data[0]["project_id"] == read_header_from_db_1.project_id
+    assert data[0]["geojson"]["geometry"]["coordinates"] == POINTS.tolist()
+
+
+def test_encode_arrow_roundtrip():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.ipc.open_stream(formats.encode_arrow(PROJECT)).read_all()
+    assert table.column("project_id").to_pylist() == [
+        read_header_from_db_1.project_id
+    ]
+    assert table.column("geometry").to_pylist() == [
+        formats.encode_wkb(read_header_from_db_1.geometry_type, POINTS)
+    ]
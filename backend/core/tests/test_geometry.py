@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from backend.api.tests.routers.project.data_for_test import read_from_db_1
+from backend.core import geometry
+
+# Reference example from Google polyline algorithm documentation
+GOOGLE_POINTS = np.array([(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)])
+GOOGLE_ENCODED = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def test_polyline_encode_reference():
+    assert geometry.polyline_encode(GOOGLE_POINTS, 5) == GOOGLE_ENCODED
+
+
+def test_polyline_encode_empty():
+    assert geometry.polyline_encode(np.empty((0, 2)), 5) == ""
+
+
+@pytest.mark.parametrize("precision", [0, 5, 7, 10])
+def test_polyline_roundtrip(precision):
+    points = geometry.coordinates_to_array(
+        read_from_db_1.geojson.geometry.coordinates
+    )
+    encoded = geometry.polyline_encode(points, precision)
+    decoded = geometry.polyline_decode(encoded, precision)
+    np.testing.assert_allclose(
+        decoded, geometry.quantise(points, precision), atol=1e-12
+    )
+
+
+def test_format_geometry_default_is_untouched():
+    geometry_in = read_from_db_1.geojson.geometry
+    assert geometry.format_geometry(geometry_in) is geometry_in
+
+
+def test_format_geometry_precision():
+    result = geometry.format_geometry(
+        read_from_db_1.geojson.geometry, precision=3
+    )
+    assert result["coordinates"][0] == {
+        "latitude": -52.843,
+        "longitude": -5.634,
+    }
+
+
+def test_rings_containing():
+    square = np.array([(0.0, 0.0), (0.0, 10.0), (10.0, 10.0), (10.0, 0.0)])
+    # U shape, notch between lon 3..7 above lat 3
+    u_shape = np.array(
+        [
+            (0.0, 0.0),
+            (0.0, 10.0),
+            (10.0, 10.0),
+            (10.0, 7.0),
+            (3.0, 7.0),
+            (3.0, 3.0),
+            (10.0, 3.0),
+            (10.0, 0.0),
+            (0.0, 0.0),
+        ]
+    )
+    rings = {1: square, 2: u_shape, 3: square + 20, 4: np.empty((0, 2))}
+    assert geometry.rings_containing(rings, 5.0, 5.0) == [1]
+    assert geometry.rings_containing(rings, 1.0, 5.0) == [1, 2]
+    assert geometry.rings_containing(rings, 25.0, 25.0) == [3]
+    assert geometry.rings_containing(rings, -1.0, 5.0) == []
+
+
+# 1° x 1° cell on equator, spherical area R² * Δλ * (sin φ2 - sin φ1)
+UNIT_CELL = np.array([(0.0, 0.0), (0.0, 1.0), (1.0, 1.0), (1.0, 0.0)])
+UNIT_CELL_AREA = (
+    geometry.EARTH_RADIUS**2 * np.radians(1) * np.sin(np.radians(1))
+)
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_metrics_unit_cell(closed):
+    points = np.vstack([UNIT_CELL, UNIT_CELL[:1]]) if closed else UNIT_CELL
+    metrics = geometry.metrics(points)
+    assert metrics.area == pytest.approx(UNIT_CELL_AREA, rel=1e-4)
+    # Two meridian edges of 1° plus equator and 1°N parallel
+    assert metrics.perimeter == pytest.approx(444_763, rel=1e-4)
+    assert metrics.centroid_latitude == pytest.approx(0.5, abs=1e-3)
+    assert metrics.centroid_longitude == pytest.approx(0.5, abs=1e-3)
+    assert metrics.vertex_count == 4
+
+
+def test_metrics_across_antimeridian():
+    points = np.array(
+        [(10.0, 179.5), (10.0, -179.5), (11.0, -179.5), (11.0, 179.5)]
+    )
+    metrics = geometry.metrics(points)
+    shifted = geometry.metrics(points - (0.0, 179.5))
+    assert metrics.area == pytest.approx(shifted.area)
+    assert abs(metrics.centroid_longitude) == pytest.approx(180, abs=1e-3)
+
+
+def test_metrics_degenerate():
+    assert geometry.metrics(np.empty((0, 2))).area is None
+    point = geometry.metrics(np.array([(5.0, 6.0)]))
+    assert point.area == 0
+    assert (point.centroid_latitude, point.centroid_longitude) == (5.0, 6.0)
@@ -15,6 +15,13 @@ POSTGRES_PORT: int = os.getenv("POSTGRES_PORT") or 5432
 POSTGRES_DB: str = os.getenv("POSTGRES_DB") or "RecruitmentTask"
 POSTGRES_SYNC: str = "postgresql+psycopg2"
 POSTGRES_ASYNC: str = "postgresql+asyncpg"
+# Per worker process, gunicorn workers each hold their own pool.
+#   Defaults are SQLAlchemy's own QueuePool defaults. Connections in use
+#   at once are workers * (POOL_SIZE + POOL_MAX_OVERFLOW), keep it under
+#   Postgres `max_connections` (100 by default) when raising either.
+#   Admission limit and readiness probe are derived from both
+POOL_SIZE: int = int(os.getenv("POOL_SIZE") or 5)
+POOL_MAX_OVERFLOW: int = int(os.getenv("POOL_MAX_OVERFLOW") or 10)
 
 logger.info(f"{POSTGRES_USER=}")
 logger.info(f"{POSTGRES_PASSWORD=}")
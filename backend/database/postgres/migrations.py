@@ -0,0 +1,469 @@
+"""
+Versioned schema migrations, run once per deploy instead of per worker.
+Applied versions are rows of `schema_version`. Runner holds advisory
+    lock for whole run, so concurrent runs (several containers starting
+    at once) apply each migration exactly once, in order.
+Each migration runs in its own transaction together with its version
+    row, failed one leaves nothing behind and is retried on next run.
+Workers only read current version (`current_version`), no DDL, no sync
+    engine.
+
+Usage: python -m backend.tools.migrate [upgrade|status|check]
+"""
+
+import argparse
+import sys
+import time
+import typing
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.exc import DBAPIError
+
+from backend.core import geometry
+from backend.database.postgres import config, project_models
+
+# Session level, released with connection even if runner dies
+MIGRATION_LOCK: int = 0x50524A4D  # "PRJM"
+BACKFILL_BATCH: int = 1_000
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String, nullable=False),
+    Column(
+        "applied_at",
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+)
+
+
+class Migration(typing.NamedTuple):
+    version: int
+    name: str
+    apply: typing.Callable[[typing.Any], None]  # sync Connection
+
+
+# Schema of first release, frozen: later model changes go to new
+#   migrations. IF NOT EXISTS, databases created before migrations
+#   already have these tables
+_BASELINE: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS project (
+        project_id SERIAL PRIMARY KEY,
+        name VARCHAR(32) NOT NULL,
+        start_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        end_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        description VARCHAR
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_project_project_id ON project (project_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_name ON project (name)",
+    """
+    CREATE TABLE IF NOT EXISTS geojson (
+        geojson_id SERIAL PRIMARY KEY,
+        type VARCHAR NOT NULL,
+        project_id INTEGER NOT NULL
+            REFERENCES project (project_id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_geojson_geojson_id ON geojson (geojson_id)",
+    "CREATE INDEX IF NOT EXISTS ix_geojson_project_id ON geojson (project_id)",
+    """
+    CREATE TABLE IF NOT EXISTS geometry (
+        geometry_id SERIAL PRIMARY KEY,
+        type VARCHAR NOT NULL,
+        geojson_id INTEGER NOT NULL
+            REFERENCES geojson (geojson_id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_geometry_geometry_id"
+    " ON geometry (geometry_id)",
+    "CREATE INDEX IF NOT EXISTS ix_geometry_geojson_id ON geometry (geojson_id)",
+    """
+    CREATE TABLE IF NOT EXISTS coordinate (
+        coord_id SERIAL PRIMARY KEY,
+        latitude FLOAT NOT NULL,
+        longitude FLOAT NOT NULL,
+        geometry_id INTEGER NOT NULL
+            REFERENCES geometry (geometry_id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_coordinate_coord_id ON coordinate (coord_id)",
+    "CREATE INDEX IF NOT EXISTS ix_coordinate_geometry_id"
+    " ON coordinate (geometry_id)",
+)
+
+
+def _initial(connection) -> None:
+    """Tables of first release: project, geojson, geometry, coordinate."""
+    for statement in _BASELINE:
+        connection.execute(text(statement))
+
+
+# Columns added to `project` after first release
+_PROJECT_COLUMNS: tuple[str, ...] = (
+    "min_latitude double precision",
+    "min_longitude double precision",
+    "max_latitude double precision",
+    "max_longitude double precision",
+    "area double precision",
+    "perimeter double precision",
+    "centroid_latitude double precision",
+    "centroid_longitude double precision",
+    "vertex_count integer",
+    "updated_at timestamp without time zone NOT NULL"
+    " DEFAULT timezone('UTC', now())",
+    "change_seq bigint NOT NULL DEFAULT nextval('project_change_seq')",
+)
+_COUNTER_SLOTS: int = 16
+# Before columns, `change_seq` default numbers existing rows from it
+_CHANGE_SEQ: str = "CREATE SEQUENCE IF NOT EXISTS project_change_seq"
+_CHANGE_FEED_TABLES: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS project_counter (
+        slot INTEGER PRIMARY KEY,
+        total BIGINT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS project_tombstone (
+        project_id INTEGER PRIMARY KEY,
+        deleted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+            DEFAULT timezone('UTC', now()),
+        change_seq BIGINT NOT NULL
+            DEFAULT nextval('project_change_seq') UNIQUE
+    )
+    """,
+)
+_PROJECT_INDEXES: tuple[str, ...] = (
+    "CREATE INDEX IF NOT EXISTS ix_project_bbox ON project USING gist"
+    " (box(point(min_longitude, min_latitude),"
+    " point(max_longitude, max_latitude)))",
+    "CREATE INDEX IF NOT EXISTS ix_project_area_project_id"
+    " ON project (area, project_id)",
+    "CREATE INDEX IF NOT EXISTS ix_project_name_prefix"
+    " ON project (lower(name) text_pattern_ops)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_project_name_trgm ON project USING gin"
+    " (lower(name) gin_trgm_ops)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_project_change_seq"
+    " ON project (change_seq)",
+    "CREATE INDEX IF NOT EXISTS ix_coordinate_geometry_id_coord_id"
+    " ON coordinate (geometry_id, coord_id)",
+)
+# Statement level, so ORM writes, bulk deletes and COPY loads are all
+#   counted. Each backend adds to its own slot of `project_counter`
+_PROJECT_COUNT_TRIGGERS: str = f"""
+    CREATE OR REPLACE FUNCTION project_count() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        delta bigint;
+    BEGIN
+        IF TG_OP = 'TRUNCATE' THEN
+            UPDATE project_counter SET total = 0;
+            RETURN NULL;
+        ELSIF TG_OP = 'INSERT' THEN
+            SELECT count(*) INTO delta FROM new_rows;
+        ELSE
+            SELECT -count(*) INTO delta FROM old_rows;
+        END IF;
+        IF delta <> 0 THEN
+            UPDATE project_counter SET total = total + delta
+            WHERE slot = mod(pg_backend_pid(), {_COUNTER_SLOTS});
+        END IF;
+        RETURN NULL;
+    END
+    $$;
+    CREATE OR REPLACE TRIGGER project_count_insert AFTER INSERT ON project
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION project_count();
+    CREATE OR REPLACE TRIGGER project_count_delete AFTER DELETE ON project
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION project_count();
+    CREATE OR REPLACE TRIGGER project_count_truncate AFTER TRUNCATE ON project
+        FOR EACH STATEMENT EXECUTE FUNCTION project_count();
+"""
+# ALTER of `project` holds exclusive lock until commit, recount is exact.
+#   Slot 0 starts from rows already there, rest from zero
+_PROJECT_COUNTER_SEED: str = f"""
+    INSERT INTO project_counter (slot, total)
+    SELECT slot, CASE WHEN slot = 0 THEN (SELECT count(*) FROM project)
+                      ELSE 0 END
+    FROM generate_series(0, {_COUNTER_SLOTS - 1}) AS slot
+    ON CONFLICT (slot) DO UPDATE SET total = excluded.total
+"""
+
+
+def _change_feed(connection) -> None:
+    """
+    Bounds, metrics, counter and change feed of `project`.
+    Every step is idempotent, databases created by `create_all` before
+        migrations may have any of it already.
+    """
+    connection.execute(text(_CHANGE_SEQ))
+    for column in _PROJECT_COLUMNS:
+        connection.execute(
+            text(f"ALTER TABLE project ADD COLUMN IF NOT EXISTS {column}")
+        )
+    for statement in _CHANGE_FEED_TABLES + _PROJECT_INDEXES:
+        connection.execute(text(statement))
+    connection.execute(text(_PROJECT_COUNT_TRIGGERS))
+    connection.execute(text(_PROJECT_COUNTER_SEED))
+    _backfill_metrics(connection)
+
+
+def _backfill_metrics(connection) -> None:
+    """Bounds and metrics of projects written before they were stored."""
+    while True:
+        project_ids = connection.scalars(
+            text(
+                "SELECT project_id FROM project WHERE vertex_count IS NULL"
+                " ORDER BY project_id LIMIT :limit"
+            ),
+            {"limit": BACKFILL_BATCH},
+        ).all()
+        if not project_ids:
+            return
+        rows = connection.execute(
+            text(
+                "SELECT geojson.project_id, coordinate.latitude,"
+                " coordinate.longitude"
+                " FROM geojson"
+                " JOIN geometry ON geometry.geojson_id = geojson.geojson_id"
+                " JOIN coordinate"
+                " ON coordinate.geometry_id = geometry.geometry_id"
+                " WHERE geojson.project_id = ANY(:ids)"
+                " ORDER BY geojson.project_id, coordinate.coord_id"
+            ),
+            {"ids": list(project_ids)},
+        ).all()
+        keys = np.array([row[0] for row in rows], dtype=np.int64)
+        points = np.array([row[1:] for row in rows], dtype=np.float64).reshape(
+            -1, 2
+        )
+        rings = geometry.split_by_key(keys, points)
+        updates = []
+        for project_id in project_ids:
+            ring = rings.get(project_id, geometry.EMPTY_POINTS)
+            min_lat, min_lon, max_lat, max_lon = geometry.bounds(ring)
+            updates.append(
+                {
+                    "project_id": project_id,
+                    "min_latitude": min_lat,
+                    "min_longitude": min_lon,
+                    "max_latitude": max_lat,
+                    "max_longitude": max_lon,
+                    **geometry.metrics(ring).model_dump(),
+                }
+            )
+        connection.execute(
+            text(
+                "UPDATE project SET"
+                " min_latitude = :min_latitude,"
+                " min_longitude = :min_longitude,"
+                " max_latitude = :max_latitude,"
+                " max_longitude = :max_longitude,"
+                " area = :area, perimeter = :perimeter,"
+                " centroid_latitude = :centroid_latitude,"
+                " centroid_longitude = :centroid_longitude,"
+                " vertex_count = :vertex_count"
+                " WHERE project_id = :project_id"
+            ),
+            updates,
+        )
+        logger.info(f"Backfilled metrics of {len(updates)} projects")
+
+
+def _date_order(connection) -> None:
+    """
+    `start_date <= end_date` as CHECK, rows from before request
+        validation are swapped first, with new change number so change
+        feed reports them.
+    `ix_project_active` is rebuilt on ordered bounds: build indexes
+        superseded row versions too, plain `tsrange` fails on them.
+    """
+    connection.execute(text(project_models.LOCK_CHANGE_FLOOR))
+    swapped = connection.scalars(
+        text(
+            "UPDATE project SET start_date = end_date,"
+            " end_date = start_date,"
+            " updated_at = timezone('UTC', now()),"
+            " change_seq = nextval('project_change_seq')"
+            " WHERE start_date > end_date RETURNING project_id"
+        )
+    ).all()
+    if swapped:
+        logger.warning(
+            f"Swapped start_date and end_date of {len(swapped)} projects:"
+            f" {sorted(swapped)}"
+        )
+    connection.execute(
+        text(
+            "ALTER TABLE project DROP CONSTRAINT IF EXISTS ck_project_dates,"
+            " ADD CONSTRAINT ck_project_dates"
+            " CHECK (start_date <= end_date)"
+        )
+    )
+    connection.execute(text("DROP INDEX IF EXISTS ix_project_active"))
+    connection.execute(
+        text(
+            "CREATE INDEX ix_project_active ON project USING gist"
+            " (tsrange(least(start_date, end_date),"
+            " greatest(start_date, end_date), '[]'))"
+        )
+    )
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "initial schema", _initial),
+    Migration(2, "project metrics and change feed", _change_feed),
+    Migration(3, "project date order", _date_order),
+)
+HEAD: int = MIGRATIONS[-1].version
+
+
+def _applied(connection) -> set[int]:
+    if not inspect(connection).has_table(schema_version.name):
+        return set()
+    return set(connection.scalars(select(schema_version.c.version)).all())
+
+
+def pending(
+    connection, migrations: typing.Sequence[Migration] = MIGRATIONS
+) -> list[Migration]:
+    """Migrations not yet recorded in `schema_version`, in order."""
+    applied = _applied(connection)
+    return [m for m in migrations if m.version not in applied]
+
+
+def _engine(create: bool = False):
+    """Sync psycopg2 engine, imported here so workers never load it."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import NullPool
+    from sqlalchemy_utils import create_database, database_exists
+
+    engine = create_engine(config.POSTGRES_SYNC_URL, poolclass=NullPool)
+    if create and not database_exists(engine.url):
+        create_database(engine.url)
+    return engine
+
+
+def upgrade(
+    engine: typing.Optional[typing.Any] = None,
+    migrations: typing.Sequence[Migration] = MIGRATIONS,
+) -> list[Migration]:
+    """
+    Applies pending migrations, creates database first if missing.
+    :param engine: Sync engine, configured database by default.
+    :return: Migrations applied by this call.
+    """
+    engine = engine or _engine(create=True)
+    postgres = engine.dialect.name == "postgresql"
+    applied = []
+    with engine.connect() as connection:
+        if postgres:
+            connection.execute(select(func.pg_advisory_lock(MIGRATION_LOCK)))
+            connection.commit()
+        try:
+            schema_version.create(connection, checkfirst=True)
+            connection.commit()
+            done = _applied(connection)
+            for migration in migrations:
+                if migration.version in done:
+                    continue
+                start = time.perf_counter()
+                migration.apply(connection)
+                connection.execute(
+                    insert(schema_version).values(
+                        version=migration.version, name=migration.name
+                    )
+                )
+                connection.commit()
+                applied.append(migration)
+                logger.info(
+                    f"Applied migration {migration.version:04d}"
+                    f" {migration.name} in"
+                    f" {time.perf_counter() - start:.2f}s"
+                )
+        finally:
+            connection.rollback()
+            if postgres:
+                connection.execute(
+                    select(func.pg_advisory_unlock(MIGRATION_LOCK))
+                )
+                connection.commit()
+    return applied
+
+
+def _version(connection) -> typing.Optional[int]:
+    return connection.scalar(select(func.max(schema_version.c.version)))
+
+
+async def current_version(engine: typing.Any) -> typing.Optional[int]:
+    """
+    Schema version of database, None before first migration.
+    One read on worker's own async engine, no DDL.
+    """
+    async with engine.connect() as connection:
+        try:
+            return await connection.run_sync(_version)
+        except DBAPIError as exc:
+            code = getattr(exc.orig, "sqlstate", None) or getattr(
+                exc.orig, "pgcode", None
+            )
+            # Undefined table, database predates migrations or is empty
+            if code == "42P01":
+                return None
+            raise
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.tools.migrate",
+        description="Apply or inspect schema migrations.",
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="upgrade",
+        choices=("upgrade", "status", "check"),
+        help="upgrade: apply pending (default). status: list all. "
+        "check: exit 1 when any is pending.",
+    )
+    args = parser.parse_args(argv)
+    if args.command == "upgrade":
+        applied = upgrade()
+        logger.info(
+            f"Schema at version {HEAD}, applied {len(applied)} migrations"
+        )
+        return
+    from sqlalchemy_utils import database_exists
+
+    engine = _engine()
+    if database_exists(engine.url):
+        with engine.connect() as connection:
+            waiting = {m.version for m in pending(connection)}
+    else:
+        waiting = {m.version for m in MIGRATIONS}
+    for migration in MIGRATIONS:
+        state = "pending" if migration.version in waiting else "applied"
+        print(f"{migration.version:04d} {migration.name}: {state}")
+    if args.command == "check" and waiting:
+        sys.exit(1)
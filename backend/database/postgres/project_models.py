@@ -1,15 +1,76 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    Column,
+    Index,
+    Sequence,
+    func,
+)
 from sqlmodel import Field, Relationship, SQLModel
 
+# Schema is created and changed by `migrations`, models mirror it.
+#   `ix_project_name_trgm` needs `pg_trgm` extension, created there too
+
+# One counter for inserts, edits and deletes, orders the change feed
+CHANGE_SEQ = Sequence("project_change_seq", metadata=SQLModel.metadata)
+# Before drawing change numbers writers take shared advisory lock keyed
+#   `CHANGE_FLOOR_BASE` plus sequence value, held until commit, every
+#   number they draw is above it. Lowest such key in `pg_locks` bounds
+#   what is still in flight, feed reads it and never waits on writers
+CHANGE_FLOOR_BASE: int = 1 << 62  # Above any 32 bit advisory key
+LOCK_CHANGE_FLOOR: str = (
+    "SELECT pg_advisory_xact_lock_shared("
+    f"{CHANGE_FLOOR_BASE} + (SELECT CASE WHEN is_called THEN last_value"
+    " ELSE 0 END FROM project_change_seq))"
+)
+# Taken with project id as second key, edits of one project queue up
+#   instead of racing to re-insert the same primary key
+PROJECT_EDIT_LOCK: int = 0x50524A45  # "PRJE"
+
+
+def utc_now():
+    """Naive UTC timestamp, same convention as stored project dates."""
+    return func.timezone("UTC", func.now())
+
 
 class Project(SQLModel, table=True):
+    # Inverted dates would make `active_range` differ from stored dates
+    __table_args__ = (
+        CheckConstraint("start_date <= end_date", name="ck_project_dates"),
+    )
+
     project_id: int | None = Field(default=None, primary_key=True, index=True)
     name: str = Field(max_length=32, nullable=False, index=True)
     start_date: datetime = Field(nullable=False)
     end_date: datetime = Field(nullable=False)
     description: Optional[str] = Field(nullable=True, default=None)
+    # Bounding box of geometry, computed on write, see `bbox_box`
+    min_latitude: Optional[float] = Field(default=None)
+    min_longitude: Optional[float] = Field(default=None)
+    max_latitude: Optional[float] = Field(default=None)
+    max_longitude: Optional[float] = Field(default=None)
+    # Geometry measures computed on write, see `geometry.metrics`
+    area: Optional[float] = Field(default=None)  # m²
+    perimeter: Optional[float] = Field(default=None)  # m
+    centroid_latitude: Optional[float] = Field(default=None)
+    centroid_longitude: Optional[float] = Field(default=None)
+    vertex_count: Optional[int] = Field(default=None)
+    # Database defaults, so COPY loads are stamped too
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column_kwargs={"server_default": utc_now(), "nullable": False},
+    )
+    change_seq: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger,
+            server_default=CHANGE_SEQ.next_value(),
+            nullable=False,
+        ),
+    )
 
     # --- Relationships below ---#
     geojson: "GeoJson" = Relationship(
@@ -19,6 +80,105 @@ class Project(SQLModel, table=True):
     )
 
 
+def bbox_box():
+    """Project bounding box as postgres `box` (x=lon, y=lat).
+    Queries must use this exact expression to hit `ix_project_bbox`."""
+    return func.box(
+        func.point(Project.min_longitude, Project.min_latitude),
+        func.point(Project.max_longitude, Project.max_latitude),
+    )
+
+
+def point_box(longitude: float, latitude: float):
+    """Degenerate box of single point, `box @> box` is GiST indexable."""
+    point = func.point(longitude, latitude)
+    return func.box(point, point)
+
+
+def active_range():
+    """Inclusive `[start_date, end_date]` as postgres `tsrange`.
+    Queries must use this exact expression to hit `ix_project_active`.
+    Bounds are ordered, so index build never fails on row versions
+        with inverted dates, `ck_project_dates` keeps new ones out."""
+    return func.tsrange(
+        func.least(Project.start_date, Project.end_date),
+        func.greatest(Project.start_date, Project.end_date),
+        "[]",
+    )
+
+
+def name_lower():
+    """Case folded project name, both name indexes are built on it."""
+    return func.lower(Project.name)
+
+
+# GiST over built-in box type is an R-tree, no PostGIS needed
+Index("ix_project_bbox", bbox_box(), postgresql_using="gist")
+# Range overlap (&&) and containment (@>) are answered from the same index
+Index("ix_project_active", active_range(), postgresql_using="gist")
+# Serves ?sort=area pages and ?min_area= ranges, id breaks ties
+Index("ix_project_area_project_id", Project.area, Project.project_id)
+# Prefix LIKE needs C-collation ordering, default btree on name can't serve it
+Index(
+    "ix_project_name_prefix",
+    name_lower().label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_project_name_trgm",
+    name_lower().label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"},
+)
+# `/projects/changes` walks it from client's token
+Index("ix_project_change_seq", Project.change_seq, unique=True)
+
+
+class ProjectCounter(SQLModel, table=True):
+    """
+    Project row count split over slots, total is sum of all slots.
+    Kept by statement level triggers on `project` (migration 0002),
+        so ORM writes, bulk deletes and COPY loads are all counted.
+    Each backend adds to its own slot, concurrent writers don't queue
+        on one row lock.
+    """
+
+    __tablename__ = "project_counter"
+
+    slot: int = Field(
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": False},
+    )
+    total: int = Field(
+        default=0,
+        sa_column=Column(BigInteger, nullable=False, server_default="0"),
+    )
+
+
+class ProjectTombstone(SQLModel, table=True):
+    """Deleted project id, kept so change feed can report deletes."""
+
+    __tablename__ = "project_tombstone"
+
+    project_id: int = Field(
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": False},
+    )
+    deleted_at: Optional[datetime] = Field(
+        default=None,
+        sa_column_kwargs={"server_default": utc_now(), "nullable": False},
+    )
+    change_seq: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger,
+            server_default=CHANGE_SEQ.next_value(),
+            nullable=False,
+            unique=True,
+        ),
+    )
+
+
 class GeoJson(SQLModel, table=True):
     geojson_id: int | None = Field(default=None, primary_key=True, index=True)
     type: str = Field(nullable=False)
@@ -65,6 +225,11 @@ class Geometry(SQLModel, table=True):
 
 
 class Coordinate(SQLModel, table=True):
+    # Lets ordered vertex streams walk the index instead of sorting
+    __table_args__ = (
+        Index("ix_coordinate_geometry_id_coord_id", "geometry_id", "coord_id"),
+    )
+
     coord_id: int | None = Field(default=None, primary_key=True, index=True)
     latitude: float = Field(nullable=False)
     longitude: float = Field(nullable=False)
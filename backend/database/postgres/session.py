@@ -1,35 +1,54 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import Depends
 from fastapi.exceptions import HTTPException
 from loguru import logger
-from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
 from sqlalchemy.orm import declarative_base
-from sqlalchemy_utils import create_database, database_exists
-from sqlmodel import SQLModel
 
 from backend.database.postgres import config
 
 Base = declarative_base()
 
+_engine: Optional[AsyncEngine] = None
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Process wide engine, its pool is shared by every session.
+    Created on first use, so each forked gunicorn worker builds own pool.
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(
+            url=config.POSTGRES_ASYNC_URL,
+            pool_size=config.POOL_SIZE,
+            max_overflow=config.POOL_MAX_OVERFLOW,
+        )
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """Closes pooled connections, on application shutdown."""
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
 
 def init_db():
-    engine = create_engine(
-        config.POSTGRES_SYNC_URL,
-        pool_size=50,
-        max_overflow=20,
-    )
-    # from sqlalchemy_utils import drop_database
-    # if database_exists(engine.url):
-    #     drop_database(engine.url)
-    if not database_exists(engine.url):
-        create_database(engine.url)
-    SQLModel.metadata.create_all(engine)
+    """
+    Applies pending migrations, for tools and benchmarks.
+    API workers don't call it, `python -m backend.tools.migrate` runs
+        once before they start.
+    """
+    from backend.database.postgres import migrations
+
+    migrations.upgrade()
 
 
 class DbContext(AsyncSession):
@@ -43,9 +62,7 @@ class DbContext(AsyncSession):
     """
 
     def __init__(self, *args, suppress_exc: bool = False, **kwargs) -> None:
-        self.engine: AsyncEngine = create_async_engine(
-            url=config.POSTGRES_ASYNC_URL
-        )
+        self.engine: AsyncEngine = get_engine()
         self.suppress_exc = suppress_exc
         super(DbContext, self).__init__(
             *args,
@@ -71,6 +88,8 @@ class DbContext(AsyncSession):
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if any((exc_type, exc_val, exc_tb)):
             if exc_type == HTTPException:
+                # Nothing committed, connection goes back to shared pool
+                await self.session.close()
                 raise exc_val  # Suppressing rest of session due to HTTP exc
             logger.opt(lazy=True).exception(exc_val)
             logger.debug("Rolling back session")
@@ -96,10 +115,12 @@ class DbContext(AsyncSession):
             raise Exception
         # except IntegrityError as exc:
         #     raise CustomDatabaseException
-        await self.session.close()
+        finally:
+            await self.session.close()
 
     async def close(self):
-        await self.engine.dispose()
+        # Returns connection to shared pool, engine stays open
+        await super().close()
 
 
 async def get_session():
@@ -1,24 +1,54 @@
+import os
 import sys
+import typing
 
-from asgi_correlation_id import correlation_id
 from loguru import logger
 
-from backend.loguru_logger import log_config
+from backend.loguru_logger import log_config, structured
 
+# text: colored lines to stderr and rotated file, as in development
+# json: one JSON object per line to stdout, written in background thread
+LOG_FORMAT: str = (os.getenv("LOG_FORMAT") or "text").lower()
 # log_level: str = "INFO"
-log_level: str = "DEBUG"
+log_level: str = os.getenv("LOG_LEVEL") or "DEBUG"
+# Per-module overrides, `backend.core=INFO,backend.api.app=WARNING`
+LOG_LEVELS: dict[str, str] = structured.parse_levels(
+    os.getenv("LOG_LEVELS") or ""
+)
+# Fraction of requests whose lines below WARNING are kept
+LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE") or 1)
+# Variable values in tracebacks, slow and may leak data in production
+_diagnose: typing.Optional[str] = os.getenv("LOG_DIAGNOSE")
+LOG_DIAGNOSE: bool = (
+    LOG_FORMAT != "json"
+    if _diagnose is None
+    else _diagnose.lower() in ("1", "true", "yes")
+)
 
+# Configured by `logger_setup`, overrides may name custom levels
+log_filter = structured.LogFilter(log_level)
+_handler_ids: list[int] = []
 
-def correlation_id_filter(record):
-    record["correlation_id"] = correlation_id.get()
-    return record["correlation_id"] or "No correlation_id"
-    # corr_id = correlation_id.get() or "No correlation_id"
-    # record["correlation_id"] = corr_id
-    # return corr_id
 
-
-def logger_setup():
-    logger.remove()
+def _add_sinks() -> None:
+    """
+    Sinks at lowest level any module logs at, so calls below it return
+        before message is even formatted, `log_filter` does the rest.
+    """
+    level = log_filter.min_level
+    if LOG_FORMAT == "json":
+        _handler_ids.append(
+            logger.add(
+                structured.BatchingSink(sys.stdout, structured.json_line),
+                format=structured.json_format,
+                level=level,
+                filter=log_filter,
+                colorize=False,
+                diagnose=LOG_DIAGNOSE,
+                backtrace=False,
+            )
+        )
+        return
     fmt = (
         "<level>{level: <8}</level>"
         " | <black>{correlation_id}</black>"
@@ -26,26 +56,61 @@ def logger_setup():
         " | <cyan>{name}</cyan>:<cyan>{function}</cyan>"
         ":<cyan>{line}</cyan> - <level>{message}</level>"
     )
-    logger.add(
-        sys.stderr,
-        format=fmt,
-        level=log_level,
-        filter=correlation_id_filter,
-        enqueue=True,
-        diagnose=True,
-        backtrace=False,
+    _handler_ids.append(
+        logger.add(
+            sys.stderr,
+            format=fmt,
+            level=level,
+            filter=log_filter,
+            enqueue=True,
+            diagnose=LOG_DIAGNOSE,
+            backtrace=False,
+        )
     )
-    logger.add(
-        "logs/loguru.log",
-        rotation="1 hour",
-        retention="1 day",
-        format=fmt,
-        level=log_level,
-        filter=correlation_id_filter,
-        enqueue=True,
-        backtrace=False,
-        diagnose=True,
+    _handler_ids.append(
+        logger.add(
+            "logs/loguru.log",
+            rotation="1 hour",
+            retention="1 day",
+            format=fmt,
+            level=level,
+            filter=log_filter,
+            enqueue=True,
+            backtrace=False,
+            diagnose=LOG_DIAGNOSE,
+        )
+    )
+
+
+def set_levels(
+    level: typing.Optional[str] = None,
+    levels: typing.Optional[dict[str, str]] = None,
+    sample_rate: typing.Optional[float] = None,
+) -> None:
+    """
+    Changes levels and sampling of running process, None keeps current.
+    Sinks are added again when lowest level changes, new ones first,
+        so no line is lost in between.
+    :raises ValueError: On unknown level or rate outside 0..1.
+    """
+    min_level = log_filter.min_level
+    log_filter.configure(
+        level if level is not None else log_filter.level,
+        levels if levels is not None else log_filter.levels,
+        sample_rate if sample_rate is not None else log_filter.sample_rate,
     )
+    if _handler_ids and log_filter.min_level != min_level:
+        previous = list(_handler_ids)
+        _handler_ids.clear()
+        _add_sinks()
+        for handler_id in previous:
+            logger.remove(handler_id)
+
+
+def logger_setup():
+    logger.remove()
+    _handler_ids.clear()
+    # Custom levels first, module overrides may name them
     logger.level(
         log_config.request_validation_exception, no=11, color="<black>"
     )
@@ -54,6 +119,8 @@ def logger_setup():
     logger.level(
         log_config.unexpected_exception, no=51, color="<red><bold><underline>"
     )
+    log_filter.configure(log_level, LOG_LEVELS, LOG_SAMPLE_RATE)
+    _add_sinks()
 
 
 # flake8: noqa: E501
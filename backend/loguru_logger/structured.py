@@ -0,0 +1,193 @@
+"""
+Building blocks of production logging, wired up by `logger_setup`.
+`LogFilter` applies per-module levels and samples success-path lines,
+    whole requests at a time, so sampled request keeps all its lines.
+`BatchingSink` moves writing off request path, background thread
+    renders queued records and writes whatever piled up in one call.
+"""
+
+import json
+import queue
+import random
+import threading
+import typing
+import zlib
+
+from asgi_correlation_id import correlation_id
+from loguru import logger
+
+# Lines below this level are success path and can be sampled
+SAMPLED_BELOW: int = 30  # WARNING
+BATCH_SIZE: int = 512
+
+
+def level_no(level: typing.Union[str, int]) -> int:
+    """:raises ValueError: On level loguru doesn't know."""
+    if isinstance(level, int):
+        return level
+    return logger.level(level.upper()).no
+
+
+def parse_levels(spec: str) -> dict[str, str]:
+    """`backend.core=INFO,sqlalchemy=WARNING` into {module: level}."""
+    levels = {}
+    for item in spec.split(","):
+        module, _, level = item.strip().partition("=")
+        if module and level:
+            levels[module.strip()] = level.strip().upper()
+    return levels
+
+
+class LogFilter:
+    """
+    Sink filter, keeps record when its module's level allows it
+        and, below WARNING, when its request is sampled.
+    Most specific module prefix wins, `backend.core` covers
+        `backend.core.core`. Resolved levels are cached per module.
+    """
+
+    def __init__(
+        self,
+        level: typing.Union[str, int],
+        levels: typing.Optional[dict[str, str]] = None,
+        sample_rate: float = 1.0,
+    ) -> None:
+        self.configure(level, levels or {}, sample_rate)
+
+    def configure(
+        self,
+        level: typing.Union[str, int],
+        levels: dict[str, str],
+        sample_rate: float,
+    ) -> None:
+        """:raises ValueError: On unknown level or rate outside 0..1."""
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"Sample rate {sample_rate} not in 0..1")
+        resolved = {
+            module: level_no(value) for module, value in levels.items()
+        }
+        self.default: int = level_no(level)
+        self.level = level
+        self.levels = dict(levels)
+        self._levels = resolved
+        self.sample_rate = sample_rate
+        self._cache: dict[str, int] = {}
+
+    @property
+    def min_level(self) -> int:
+        """Lowest level any module logs at, sink level must not exceed it."""
+        return min([self.default, *self._levels.values()])
+
+    def module_level(self, name: typing.Optional[str]) -> int:
+        name = name or ""
+        cached = self._cache.get(name)
+        if cached is not None:
+            return cached
+        module = name
+        while module and module not in self._levels:
+            module = module.rpartition(".")[0]
+        resolved = self._levels.get(module, self.default)
+        self._cache[name] = resolved
+        return resolved
+
+    def sampled(self, request_id: typing.Optional[str]) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        if request_id is None:
+            return random.random() < self.sample_rate
+        # Same answer for every line of request
+        return zlib.crc32(request_id.encode()) < self.sample_rate * 2**32
+
+    def __call__(self, record: dict) -> bool:
+        request_id = correlation_id.get()
+        record["correlation_id"] = request_id
+        no = record["level"].no
+        if no < self.module_level(record["name"]):
+            return False
+        return no >= SAMPLED_BELOW or self.sampled(request_id)
+
+
+def json_format(record: dict) -> str:
+    """Loguru format, only traceback is rendered on calling thread."""
+    return "{exception}"
+
+
+def json_line(message: typing.Any) -> str:
+    """One JSON object per record, `message` as passed to sink."""
+    record = message.record
+    line = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "correlation_id": record.get("correlation_id"),
+        "process": record["process"].id,
+    }
+    # Format arguments land in extra too, `"{x}"` ones repeat message
+    extra = {
+        key: value
+        for key, value in record["extra"].items()
+        if not callable(value) and value != record["message"]
+    }
+    if extra:
+        line["extra"] = extra
+    if message:
+        line["exception"] = str(message)
+    return json.dumps(line, default=str, separators=(",", ":")) + "\n"
+
+
+class BatchingSink:
+    """
+    Loguru sink writing from background thread.
+    `write` only queues, thread drains queue and writes it with one
+        `write` and `flush` per batch, batches grow with load.
+    Loguru calls `stop` when sink is removed, queue is drained first.
+    """
+
+    def __init__(
+        self,
+        stream: typing.TextIO,
+        render: typing.Callable[[typing.Any], str] = str,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        self.stream = stream
+        self.render = render
+        self.batch_size = batch_size
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: typing.Any) -> None:
+        self._queue.put(message)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                stopping = True
+            lines = []
+            for message in batch:
+                try:
+                    lines.append(self.render(message))
+                except Exception as exc:  # Never lose rest of batch
+                    lines.append(f"Unrenderable log record: {exc!r}\n")
+            try:
+                self.stream.write("".join(lines))
+                self.stream.flush()
+            except (OSError, ValueError):
+                pass  # Stream closed at interpreter exit
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
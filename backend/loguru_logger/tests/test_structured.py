@@ -0,0 +1,100 @@
+import io
+import json
+
+import pytest
+from asgi_correlation_id import correlation_id
+from loguru import logger
+
+from backend.loguru_logger import structured
+
+
+@pytest.fixture
+def capture():
+    """Adds sink for test only, yields (filter, stream)."""
+    stream = io.StringIO()
+    log_filter = structured.LogFilter("DEBUG")
+    sink = structured.BatchingSink(stream, structured.json_line)
+    handler_id = logger.add(
+        sink,
+        format=structured.json_format,
+        level="TRACE",
+        filter=log_filter,
+        colorize=False,
+    )
+    lines = []
+
+    def read() -> list[dict]:
+        logger.remove(handler_id)  # Drains writer thread
+        lines.extend(
+            json.loads(line) for line in stream.getvalue().splitlines()
+        )
+        return lines
+
+    yield log_filter, read
+    if handler_id in logger._core.handlers:
+        logger.remove(handler_id)
+
+
+def test_parse_levels():
+    assert structured.parse_levels(" backend.core=info, ,sqlalchemy=") == {
+        "backend.core": "INFO"
+    }
+
+
+def test_module_levels_most_specific_wins(capture):
+    log_filter, read = capture
+    log_filter.configure(
+        "WARNING", {"tests": "INFO", __name__: "DEBUG"}, sample_rate=1
+    )
+    assert log_filter.module_level("tests.other") == 20
+    assert log_filter.module_level("elsewhere") == 30
+    assert log_filter.min_level == 10
+    logger.debug("kept")
+    logger.trace("dropped")
+    lines = read()
+    assert [line["message"] for line in lines] == ["kept"]
+    assert lines[0]["logger"] == __name__
+    assert lines[0]["level"] == "DEBUG"
+
+
+def test_sampling_keeps_whole_requests_and_warnings(capture):
+    log_filter, read = capture
+    log_filter.configure("DEBUG", {}, sample_rate=0.5)
+    kept = []
+    for number in range(200):
+        request_id = f"{number:032x}"
+        token = correlation_id.set(request_id)
+        try:
+            logger.info("first {id}", id=request_id)
+            logger.info("second {id}", id=request_id)
+            logger.warning("warning {id}", id=request_id)
+        finally:
+            correlation_id.reset(token)
+        kept.append(log_filter.sampled(request_id))
+    lines = read()
+    infos = [line for line in lines if line["level"] == "INFO"]
+    warnings = [line for line in lines if line["level"] == "WARNING"]
+    assert len(warnings) == 200
+    assert len(infos) == 2 * sum(kept)
+    assert 50 < sum(kept) < 150
+    assert infos[0]["extra"] == {"id": infos[0]["correlation_id"]}
+
+
+def test_exception_rendered(capture):
+    _, read = capture
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("failed")
+    (line,) = read()
+    assert line["message"] == "failed"
+    assert "ZeroDivisionError" in line["exception"]
+
+
+def test_configure_rejects_invalid():
+    log_filter = structured.LogFilter("INFO")
+    with pytest.raises(ValueError):
+        log_filter.configure("LOUD", {}, 1)
+    with pytest.raises(ValueError):
+        log_filter.configure("INFO", {}, 2)
+    assert log_filter.default == 20
@@ -0,0 +1,163 @@
+"""
+Opt-in request profiling.
+Off unless `PROFILING` is set, then middleware is installed and profiles
+    requests sending `X-Profile` header, plus `PROFILE_SAMPLE_RATE`
+    fraction of all traffic.
+Reports are written to `PROFILE_DIR` named by request id, response
+    carries `X-Profile-Report` with file name.
+Uses pyinstrument when installed, its async mode only charges awaited
+    time to request being profiled. Falls back to cProfile, which is
+    process wide, so one request per process is profiled at a time.
+"""
+
+import cProfile
+import importlib.util
+import os
+import random
+import typing
+import uuid
+from pathlib import Path
+
+import anyio
+from asgi_correlation_id import correlation_id
+from loguru import logger
+
+# Optional, imported by first profiled request, workers not profiling
+#   never load it
+PYINSTRUMENT: bool = importlib.util.find_spec("pyinstrument") is not None
+
+ENABLED: bool = bool(os.getenv("PROFILING"))
+PROFILE_DIR: str = os.getenv("PROFILE_DIR") or "logs/profiles"
+PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE") or 0)
+PROFILE_INTERVAL: float = float(os.getenv("PROFILE_INTERVAL") or 0.001)
+HEADER: bytes = b"x-profile"
+
+HTML: str = "html"
+SPEEDSCOPE: str = "speedscope"
+PSTATS: str = "pstats"
+_SUFFIXES: dict[str, str] = {
+    HTML: ".html",
+    SPEEDSCOPE: ".speedscope.json",
+    PSTATS: ".prof",
+}
+
+
+def report_format(requested: typing.Optional[bytes]) -> str:
+    """Report format for `X-Profile` value, pstats without pyinstrument."""
+    if not PYINSTRUMENT:
+        return PSTATS
+    if requested is not None and requested.strip().lower() == b"speedscope":
+        return SPEEDSCOPE
+    return HTML
+
+
+def report_name(request_id: str, fmt: str) -> str:
+    """File name of report, request id normalised so it's path safe."""
+    return uuid.UUID(request_id).hex + _SUFFIXES[fmt]
+
+
+class _PyinstrumentSession:
+    def __init__(self) -> None:
+        import pyinstrument
+
+        self.profiler = pyinstrument.Profiler(
+            interval=PROFILE_INTERVAL, async_mode="enabled"
+        )
+
+    def start(self) -> None:
+        self.profiler.start()
+
+    def stop(self) -> None:
+        self.profiler.stop()
+
+    def write(self, path: Path, fmt: str) -> None:
+        from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+
+        renderer = (
+            SpeedscopeRenderer() if fmt == SPEEDSCOPE else HTMLRenderer()
+        )
+        path.write_text(self.profiler.output(renderer), encoding="utf-8")
+
+
+class _CProfileSession:
+    busy: bool = False  # Only one cProfile can be active per process
+
+    def __init__(self) -> None:
+        self.profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        _CProfileSession.busy = True
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        self.profiler.disable()
+        _CProfileSession.busy = False
+
+    def write(self, path: Path, fmt: str) -> None:
+        self.profiler.dump_stats(path)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware, profiles whole request including streamed body.
+    Sits inside `CorrelationIdMiddleware`, report is named by request id.
+    """
+
+    def __init__(
+        self,
+        app: typing.Any,
+        directory: str = PROFILE_DIR,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+    ) -> None:
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+
+    def _requested(self, scope: dict) -> typing.Optional[bytes]:
+        for key, value in scope["headers"]:
+            if key == HEADER:
+                return value
+        return None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = self._requested(scope)
+        if requested is None and random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        if not PYINSTRUMENT and _CProfileSession.busy:
+            await self.app(scope, receive, send)
+            return
+        fmt = report_format(requested)
+        name = report_name(correlation_id.get(), fmt)
+        session = (
+            _CProfileSession() if not PYINSTRUMENT else _PyinstrumentSession()
+        )
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-report", name.encode("latin-1"))
+                ]
+            await send(message)
+
+        session.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session.stop()
+            # Rendering is CPU heavy, keep it off event loop
+            await anyio.to_thread.run_sync(self._write, session, name, fmt)
+
+    def _write(self, session: typing.Any, name: str, fmt: str) -> None:
+        path = self.directory / name
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            session.write(path, fmt)
+        except OSError as exc:
+            # Response is already out, losing report mustn't fail request
+            logger.warning(f"Profile report {path} not written: {exc}")
+            return
+        logger.info(f"Profile report written to {path}")
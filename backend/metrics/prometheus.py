@@ -0,0 +1,200 @@
+"""
+Prometheus metrics of API process.
+Under gunicorn every worker writes its samples to files in
+    `PROMETHEUS_MULTIPROC_DIR` and `/metrics` aggregates all of them,
+    so any worker answering the scrape reports whole server.
+Directory must be set before this module is imported and emptied on
+    server start, see `deployment/entrypoints/backend_entrypoint.sh`.
+"""
+
+import functools
+import os
+import time
+import typing
+
+from starlette.routing import Match
+
+from backend.metrics import startup
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+MULTIPROC_DIR: typing.Optional[str] = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+UNMATCHED_ROUTE: str = "unmatched"
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        "http_request_duration_seconds",
+        "Request latency until response is fully sent.",
+        ["method", "route"],
+    )
+    REQUESTS = prometheus_client.Counter(
+        "http_requests",
+        "Finished requests by status code.",
+        ["method", "route", "status"],
+    )
+    IN_FLIGHT = prometheus_client.Gauge(
+        "http_requests_in_flight",
+        "Requests being processed.",
+        multiprocess_mode="livesum",
+    )
+    CORE_LATENCY = prometheus_client.Histogram(
+        "core_call_duration_seconds",
+        "Latency of `backend.core.core` functions.",
+        ["function"],
+    )
+    POOL_CHECKED_OUT = prometheus_client.Gauge(
+        "db_pool_checked_out",
+        "Connections lent out of pool.",
+        multiprocess_mode="livesum",
+    )
+    POOL_OVERFLOW = prometheus_client.Gauge(
+        "db_pool_overflow",
+        "Connections open above pool size.",
+        multiprocess_mode="livesum",
+    )
+    POOL_SIZE = prometheus_client.Gauge(
+        "db_pool_size",
+        "Configured pool size.",
+        multiprocess_mode="livesum",
+    )
+    ADMISSION_LIMIT = prometheus_client.Gauge(
+        "admission_limit",
+        "Adaptive concurrency limit of admission control.",
+        multiprocess_mode="livesum",
+    )
+    ADMISSION_QUEUED = prometheus_client.Gauge(
+        "admission_queued",
+        "Requests waiting for admission.",
+        ["request_class"],
+        multiprocess_mode="livesum",
+    )
+    ADMISSION_SHED = prometheus_client.Counter(
+        "admission_shed",
+        "Requests answered 503 by admission control.",
+        ["request_class", "reason"],
+    )
+    LOOP_LAG = prometheus_client.Gauge(
+        "event_loop_lag_seconds",
+        "How late event loop runs scheduled callback, worst worker.",
+        multiprocess_mode="livemax",
+    )
+
+
+def timed(function: typing.Callable) -> typing.Callable:
+    """Records latency of async function in `CORE_LATENCY`."""
+    if prometheus_client is None:
+        return function
+    histogram = CORE_LATENCY.labels(function.__name__)
+
+    @functools.wraps(function)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await function(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def watch_pool(pool: typing.Any) -> None:
+    """
+    Keeps pool gauges current from pool events.
+    Overflow is counted from connects and closes, `pool.overflow()` lags
+        as async pool closes surplus connections after checkin event.
+    """
+    if prometheus_client is None:
+        return
+    from sqlalchemy import event
+
+    size = pool.size()
+    POOL_SIZE.set(size)
+    connections = 0
+
+    def connect(*args) -> None:
+        nonlocal connections
+        connections += 1
+        POOL_OVERFLOW.set(max(connections - size, 0))
+
+    def close(*args) -> None:
+        nonlocal connections
+        connections -= 1
+        POOL_OVERFLOW.set(max(connections - size, 0))
+
+    event.listen(pool, "connect", connect)
+    event.listen(pool, "close", close)
+    event.listen(pool, "checkout", lambda *args: POOL_CHECKED_OUT.inc())
+    event.listen(pool, "checkin", lambda *args: POOL_CHECKED_OUT.dec())
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition of all workers' samples, with its content type."""
+    if MULTIPROC_DIR:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return (
+        prometheus_client.generate_latest(registry),
+        prometheus_client.CONTENT_TYPE_LATEST,
+    )
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drops live gauges of exited worker, call from gunicorn `child_exit`."""
+    if prometheus_client is not None and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware, so streamed responses are timed to last chunk.
+    Routes are labelled by path template (`/project/{project_id}`),
+        requests answered before routing (cache hits) are matched here.
+    First response of worker marks end of its cold start.
+    """
+
+    def __init__(self, app: typing.Any) -> None:
+        self.app = app
+
+    def _route(self, scope: dict) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        for route in scope["app"].router.routes:
+            if route.matches(scope)[0] == Match.FULL:
+                return route.path
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if prometheus_client is None:
+            await self.app(scope, receive, send)
+            startup.first_request()
+            return
+        status_code = 500  # Unless response starts
+        start = time.perf_counter()
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            method, route = scope["method"], self._route(scope)
+            REQUEST_LATENCY.labels(method, route).observe(
+                time.perf_counter() - start
+            )
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            startup.first_request()
@@ -0,0 +1,144 @@
+"""
+Per-request SQL statistics.
+Engine cursor events add every statement to stats of current request,
+    `QueryStatsMiddleware` reports totals as `Server-Timing` header,
+    in access log and warns when request goes over `QUERY_BUDGET`,
+    which is how N+1 loads (`selectin` relationships) show up.
+"""
+
+import collections
+import contextvars
+import os
+import time
+import typing
+
+from loguru import logger
+
+# Statements one request may issue before it is logged as suspicious
+QUERY_BUDGET: int = int(os.getenv("QUERY_BUDGET") or 20)
+
+
+class QueryStats:
+    """Statements issued on behalf of one request."""
+
+    __slots__ = ("count", "duration", "statements", "scope")
+
+    def __init__(self, scope: typing.Optional[dict] = None) -> None:
+        self.count: int = 0
+        self.duration: float = 0.0  # seconds
+        # Same statement repeated is what N+1 looks like
+        self.statements: collections.Counter = collections.Counter()
+        self.scope = scope
+
+    @property
+    def method(self) -> typing.Optional[str]:
+        return self.scope.get("method") if self.scope else None
+
+    @property
+    def route(self) -> typing.Optional[str]:
+        """Path template once routed (`/project/{project_id}`), else path."""
+        if not self.scope:
+            return None
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path")
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def server_timing(self) -> bytes:
+        """`Server-Timing` entry, duration in milliseconds."""
+        return (
+            f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+        ).encode("latin-1")
+
+    def __str__(self) -> str:
+        return f"queries={self.count} db={self.duration * 1000:.1f}ms"
+
+
+# Mutable stats object, so statements run in child tasks of request
+#   (BaseHTTPMiddleware, greenlets of async engine) count towards it
+_stats: contextvars.ContextVar[typing.Optional[QueryStats]] = (
+    contextvars.ContextVar("query_stats", default=None)
+)
+
+
+def current() -> typing.Optional[QueryStats]:
+    """Stats of request being served, None outside of one."""
+    return _stats.get()
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    start = conn.info["query_start"].pop()
+    stats = _stats.get()
+    if stats is not None:
+        stats.add(statement, time.perf_counter() - start)
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+
+def instrument(engine: typing.Any) -> None:
+    """Times every statement of sync engine (`AsyncEngine.sync_engine`)."""
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware opening stats scope for each request.
+    Sits inside `CorrelationIdMiddleware`, so budget warning carries
+        request id like rest of request's log lines.
+    Header is written when response starts, so statements of streamed
+        bodies only reach log line and budget check.
+    """
+
+    def __init__(self, app: typing.Any, budget: int = QUERY_BUDGET) -> None:
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(scope)
+        token = _stats.set(stats)
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", stats.server_timing())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _stats.reset(token)
+            if stats.count > self.budget:
+                statement, repeats = stats.statements.most_common(1)[0]
+                logger.opt(lazy=True).warning(
+                    "{method} {path} over query budget of {budget}: {stats},"
+                    " most repeated ({repeats}x): {statement}",
+                    method=lambda: scope["method"],
+                    path=lambda: scope["path"],
+                    budget=lambda: self.budget,
+                    stats=lambda: stats,
+                    repeats=lambda: repeats,
+                    statement=lambda: " ".join(statement.split()),
+                )
@@ -0,0 +1,136 @@
+"""
+Saturation signals of worker, behind `GET /health/ready`.
+Pool utilisation is connections lent out over pool size plus overflow,
+    read from pool itself, measuring it takes no connection.
+Event loop lag is how late background task wakes up from
+    `LOOP_LAG_INTERVAL` sleeps, worst of last `LOOP_LAG_WINDOW` samples.
+    Blocking call or CPU bound request shows up as lag.
+Worker is not ready when pool utilisation reaches
+    `READY_MAX_POOL_UTILISATION`, lag reaches `READY_MAX_LOOP_LAG_MS`,
+    or database doesn't answer within `READY_DB_TIMEOUT_MS` at schema
+    version this code expects.
+"""
+
+import asyncio
+import collections
+import os
+import typing
+
+from loguru import logger
+
+from backend.database.postgres import migrations
+from backend.metrics import prometheus
+
+READY_MAX_POOL_UTILISATION: float = float(
+    os.getenv("READY_MAX_POOL_UTILISATION") or 0.9
+)
+READY_MAX_LOOP_LAG_MS: float = float(os.getenv("READY_MAX_LOOP_LAG_MS") or 250)
+READY_DB_TIMEOUT_MS: float = float(os.getenv("READY_DB_TIMEOUT_MS") or 1000)
+LOOP_LAG_INTERVAL: float = 0.1
+LOOP_LAG_WINDOW: int = 10
+
+
+def pool_usage(pool: typing.Any) -> tuple[int, typing.Optional[int]]:
+    """Connections lent out and most pool can lend, None if unbounded."""
+    checked_out = pool.checkedout()
+    # QueuePool with max_overflow=-1 opens connections without limit
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    if max_overflow < 0:
+        return checked_out, None
+    return checked_out, pool.size() + max_overflow
+
+
+class LoopLagMonitor:
+    """Samples event loop lag while started, from lifespan."""
+
+    def __init__(
+        self,
+        interval: float = LOOP_LAG_INTERVAL,
+        window: int = LOOP_LAG_WINDOW,
+    ) -> None:
+        self.interval = interval
+        self.samples: collections.deque = collections.deque(maxlen=window)
+        self._task: typing.Optional[asyncio.Task] = None
+
+    @property
+    def lag(self) -> float:
+        """Worst recent lag in seconds, 0 before first sample."""
+        return max(self.samples, default=0.0)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - start - self.interval, 0.0)
+            self.samples.append(lag)
+            if prometheus.prometheus_client is not None:
+                prometheus.LOOP_LAG.set(lag)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.samples.clear()
+
+
+loop_lag = LoopLagMonitor()
+
+
+async def readiness(engine: typing.Any) -> tuple[bool, dict]:
+    """
+    Checks saturation first, saturated pool isn't queued on for probe.
+    Probe reads schema version on pooled connection, no session.
+    :param engine: AsyncEngine of worker.
+    :return: Whether worker is ready, and report of every check.
+    """
+    reasons = []
+    checked_out, capacity = pool_usage(engine.sync_engine.pool)
+    utilisation = checked_out / capacity if capacity else 0.0
+    if utilisation >= READY_MAX_POOL_UTILISATION:
+        reasons.append("pool saturated")
+    lag_ms = loop_lag.lag * 1000
+    if lag_ms >= READY_MAX_LOOP_LAG_MS:
+        reasons.append("event loop lagging")
+
+    version = None
+    reachable = None  # Not probed
+    if not reasons:
+        try:
+            version = await asyncio.wait_for(
+                migrations.current_version(engine),
+                timeout=READY_DB_TIMEOUT_MS / 1000,
+            )
+            reachable = True
+        except Exception as exc:
+            reachable = False
+            reasons.append("database unreachable")
+            logger.warning(f"Readiness probe failed: {exc!r}")
+        else:
+            if version != migrations.HEAD:
+                reasons.append("schema outdated")
+
+    report = {
+        "status": "unavailable" if reasons else "ready",
+        "reasons": reasons,
+        "pool": {
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "utilisation": round(utilisation, 3),
+        },
+        "loop_lag_ms": round(lag_ms, 1),
+        "database": {
+            "reachable": reachable,
+            "schema_version": version,
+            "expected_version": migrations.HEAD,
+        },
+    }
+    return not reasons, report
@@ -0,0 +1,268 @@
+"""
+Slow statement log with captured plans.
+Statements running longer than `SLOW_QUERY_MS` are kept, with
+    parameters, route and request id, in rolling per process store of
+    `SLOW_QUERY_LOG_SIZE` entries, served by `GET /admin/slow-queries`.
+    Every one is logged as warning too, so log files keep them across
+    restarts and gunicorn workers.
+`SLOW_QUERY_EXPLAIN_RATE` fraction of slow `SELECT`s is run again as
+    `EXPLAIN (ANALYZE, BUFFERS)` in background task, on its own pooled
+    connection and rolled back, so request never waits for plan.
+    At most `EXPLAIN_CONCURRENCY` plans are captured at once, rest of
+    sampled statements are recorded without one.
+"""
+
+import asyncio
+import collections
+import contextvars
+import itertools
+import json
+import os
+import random
+import time
+import typing
+from datetime import datetime, timezone
+
+from asgi_correlation_id import correlation_id
+from loguru import logger
+
+from backend.metrics import queries
+
+SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS") or 250)
+SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE") or 200)
+SLOW_QUERY_EXPLAIN_RATE: float = float(
+    os.getenv("SLOW_QUERY_EXPLAIN_RATE") or 0.1
+)
+# Analyzed statement runs again, bound what one plan may cost
+EXPLAIN_TIMEOUT_MS: int = int(
+    os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS") or 10_000
+)
+EXPLAIN_CONCURRENCY: int = 1
+# Coordinate inserts carry thousands of values, keep entries small
+MAX_PARAMETERS: int = 20
+MAX_PARAMETER_LENGTH: int = 100
+# Rerun would take locks again and queue behind or block real request
+_NOT_EXPLAINED: tuple[str, ...] = ("pg_advisory", "for update", "for share")
+
+# Set in explain tasks, their own statements are never recorded
+_explaining: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "slow_query_explaining", default=False
+)
+
+
+class SlowQuery:
+    """One statement over threshold, plan filled in later if sampled."""
+
+    __slots__ = (
+        "id",
+        "recorded_at",
+        "duration_ms",
+        "statement",
+        "parameters",
+        "method",
+        "route",
+        "request_id",
+        "plan",
+        "explain_error",
+    )
+
+    def __init__(
+        self,
+        entry_id: int,
+        statement: str,
+        parameters: typing.Any,
+        duration: float,
+        stats: typing.Optional[queries.QueryStats],
+    ) -> None:
+        self.id = entry_id
+        self.recorded_at = datetime.now(timezone.utc)
+        self.duration_ms = round(duration * 1000, 1)
+        self.statement = statement
+        self.parameters = _truncate(parameters)
+        self.method = stats.method if stats is not None else None
+        self.route = stats.route if stats is not None else None
+        self.request_id = correlation_id.get()
+        self.plan: typing.Optional[typing.Any] = None
+        self.explain_error: typing.Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "recorded_at": self.recorded_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "statement": self.statement,
+            "parameters": self.parameters,
+            "method": self.method,
+            "route": self.route,
+            "request_id": self.request_id,
+            "plan": self.plan,
+            "explain_error": self.explain_error,
+        }
+
+
+def _truncate(parameters: typing.Any) -> typing.Any:
+    """JSON safe copy of parameters, long values and lists cut short."""
+    if isinstance(parameters, dict):
+        items = list(parameters.items())[:MAX_PARAMETERS]
+        return {str(key): _truncate_value(value) for key, value in items}
+    if isinstance(parameters, (list, tuple)):
+        return [_truncate_value(v) for v in parameters[:MAX_PARAMETERS]]
+    return _truncate_value(parameters)
+
+
+def _truncate_value(value: typing.Any) -> typing.Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    if len(text) > MAX_PARAMETER_LENGTH:
+        return text[:MAX_PARAMETER_LENGTH] + "..."
+    return text
+
+
+def _explainable(statement: str) -> bool:
+    """Plain `SELECT`s only, `EXPLAIN ANALYZE` executes statement."""
+    lowered = statement.lstrip().lower()
+    return lowered.startswith("select") and not any(
+        clause in lowered for clause in _NOT_EXPLAINED
+    )
+
+
+class SlowQueryLog:
+    """Rolling store of `SlowQuery`, newest last."""
+
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        size: int = SLOW_QUERY_LOG_SIZE,
+        explain_rate: float = SLOW_QUERY_EXPLAIN_RATE,
+    ) -> None:
+        self.threshold: float = threshold_ms / 1000
+        self.explain_rate = explain_rate
+        self.entries: collections.deque = collections.deque(maxlen=size)
+        self.engine: typing.Optional[typing.Any] = None  # AsyncEngine
+        self._ids = itertools.count(1)
+        self._explains: set[asyncio.Task] = set()
+
+    def record(
+        self,
+        statement: str,
+        parameters: typing.Any,
+        duration: float,
+        executemany: bool = False,
+    ) -> typing.Optional[SlowQuery]:
+        """Keeps statement when over threshold, may schedule its plan."""
+        if duration < self.threshold or _explaining.get():
+            return None
+        entry = SlowQuery(
+            next(self._ids), statement, parameters, duration, queries.current()
+        )
+        self.entries.append(entry)
+        logger.opt(lazy=True).warning(
+            "Slow query #{id} {duration}ms {method} {route}: {statement}",
+            id=lambda: entry.id,
+            duration=lambda: entry.duration_ms,
+            method=lambda: entry.method,
+            route=lambda: entry.route,
+            statement=lambda: " ".join(statement.split()),
+        )
+        if (
+            not executemany
+            and self.engine is not None
+            and len(self._explains) < EXPLAIN_CONCURRENCY
+            and _explainable(statement)
+            and random.random() < self.explain_rate
+        ):
+            self._schedule_explain(entry, parameters)
+        return entry
+
+    def _schedule_explain(self, entry: SlowQuery, parameters) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Sync engine outside of event loop, no plan
+        # Fresh context, plan statements don't count towards request
+        context = contextvars.Context()
+        context.run(_explaining.set, True)
+        task = loop.create_task(
+            self.explain(entry, parameters), context=context
+        )
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+
+    async def explain(self, entry: SlowQuery, parameters) -> None:
+        """Runs statement again under `EXPLAIN (ANALYZE, BUFFERS)`."""
+        start = time.perf_counter()
+        try:
+            async with self.engine.connect() as connection:
+                await connection.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}"
+                )
+                result = await connection.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+                    + entry.statement,
+                    parameters,
+                )
+                plan = result.scalar_one()
+                # Leaving without commit rolls back whatever it did
+        except Exception as exc:
+            entry.explain_error = " ".join(str(exc).split())
+            logger.opt(lazy=True).warning(
+                "Explain of slow query #{id} failed: {error}",
+                id=lambda: entry.id,
+                error=lambda: entry.explain_error,
+            )
+            return
+        # asyncpg returns json column as text, psycopg2 parses it
+        entry.plan = json.loads(plan) if isinstance(plan, str) else plan
+        logger.opt(lazy=True).info(
+            "Plan of slow query #{id} captured in {elapsed:.0f}ms",
+            id=lambda: entry.id,
+            elapsed=lambda: (time.perf_counter() - start) * 1000,
+        )
+
+    def snapshot(self, limit: typing.Optional[int] = None) -> list[dict]:
+        """Entries newest first."""
+        entries = list(reversed(self.entries))
+        return [entry.as_dict() for entry in entries[:limit]]
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    duration = time.perf_counter() - conn.info["slow_query_start"].pop()
+    slow_query_log.record(statement, parameters, duration, executemany)
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("slow_query_start"):
+        connection.info["slow_query_start"].pop()
+
+
+def instrument(
+    engine: typing.Any,
+    explain_engine: typing.Optional[typing.Any] = None,
+) -> None:
+    """
+    Watches every statement of sync engine (`AsyncEngine.sync_engine`).
+    :param explain_engine: AsyncEngine plans are captured with,
+        none are without it.
+    """
+    from sqlalchemy import event
+
+    slow_query_log.engine = explain_engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,69 @@
+"""
+Cold start of API worker, measured from its process start.
+Phases: `imported` (app module loaded), `ready` (lifespan startup done)
+    and `first_request` (first response sent). Each is logged once and
+    set in `worker_startup_seconds` gauge, slowest live worker reported.
+Under gunicorn process start is fork of worker, so master's imports
+    aren't counted, worker's own are.
+"""
+
+import os
+import time
+import typing
+
+from loguru import logger
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+IMPORTED: str = "imported"
+READY: str = "ready"
+FIRST_REQUEST: str = "first_request"
+
+if prometheus_client is not None:
+    STARTUP = prometheus_client.Gauge(
+        "worker_startup_seconds",
+        "Seconds from worker process start to startup phase.",
+        ["phase"],
+        multiprocess_mode="livemax",
+    )
+
+
+def _process_age() -> typing.Optional[float]:
+    """Seconds since this process started, None off Linux."""
+    try:
+        with open("/proc/self/stat") as stat:
+            # Fields after command name, which may contain spaces
+            fields = stat.read().rpartition(")")[2].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - started
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# Fallback origin, first of this package imported by worker
+_origin: float = time.perf_counter() - (_process_age() or 0.0)
+phases: dict[str, float] = {}
+
+
+def mark(phase: str) -> float:
+    """
+    Records phase once, later marks of it are ignored.
+    :return: Seconds from process start to first mark of phase.
+    """
+    if phase in phases:
+        return phases[phase]
+    elapsed = time.perf_counter() - _origin
+    phases[phase] = elapsed
+    if prometheus_client is not None:
+        STARTUP.labels(phase).set(elapsed)
+    logger.info(f"Worker {os.getpid()} {phase} {elapsed:.3f}s after start")
+    return elapsed
+
+
+def first_request() -> None:
+    """Cheap after first call, made on every response."""
+    if FIRST_REQUEST not in phases:
+        mark(FIRST_REQUEST)
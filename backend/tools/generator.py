@@ -0,0 +1,339 @@
+"""
+Synthetic projects for load tests and benchmarks.
+Rings are star shaped around their centre with strictly increasing
+    angles, so every ring is simple (no self intersections) without any
+    per-vertex python code. Exteriors are counter clockwise and closed,
+    holes sit inside innermost radius of exterior and run clockwise,
+    as RFC 7946 asks.
+Same seed gives same dataset, each chunk of `CHUNK_SIZE` projects has
+    its own generator seeded from (seed, chunk number).
+Output is NDJSON of GeoJSON Features (`python -m backend.tools.import`
+    reads it back) or straight `COPY` into database.
+Stored projects keep one ring, so database load takes exterior of first
+    polygon, holes and further polygons only exist in NDJSON, where
+    importer rejects them (parser and rejection path tests).
+
+Usage: python -m backend.tools.generator COUNT (--out FILE | --db)
+    [--seed N] [--vertices SPEC] [--holes P] [--multi P]
+    [--name-prefix STR]
+"""
+
+import argparse
+import json
+import time
+import typing
+from datetime import datetime, timedelta
+
+import numpy as np
+from loguru import logger
+
+from backend.tools import importer
+
+CHUNK_SIZE: int = 1_000
+MIN_VERTICES: int = 3
+MAX_VERTICES: int = 1_000_000
+DEFAULT_VERTICES: str = "lognormal:64,1.0"
+NAME_PREFIX: str = "synthetic-"
+# Project dates fall between these, end never in future (date validator)
+EPOCH: datetime = datetime(2000, 1, 1)
+DAYS: int = 8_000
+_DECIMALS: int = 6  # ~0.1 m, keeps NDJSON compact
+
+
+class SyntheticProject(typing.NamedTuple):
+    """Generated project, rings as closed (N + 1, 2) (lon, lat) arrays."""
+
+    name: str
+    description: str
+    start_date: datetime
+    end_date: datetime
+    polygons: list[list[np.ndarray]]  # [polygon][exterior, *holes]
+
+
+def parse_vertices(spec: str) -> typing.Callable:
+    """
+    Vertex count distribution from `kind:params`.
+    `fixed:N`, `uniform:LOW,HIGH`, `lognormal:MEDIAN,SIGMA`,
+        `choice:A,B,C` (equal weights).
+    :return: Function (rng, count) -> int array, clipped to valid range.
+    :raises ValueError: On unknown kind or wrong parameters.
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if kind == "fixed" and len(values) == 1:
+
+        def draw(rng, count):
+            return np.full(count, values[0])
+    elif kind == "uniform" and len(values) == 2:
+
+        def draw(rng, count):
+            return rng.integers(values[0], values[1], count, endpoint=True)
+    elif kind == "lognormal" and len(values) == 2:
+
+        def draw(rng, count):
+            return rng.lognormal(np.log(values[0]), values[1], count)
+    elif kind == "choice" and values:
+
+        def draw(rng, count):
+            return rng.choice(values, count)
+    else:
+        raise ValueError(f"Invalid vertex distribution: {spec!r}")
+
+    def counts(rng: np.random.Generator, count: int) -> np.ndarray:
+        drawn = np.rint(draw(rng, count)).astype(np.int64)
+        return np.clip(drawn, MIN_VERTICES, MAX_VERTICES)
+
+    return counts
+
+
+def rings(
+    rng: np.random.Generator,
+    centres: np.ndarray,
+    radii: np.ndarray,
+    counts: np.ndarray,
+    inner: float = 0.6,
+    hole: bool = False,
+) -> list[np.ndarray]:
+    """
+    Closed star shaped rings, all vertices drawn in one pass.
+    :param centres: (R, 2) (lon, lat) of each ring.
+    :param radii: (R,) outer radius, degrees of latitude.
+    :param counts: (R,) distinct vertices of each ring.
+    :param inner: Vertex radius is drawn from [inner, 1] * radius.
+    :param hole: Clockwise instead of counter clockwise.
+    """
+    total = int(counts.sum())
+    starts = np.cumsum(counts) - counts
+    ring_of = np.repeat(np.arange(len(counts)), counts)
+    position = np.arange(total) - starts[ring_of]
+    # Jitter below one step keeps angles strictly increasing
+    angles = (
+        2 * np.pi * (position + rng.uniform(0, 0.9, total)) / counts[ring_of]
+    )
+    if hole:
+        angles = -angles
+    distance = radii[ring_of] * rng.uniform(inner, 1.0, total)
+    latitude = centres[ring_of, 1] + distance * np.sin(angles)
+    # Degrees of longitude shrink towards poles, keep shapes round
+    longitude = centres[ring_of, 0] + distance * np.cos(angles) / np.cos(
+        np.radians(centres[ring_of, 1])
+    )
+    points = np.round(np.column_stack((longitude, latitude)), _DECIMALS)
+    # Closing vertex repeats first one of each ring
+    closed = np.insert(points, starts[1:], points[starts[:-1]], axis=0)
+    closed = np.vstack((closed, points[starts[-1]]))
+    ends = starts + counts + np.arange(1, len(counts) + 1)
+    return np.split(closed, ends[:-1])
+
+
+def generate_chunk(
+    rng: np.random.Generator,
+    first: int,
+    count: int,
+    vertices: typing.Callable,
+    holes: float = 0.0,
+    multi: float = 0.0,
+    name_prefix: str = NAME_PREFIX,
+) -> list[SyntheticProject]:
+    """Projects numbered from `first`, geometry generated vectorised."""
+    counts = vertices(rng, count)
+    centres = np.column_stack(
+        (rng.uniform(-170, 170, count), rng.uniform(-60, 60, count))
+    )
+    radii = np.exp(rng.uniform(np.log(0.005), np.log(1.0), count))
+    exteriors = rings(rng, centres, radii, counts)
+
+    has_hole = np.flatnonzero(rng.random(count) < holes)
+    hole_rings = (
+        rings(
+            rng,
+            centres[has_hole],
+            # Exterior never comes closer than 0.6 radius, hole stays inside
+            radii[has_hole] * 0.4,
+            np.maximum(counts[has_hole] // 4, MIN_VERTICES),
+            hole=True,
+        )
+        if len(has_hole)
+        else []
+    )
+    has_second = np.flatnonzero(rng.random(count) < multi)
+    second_rings = (
+        rings(
+            rng,
+            # East of first polygon, disjoint as both fit in their radius
+            centres[has_second]
+            + np.column_stack(
+                (
+                    3
+                    * radii[has_second]
+                    / np.cos(np.radians(centres[has_second, 1])),
+                    np.zeros(len(has_second)),
+                )
+            ),
+            radii[has_second],
+            counts[has_second],
+        )
+        if len(has_second)
+        else []
+    )
+
+    polygons = [[[exterior]] for exterior in exteriors]
+    for index, ring in zip(has_hole.tolist(), hole_rings):
+        polygons[index][0].append(ring)
+    for index, ring in zip(has_second.tolist(), second_rings):
+        polygons[index].append([ring])
+
+    starts = rng.integers(0, DAYS, count)
+    durations = np.minimum(rng.exponential(365, count).astype(int) + 1, DAYS)
+    ends = np.minimum(starts + durations, DAYS)
+    return [
+        SyntheticProject(
+            name=f"{name_prefix}{first + index}",
+            description=f"Synthetic project {first + index}",
+            start_date=EPOCH + timedelta(days=start),
+            end_date=EPOCH + timedelta(days=end),
+            polygons=polygons[index],
+        )
+        for index, (start, end) in enumerate(
+            zip(starts.tolist(), ends.tolist())
+        )
+    ]
+
+
+def generate(
+    count: int,
+    seed: int = 0,
+    vertices: str = DEFAULT_VERTICES,
+    holes: float = 0.0,
+    multi: float = 0.0,
+    name_prefix: str = NAME_PREFIX,
+) -> typing.Iterator[list[SyntheticProject]]:
+    """Yields chunks of up to `CHUNK_SIZE` projects, reproducibly."""
+    distribution = parse_vertices(vertices)
+    for chunk_no, first in enumerate(range(0, count, CHUNK_SIZE)):
+        yield generate_chunk(
+            np.random.default_rng([seed, chunk_no]),
+            first,
+            min(CHUNK_SIZE, count - first),
+            distribution,
+            holes=holes,
+            multi=multi,
+            name_prefix=name_prefix,
+        )
+
+
+def to_feature(project: SyntheticProject) -> dict:
+    """RFC 7946 MultiPolygon Feature, as `tools.importer` reads it."""
+    return {
+        "type": "Feature",
+        "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [
+                [ring.tolist() for ring in polygon]
+                for polygon in project.polygons
+            ],
+        },
+        "properties": {
+            "name": project.name,
+            "description": project.description,
+            "start_date": project.start_date.isoformat(),
+            "end_date": project.end_date.isoformat(),
+        },
+    }
+
+
+def to_record(project: SyntheticProject) -> importer.ImportRecord:
+    """Stored shape, (lat, lon) exterior of first polygon."""
+    return importer.ImportRecord(
+        name=project.name,
+        description=project.description,
+        start_date=project.start_date,
+        end_date=project.end_date,
+        geojson_type="Feature",
+        geometry_type="MultiPolygon",
+        points=project.polygons[0][0][:, ::-1],
+    )
+
+
+def write_ndjson(
+    path: str,
+    chunks: typing.Iterable[list[SyntheticProject]],
+) -> typing.Iterator[list[SyntheticProject]]:
+    with open(path, "w", encoding="utf-8") as file:
+        for chunk in chunks:
+            file.writelines(
+                json.dumps(to_feature(project), separators=(",", ":")) + "\n"
+                for project in chunk
+            )
+            yield chunk
+
+
+def load(
+    chunks: typing.Iterable[list[SyntheticProject]],
+) -> typing.Iterator[list[SyntheticProject]]:
+    """`COPY` every chunk in its own transaction, see `importer`."""
+    importer._connect()
+    try:
+        for chunk in chunks:
+            importer.load_records(
+                importer._connection, [to_record(p) for p in chunk]
+            )
+            yield chunk
+    finally:
+        importer._connection.close()
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.tools.generator",
+        description="Generate reproducible synthetic projects.",
+    )
+    parser.add_argument("count", type=int)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="NDJSON file to write.")
+    target.add_argument(
+        "--db", action="store_true", help="COPY into configured database."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--vertices",
+        default=DEFAULT_VERTICES,
+        help="fixed:N, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA "
+        "or choice:A,B,C.",
+    )
+    parser.add_argument(
+        "--holes", type=float, default=0.0, help="Share with a hole."
+    )
+    parser.add_argument(
+        "--multi", type=float, default=0.0, help="Share with 2 polygons."
+    )
+    parser.add_argument("--name-prefix", default=NAME_PREFIX)
+    args = parser.parse_args(argv)
+    try:
+        parse_vertices(args.vertices)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    chunks = generate(
+        args.count,
+        seed=args.seed,
+        vertices=args.vertices,
+        holes=args.holes,
+        multi=args.multi,
+        name_prefix=args.name_prefix,
+    )
+    chunks = write_ndjson(args.out, chunks) if args.out else load(chunks)
+    start = time.perf_counter()
+    projects = vertices = 0
+    for chunk in chunks:
+        projects += len(chunk)
+        vertices += sum(len(p.polygons[0][0]) for p in chunk)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    logger.info(
+        f"projects={projects} exterior_vertices={vertices} "
+        f"elapsed_s={elapsed:.1f} vertices_per_s={vertices / elapsed:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""Entry point of `python -m backend.tools.import`, see `importer`.
+`import` is keyword, so implementation lives in importable module."""
+
+import sys
+
+from backend.tools.importer import main
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,664 @@
+"""
+Offline bulk import of project archives, bypassing HTTP API.
+Input is GeoJSON FeatureCollection or NDJSON, parsed as a stream so
+    files of any size run in constant memory.
+Records are validated with the same rules as `POST /project`,
+    then loaded by `COPY` in batches, each batch in its own transaction,
+    spread over worker processes.
+Completed batches are written to a checkpoint file, rerun with same
+    checkpoint and batch size skips them.
+
+Usage: python -m backend.tools.import FILE [FILE ...]
+    [--workers N] [--batch-size N] [--checkpoint PATH]
+    [--format auto|ndjson|geojson]
+"""
+
+import argparse
+import concurrent.futures
+import io
+import json
+import os
+import struct
+import time
+import typing
+from datetime import datetime, timezone
+
+import numpy as np
+import pydantic
+from fastapi import HTTPException
+from loguru import logger
+
+from backend.api.routers.project import validators
+from backend.api.routers.project.models import request_models
+from backend.core import geometry
+from backend.database.postgres import config, project_models
+
+BATCH_SIZE: int = 1_000
+READ_SIZE: int = 1 << 20  # 1 MiB
+REPORT_EVERY: float = 5.0  # seconds
+DESCRIPTION_MAX_LENGTH: int = 100  # Same as `description` query param
+NDJSON_SUFFIXES: tuple[str, ...] = (".ndjson", ".jsonl")
+FORMATS = typing.Literal["auto", "ndjson", "geojson"]
+
+PROJECT_COLUMNS: tuple[str, ...] = (
+    "project_id",
+    "name",
+    "start_date",
+    "end_date",
+    "description",
+    "min_latitude",
+    "min_longitude",
+    "max_latitude",
+    "max_longitude",
+    "area",
+    "perimeter",
+    "centroid_latitude",
+    "centroid_longitude",
+    "vertex_count",
+)
+# PGCOPY binary layout of (latitude, longitude, geometry_id) tuple
+_COORDINATE_ROW = np.dtype(
+    [
+        ("fields", ">i2"),
+        ("latitude_size", ">i4"),
+        ("latitude", ">f8"),
+        ("longitude_size", ">i4"),
+        ("longitude", ">f8"),
+        ("geometry_id_size", ">i4"),
+        ("geometry_id", ">i4"),
+    ]
+)
+_COPY_HEADER: bytes = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER: bytes = struct.pack(">h", -1)
+_DATE_RANGE = pydantic.TypeAdapter(tuple[datetime, datetime])
+_WHITESPACE: str = " \t\n\r"
+
+# Set per worker process by `_connect`
+_connection = None
+
+
+class ImportRecord(typing.NamedTuple):
+    """Validated project, coordinates as (N, 2) (lat, lon) array."""
+
+    name: str
+    description: typing.Optional[str]
+    start_date: datetime
+    end_date: datetime
+    geojson_type: str
+    geometry_type: str
+    points: np.ndarray
+
+
+class BatchResult(typing.NamedTuple):
+    path: str
+    batch_no: int
+    imported: int
+    coordinates: int
+    rejected: list[tuple[int, str]]
+
+
+# --- Streaming parsers ---#
+
+
+class _StreamDecoder:
+    """raw_decode over a growing text buffer, refilled on demand."""
+
+    def __init__(self, stream: typing.TextIO) -> None:
+        self.stream = stream
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _refill(self, size: int = READ_SIZE) -> bool:
+        if self.eof:
+            return False
+        data = self.stream.read(size)
+        if not data:
+            self.eof = True
+            return False
+        # Drop consumed prefix, so buffer holds roughly one value
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, empty string at end."""
+        while True:
+            while (
+                self.pos < len(self.buffer)
+                and self.buffer[self.pos] in _WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._refill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r}, found {found!r}")
+        self.pos += 1
+
+    def decode(self) -> typing.Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Value continues past buffer, grow it geometrically
+                #   so huge geometries are not re-parsed quadratically
+                if not self._refill(max(READ_SIZE, len(self.buffer))):
+                    raise
+                continue
+            # Number at very end of buffer may be cut, e.g. `12|3`
+            if end == len(self.buffer) and self._refill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_feature_collection(
+    stream: typing.TextIO,
+) -> typing.Iterator[dict]:
+    """Yields features of FeatureCollection one at a time.
+    Other top-level members (type, crs, bbox, ...) are skipped."""
+    reader = _StreamDecoder(stream)
+    reader.expect("{")
+    while reader.peek() != "}":
+        key = reader.decode()
+        reader.expect(":")
+        if key != "features":
+            reader.decode()
+        else:
+            reader.expect("[")
+            while reader.peek() != "]":
+                yield reader.decode()
+                if reader.peek() == ",":
+                    reader.expect(",")
+            reader.expect("]")
+        if reader.peek() == ",":
+            reader.expect(",")
+    reader.expect("}")
+
+
+def iter_ndjson(stream: typing.TextIO) -> typing.Iterator[dict]:
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_raw_records(
+    path: str,
+    file_format: FORMATS = "auto",
+) -> typing.Iterator[dict]:
+    if file_format == "auto":
+        file_format = "ndjson" if path.endswith(NDJSON_SUFFIXES) else "geojson"
+    with open(path, encoding="utf-8") as stream:
+        if file_format == "ndjson":
+            yield from iter_ndjson(stream)
+        else:
+            yield from iter_feature_collection(stream)
+
+
+# --- Validation ---#
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Dates are stored naive, aware input is stored in UTC
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _from_rfc7946(geometry_type: str, coordinates: list) -> list:
+    """RFC 7946 geometry ([lon, lat] positions) in request nesting
+    and [lat, lon] order, every polygon and ring kept."""
+    if geometry_type == "Polygon":
+        coordinates = [coordinates]
+    return [
+        [[[lat, lon] for lon, lat, *_ in ring] for ring in polygon]
+        for polygon in coordinates
+    ]
+
+
+def _check_single_ring(coordinates: list) -> None:
+    """Project stores one ring, holes and further polygons would be
+    dropped without a trace, so such records are rejected instead."""
+    if len(coordinates) > 1:
+        raise ValueError(
+            f"{len(coordinates)} polygons, only single ring is supported"
+        )
+    if coordinates and len(coordinates[0]) > 1:
+        raise ValueError(
+            f"Polygon with {len(coordinates[0]) - 1} holes,"
+            " only single ring is supported"
+        )
+
+
+def to_record(raw: dict) -> ImportRecord:
+    """
+    Validates one input record with `POST /project` rules.
+    Accepts GeoJSON Feature (name, description, date_range or
+        start_date/end_date in properties, RFC 7946 positions)
+        or API shaped record, incl. both `GET /projects/export` formats.
+    :raises ValueError: When record is invalid.
+    """
+    if raw.get("type") == "Feature":
+        properties = raw.get("properties") or {}
+        geometry = raw["geometry"]
+        geojson = {
+            "type": raw["type"],
+            "geometry": {
+                "type": geometry["type"],
+                "coordinates": _from_rfc7946(
+                    geometry["type"], geometry["coordinates"]
+                ),
+            },
+        }
+    else:
+        properties = raw
+        geojson = raw["geojson"]
+    date_range = properties.get("date_range") or (
+        properties.get("start_date"),
+        properties.get("end_date"),
+    )
+    description = properties.get("description")
+    project = request_models.ProjectRequest(
+        name=properties.get("name"),
+        description=description,
+    )
+    if description is not None and len(description) > DESCRIPTION_MAX_LENGTH:
+        raise ValueError(
+            f"Description longer than {DESCRIPTION_MAX_LENGTH} characters"
+        )
+    start_date, end_date = (
+        _naive_utc(date) for date in _DATE_RANGE.validate_python(date_range)
+    )
+    try:
+        validators.name_validator(project.name)
+        validators.date_validator((start_date, end_date))
+    except HTTPException as exc:
+        raise ValueError(exc.detail) from exc
+    coordinates = geojson["geometry"]["coordinates"]
+    if coordinates and isinstance(coordinates[0], dict):
+        # Flattened objects, as returned by API, back to request nesting
+        coordinates = [
+            [[[c["latitude"], c["longitude"]] for c in coordinates]]
+        ]
+    _check_single_ring(coordinates)
+    flattened = request_models.GeoJson(
+        type=geojson["type"],
+        geometry={
+            "type": geojson["geometry"]["type"],
+            "coordinates": coordinates,
+        },
+    ).model_flatten()
+    return ImportRecord(
+        name=project.name,
+        description=project.description,
+        start_date=start_date,
+        end_date=end_date,
+        geojson_type=flattened["type"],
+        geometry_type=flattened["geometry"]["type"],
+        points=np.array(
+            [
+                (c["latitude"], c["longitude"])
+                for c in flattened["geometry"]["coordinates"]
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2),
+    )
+
+
+# --- COPY encoding ---#
+
+
+def _copy_text(value: typing.Any) -> str:
+    """Value in COPY text format, NULL as \\N."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, float):
+        return repr(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_text_rows(rows: typing.Iterable[typing.Sequence]) -> io.StringIO:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_text(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_binary_coordinates(
+    points: np.ndarray,
+    geometry_ids: np.ndarray,
+) -> io.BytesIO:
+    """
+    PGCOPY binary stream of (latitude, longitude, geometry_id) rows.
+    Built as one numpy structured array, no per-coordinate python code.
+    """
+    rows = np.empty(len(points), dtype=_COORDINATE_ROW)
+    rows["fields"] = 3
+    rows["latitude_size"] = 8
+    rows["latitude"] = points[:, 0]
+    rows["longitude_size"] = 8
+    rows["longitude"] = points[:, 1]
+    rows["geometry_id_size"] = 4
+    rows["geometry_id"] = geometry_ids
+    return io.BytesIO(_COPY_HEADER + rows.tobytes() + _COPY_TRAILER)
+
+
+# --- Loading ---#
+
+
+def _connect() -> None:
+    """Worker initializer, one connection per process."""
+    import psycopg2
+
+    global _connection
+    _connection = psycopg2.connect(
+        host=config.POSTGRES_HOSTNAME,
+        port=config.POSTGRES_PORT,
+        user=config.POSTGRES_USER,
+        password=config.POSTGRES_PASSWORD,
+        dbname=config.POSTGRES_DB,
+    )
+
+
+def _reserve_ids(cursor, table: str, column: str, count: int) -> list[int]:
+    """Takes ids from serial sequence, so API inserts never collide."""
+    cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+        "FROM generate_series(1, %s)",
+        (table, column, count),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def load_records(connection, records: list[ImportRecord]) -> int:
+    """
+    Loads validated records in one transaction, 4 COPY statements total.
+    Coordinate ids come from column default, in COPY order,
+        so vertex order is kept.
+    :return: Number of coordinates loaded.
+    """
+    with connection, connection.cursor() as cursor:
+        # Change floor, see `core._lock_changes`; `change_seq` and
+        #   `updated_at` come from column defaults
+        cursor.execute(project_models.LOCK_CHANGE_FLOOR)
+        count = len(records)
+        project_ids = _reserve_ids(cursor, "project", "project_id", count)
+        geojson_ids = _reserve_ids(cursor, "geojson", "geojson_id", count)
+        geometry_ids = _reserve_ids(cursor, "geometry", "geometry_id", count)
+        projects = []
+        for project_id, record in zip(project_ids, records, strict=True):
+            metrics = geometry.metrics(record.points)
+            projects.append(
+                (
+                    project_id,
+                    record.name,
+                    record.start_date,
+                    record.end_date,
+                    record.description,
+                    *geometry.bounds(record.points),
+                    metrics.area,
+                    metrics.perimeter,
+                    metrics.centroid_latitude,
+                    metrics.centroid_longitude,
+                    metrics.vertex_count,
+                )
+            )
+        cursor.copy_expert(
+            f"COPY project ({', '.join(PROJECT_COLUMNS)}) FROM STDIN",
+            copy_text_rows(projects),
+        )
+        cursor.copy_expert(
+            "COPY geojson (geojson_id, type, project_id) FROM STDIN",
+            copy_text_rows(
+                zip(
+                    geojson_ids,
+                    (record.geojson_type for record in records),
+                    project_ids,
+                )
+            ),
+        )
+        cursor.copy_expert(
+            "COPY geometry (geometry_id, type, geojson_id) FROM STDIN",
+            copy_text_rows(
+                zip(
+                    geometry_ids,
+                    (record.geometry_type for record in records),
+                    geojson_ids,
+                )
+            ),
+        )
+        lengths = [len(record.points) for record in records]
+        points = (
+            np.concatenate([record.points for record in records])
+            if records
+            else geometry.EMPTY_POINTS
+        )
+        cursor.copy_expert(
+            "COPY coordinate (latitude, longitude, geometry_id) "
+            "FROM STDIN WITH (FORMAT binary)",
+            copy_binary_coordinates(points, np.repeat(geometry_ids, lengths)),
+        )
+    return len(points)
+
+
+def load_batch(path: str, batch_no: int, raws: list[dict]) -> BatchResult:
+    """Worker entry point, validates and loads one batch."""
+    records, rejected = [], []
+    for index, raw in enumerate(raws):
+        try:
+            records.append(to_record(raw))
+        except (ValueError, KeyError, TypeError, IndexError) as exc:
+            # pydantic.ValidationError is a ValueError
+            rejected.append((index, " ".join(str(exc).split())))
+    coordinates = load_records(_connection, records) if records else 0
+    return BatchResult(path, batch_no, len(records), coordinates, rejected)
+
+
+# --- Checkpoints ---#
+
+
+class Checkpoint:
+    """Completed batch numbers per input file, saved atomically."""
+
+    def __init__(self, path: typing.Optional[str], batch_size: int) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.done: dict[str, set[int]] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                state = json.load(file)
+            if state["batch_size"] != batch_size:
+                raise ValueError(
+                    f"Checkpoint {path} was written with batch size "
+                    f"{state['batch_size']}, not {batch_size}"
+                )
+            self.done = {
+                file_path: set(batches)
+                for file_path, batches in state["done"].items()
+            }
+
+    def is_done(self, path: str, batch_no: int) -> bool:
+        return batch_no in self.done.get(path, ())
+
+    def mark(self, path: str, batch_no: int) -> None:
+        self.done.setdefault(path, set()).add(batch_no)
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "batch_size": self.batch_size,
+                    "done": {
+                        file_path: sorted(batches)
+                        for file_path, batches in self.done.items()
+                    },
+                },
+                file,
+            )
+        os.replace(temporary, self.path)
+
+
+# --- Driver ---#
+
+
+def _batches(
+    records: typing.Iterable[dict],
+    size: int,
+) -> typing.Iterator[tuple[int, list[dict]]]:
+    batch: list[dict] = []
+    batch_no = 0
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch_no, batch
+            batch, batch_no = [], batch_no + 1
+    if batch:
+        yield batch_no, batch
+
+
+class _Progress:
+    def __init__(self, batch_size: int) -> None:
+        self.batch_size = batch_size
+        self.start = self.reported = time.perf_counter()
+        self.imported = self.coordinates = self.rejected = 0
+
+    def add(self, result: BatchResult) -> None:
+        self.imported += result.imported
+        self.coordinates += result.coordinates
+        self.rejected += len(result.rejected)
+        for index, reason in result.rejected:
+            logger.opt(lazy=True).warning(
+                "{x}",
+                x=lambda: f"Rejected {result.path} record "
+                f"{result.batch_no * self.batch_size + index}: {reason}",
+            )
+        if time.perf_counter() - self.reported >= REPORT_EVERY:
+            self.report()
+
+    def report(self) -> dict:
+        self.reported = time.perf_counter()
+        elapsed = max(self.reported - self.start, 1e-9)
+        stats = {
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "coordinates": self.coordinates,
+            "projects_per_s": self.imported / elapsed,
+            "coordinates_per_s": self.coordinates / elapsed,
+            "elapsed_s": elapsed,
+        }
+        logger.info(
+            " ".join(
+                f"{key}={value:.1f}"
+                if isinstance(value, float)
+                else f"{key}={value}"
+                for key, value in stats.items()
+            )
+        )
+        return stats
+
+
+def run(
+    paths: list[str],
+    workers: int = os.cpu_count() or 1,
+    batch_size: int = BATCH_SIZE,
+    checkpoint_path: typing.Optional[str] = None,
+    file_format: FORMATS = "auto",
+) -> dict:
+    """Imports files, returns final throughput stats."""
+    checkpoint = Checkpoint(checkpoint_path, batch_size)
+    progress = _Progress(batch_size)
+    # Bounded in-flight batches keep parser from running ahead of workers
+    max_pending = workers * 2
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_connect,
+    ) as pool:
+        pending: set[concurrent.futures.Future] = set()
+
+        def drain(return_when: str) -> None:
+            """
+            Checkpoints every finished batch that succeeded, then raises
+                first failure. Committed batches must be recorded even
+                when another one failed, resume would import them again.
+            """
+            nonlocal pending
+            done, pending = concurrent.futures.wait(
+                pending, return_when=return_when
+            )
+            failure = None
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    failure = failure or error
+                    continue
+                result = future.result()
+                checkpoint.mark(result.path, result.batch_no)
+                progress.add(result)
+            if failure is not None:
+                raise failure
+
+        try:
+            for path in paths:
+                path = os.path.abspath(path)
+                records = iter_raw_records(path, file_format)
+                for batch_no, batch in _batches(records, batch_size):
+                    if checkpoint.is_done(path, batch_no):
+                        continue
+                    if len(pending) >= max_pending:
+                        drain(concurrent.futures.FIRST_COMPLETED)
+                    pending.add(pool.submit(load_batch, path, batch_no, batch))
+            drain(concurrent.futures.ALL_COMPLETED)
+        except BaseException:
+            # Batches still in flight commit anyway, record them first
+            try:
+                drain(concurrent.futures.ALL_COMPLETED)
+            except Exception as exc:
+                logger.error(f"Batch failed while stopping import: {exc}")
+            raise
+    return progress.report()
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.tools.import",
+        description="Bulk import GeoJSON FeatureCollection or NDJSON files.",
+    )
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--checkpoint",
+        help="File recording completed batches, enables resuming.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=typing.get_args(FORMATS),
+        default="auto",
+        help="auto: .ndjson/.jsonl are NDJSON, anything else GeoJSON.",
+    )
+    args = parser.parse_args(argv)
+    run(
+        args.files,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint,
+        file_format=args.format,
+    )
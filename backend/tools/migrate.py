@@ -0,0 +1,8 @@
+"""Entry point of `python -m backend.tools.migrate`, see `migrations`."""
+
+import sys
+
+from backend.database.postgres.migrations import main
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from backend.tools import generator, importer
+
+
+def _signed_area(ring: np.ndarray) -> float:
+    """Shoelace over closed (lon, lat) ring, positive when CCW."""
+    x, y = ring[:, 0], ring[:, 1]
+    return float(np.sum(x[:-1] * y[1:] - x[1:] * y[:-1]) / 2)
+
+
+def _projects(count: int, **kwargs) -> list[generator.SyntheticProject]:
+    return [p for chunk in generator.generate(count, **kwargs) for p in chunk]
+
+
+def test_generate_is_reproducible(monkeypatch):
+    # Several chunks, so per-chunk seeding is covered too
+    monkeypatch.setattr(generator, "CHUNK_SIZE", 7)
+    first = _projects(20, seed=3, holes=0.5, multi=0.5)
+    second = _projects(20, seed=3, holes=0.5, multi=0.5)
+    other = _projects(20, seed=4, holes=0.5, multi=0.5)
+    assert [generator.to_feature(p) for p in first] == [
+        generator.to_feature(p) for p in second
+    ]
+    assert generator.to_feature(first[0]) != generator.to_feature(other[0])
+    assert [p.name for p in first] == [f"synthetic-{i}" for i in range(20)]
+
+
+def test_rings_closed_and_oriented():
+    projects = _projects(50, seed=1, holes=1.0, multi=1.0)
+    for project in projects:
+        assert len(project.polygons) == 2
+        exterior, hole = project.polygons[0]
+        for ring in (exterior, hole, project.polygons[1][0]):
+            np.testing.assert_array_equal(ring[0], ring[-1])
+        assert _signed_area(exterior) > 0
+        assert _signed_area(hole) < 0
+        assert project.start_date < project.end_date
+
+
+@pytest.mark.parametrize(
+    "spec, low, high",
+    [
+        ("fixed:12", 12, 12),
+        ("uniform:5,9", 5, 9),
+        ("choice:3,100", 3, 100),
+        ("lognormal:1,0.1", 3, 3),  # Clipped to valid ring
+    ],
+)
+def test_vertex_distribution(spec, low, high):
+    projects = _projects(200, seed=2, vertices=spec)
+    counts = np.array([len(p.polygons[0][0]) - 1 for p in projects])
+    assert counts.min() == low
+    assert counts.max() == high
+
+
+@pytest.mark.parametrize("spec", ["", "fixed", "uniform:1", "normal:1,2"])
+def test_parse_vertices_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        generator.parse_vertices(spec)
+
+
+def test_ndjson_round_trips_through_importer(tmp_path):
+    path = str(tmp_path / "projects.ndjson")
+    chunks = generator.write_ndjson(path, generator.generate(10, seed=5))
+    projects = [p for chunk in chunks for p in chunk]
+    with open(path, encoding="utf-8") as file:
+        records = [
+            importer.to_record(raw) for raw in importer.iter_ndjson(file)
+        ]
+    for project, record in zip(projects, records, strict=True):
+        expected = generator.to_record(project)
+        assert record.name == expected.name
+        assert record.end_date == expected.end_date
+        np.testing.assert_array_equal(record.points, expected.points)
+
+
+@pytest.mark.parametrize("shape", [{"holes": 1.0}, {"multi": 1.0}])
+def test_ndjson_extra_rings_are_rejected_by_importer(tmp_path, shape):
+    path = str(tmp_path / "projects.ndjson")
+    # Writes as it's consumed
+    list(generator.write_ndjson(path, generator.generate(3, seed=5, **shape)))
+    with open(path, encoding="utf-8") as file:
+        for raw in importer.iter_ndjson(file):
+            with pytest.raises(ValueError, match="only single ring"):
+                importer.to_record(raw)
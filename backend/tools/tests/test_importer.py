@@ -0,0 +1,207 @@
+import concurrent.futures
+import io
+import json
+import struct
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from backend.tools import importer
+
+RING = [[-52.8, -5.6], [-52.9, -5.7], [-52.7, -5.7], [-52.8, -5.6]]
+FEATURE = {
+    "type": "Feature",
+    "geometry": {"type": "MultiPolygon", "coordinates": [[RING]]},
+    "properties": {
+        "name": "Archive",
+        "description": None,
+        "start_date": "2023-01-01T00:00:00",
+        "end_date": "2023-06-01T00:00:00",
+    },
+}
+API_RECORD = {
+    "project_id": 7,
+    "name": "Exported",
+    "description": "desc",
+    "date_range": ["2023-01-01T00:00:00+02:00", "2023-06-01T00:00:00"],
+    "geojson": {
+        "type": "Feature",
+        "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [
+                {"latitude": -5.6, "longitude": -52.8},
+                {"latitude": -5.7, "longitude": -52.9},
+            ],
+        },
+    },
+}
+
+
+def test_iter_feature_collection_streams_features(monkeypatch):
+    # Tiny reads force values to span many refills
+    monkeypatch.setattr(importer, "READ_SIZE", 7)
+    document = json.dumps(
+        {
+            "type": "FeatureCollection",
+            "features": [FEATURE, FEATURE, {**FEATURE, "id": 12345}],
+            "bbox": [1.5, 2, 3, 4],
+        },
+        indent=2,
+    )
+    features = list(importer.iter_feature_collection(io.StringIO(document)))
+    assert features == [FEATURE, FEATURE, {**FEATURE, "id": 12345}]
+
+
+def test_iter_feature_collection_empty():
+    document = '{"features": [], "type": "FeatureCollection"}'
+    assert list(importer.iter_feature_collection(io.StringIO(document))) == []
+
+
+def test_iter_ndjson_skips_blank_lines():
+    stream = io.StringIO(json.dumps(API_RECORD) + "\n\n" + json.dumps(FEATURE))
+    assert list(importer.iter_ndjson(stream)) == [API_RECORD, FEATURE]
+
+
+def test_to_record_feature_is_lon_lat():
+    record = importer.to_record(FEATURE)
+    assert record.name == "Archive"
+    assert record.geometry_type == "MultiPolygon"
+    np.testing.assert_array_equal(record.points, np.array(RING)[:, ::-1])
+
+
+HOLE = [[-52.8, -5.65], [-52.81, -5.66], [-52.79, -5.66], [-52.8, -5.65]]
+
+
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        {"type": "Polygon", "coordinates": [RING, HOLE]},
+        {"type": "MultiPolygon", "coordinates": [[RING, HOLE]]},
+        {"type": "MultiPolygon", "coordinates": [[RING], [RING]]},
+    ],
+)
+def test_to_record_rejects_multiple_rings(geometry):
+    with pytest.raises(ValueError, match="only single ring"):
+        importer.to_record({**FEATURE, "geometry": geometry})
+
+
+def test_to_record_polygon_single_ring():
+    feature = {
+        **FEATURE,
+        "geometry": {"type": "Polygon", "coordinates": [RING]},
+    }
+    record = importer.to_record(feature)
+    np.testing.assert_array_equal(record.points, np.array(RING)[:, ::-1])
+
+
+def test_to_record_api_shape_normalises_dates():
+    record = importer.to_record(API_RECORD)
+    assert record.start_date == datetime(2022, 12, 31, 22)
+    assert record.start_date.tzinfo is None
+    np.testing.assert_array_equal(
+        record.points, [(-5.6, -52.8), (-5.7, -52.9)]
+    )
+
+
+@pytest.mark.parametrize(
+    "properties",
+    [
+        {"name": " "},
+        {"name": "x" * 33},
+        {"description": "x" * 101},
+        {"start_date": "2023-07-01T00:00:00"},
+        {"end_date": "2999-01-01T00:00:00"},
+        {"start_date": None},
+    ],
+)
+def test_to_record_rejects_invalid(properties):
+    feature = {
+        **FEATURE,
+        "properties": {**FEATURE["properties"], **properties},
+    }
+    with pytest.raises(ValueError):
+        importer.to_record(feature)
+
+
+def test_copy_text_rows_escapes():
+    rows = [(1, "a\tb\\c\nd", None, datetime(2023, 1, 1), 0.1)]
+    assert importer.copy_text_rows(rows).read() == (
+        "1\ta\\tb\\\\c\\nd\t\\N\t2023-01-01 00:00:00\t0.1\n"
+    )
+
+
+def test_copy_binary_coordinates_layout():
+    points = np.array([(-5.6, -52.8), (-5.7, -52.9)])
+    data = importer.copy_binary_coordinates(points, np.array([3, 4])).read()
+    assert data.startswith(b"PGCOPY\n\xff\r\n\x00")
+    assert data.endswith(struct.pack(">h", -1))
+    row = struct.unpack_from(">hidid ii", data, 19)
+    assert row == (3, 8, -5.6, 8, -52.8, 4, 3)
+    assert len(data) == 19 + 2 * 34 + 2
+
+
+def test_checkpoint_resume(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = importer.Checkpoint(path, batch_size=10)
+    checkpoint.mark("/data/a.ndjson", 0)
+    checkpoint.mark("/data/a.ndjson", 2)
+    resumed = importer.Checkpoint(path, batch_size=10)
+    assert resumed.is_done("/data/a.ndjson", 2)
+    assert not resumed.is_done("/data/a.ndjson", 1)
+    with pytest.raises(ValueError):
+        importer.Checkpoint(path, batch_size=20)
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """`run` without database, batches load in threads."""
+    monkeypatch.setattr(
+        importer.concurrent.futures,
+        "ProcessPoolExecutor",
+        concurrent.futures.ThreadPoolExecutor,
+    )
+    monkeypatch.setattr(importer, "_connect", lambda: None)
+
+    def load_batch(path, batch_no, raws):
+        if batch_no == 1:
+            raise RuntimeError("batch failed")
+        time.sleep(0.05)  # Still in flight when batch 1 fails
+        return importer.BatchResult(path, batch_no, len(raws), 0, [])
+
+    monkeypatch.setattr(importer, "load_batch", load_batch)
+
+
+def _ndjson(tmp_path, lines: list[str]) -> str:
+    path = tmp_path / "projects.ndjson"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def _done(checkpoint: str, path: str) -> list[int]:
+    with open(checkpoint) as file:
+        return json.load(file)["done"].get(path, [])
+
+
+def test_failed_batch_checkpoints_committed_ones(tmp_path, thread_pool):
+    path = _ndjson(tmp_path, [json.dumps(FEATURE)] * 6)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with pytest.raises(RuntimeError):
+        importer.run(
+            [path], workers=2, batch_size=1, checkpoint_path=checkpoint
+        )
+    # Batches in flight when 1 failed are recorded, not imported twice
+    assert _done(checkpoint, path) == [0, 2, 3]
+
+
+def test_parser_failure_checkpoints_in_flight(tmp_path, thread_pool):
+    lines = [json.dumps(FEATURE)] * 6
+    lines[3] = "{broken"
+    path = _ndjson(tmp_path, lines)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with pytest.raises(ValueError):
+        importer.run(
+            [path], workers=2, batch_size=1, checkpoint_path=checkpoint
+        )
+    assert _done(checkpoint, path) == [0, 2]
@@ -0,0 +1,74 @@
+import typing
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.database.postgres import migrations
+
+
+def _create(name: str) -> typing.Callable:
+    def apply(connection) -> None:
+        connection.execute(text(f"CREATE TABLE {name} (id INTEGER)"))
+
+    return apply
+
+
+def _failing(connection) -> None:
+    # DML, sqlite commits DDL on its own unlike Postgres
+    connection.execute(text("INSERT INTO first VALUES (1)"))
+    raise RuntimeError("migration failed")
+
+
+FIRST = migrations.Migration(1, "first", _create("first"))
+SECOND = migrations.Migration(2, "second", _create("second"))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # File, not memory, so every connection sees same database
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _versions(engine) -> list[int]:
+    with engine.connect() as connection:
+        return list(
+            connection.scalars(
+                text("SELECT version FROM schema_version ORDER BY version")
+            )
+        )
+
+
+def test_upgrade_applies_pending_once(engine):
+    assert migrations.upgrade(engine, [FIRST]) == [FIRST]
+    assert migrations.upgrade(engine, [FIRST, SECOND]) == [SECOND]
+    assert migrations.upgrade(engine, [FIRST, SECOND]) == []
+    assert _versions(engine) == [1, 2]
+
+
+def test_failed_migration_leaves_nothing(engine):
+    broken = migrations.Migration(2, "broken", _failing)
+    with pytest.raises(RuntimeError):
+        migrations.upgrade(engine, [FIRST, broken, SECOND])
+    assert _versions(engine) == [1]
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT count(*) FROM first")) == 0
+    # Retried on next run
+    assert migrations.upgrade(engine, [FIRST, SECOND]) == [SECOND]
+
+
+def test_pending_on_empty_database(engine):
+    with engine.connect() as connection:
+        assert migrations.pending(connection, [FIRST]) == [FIRST]
+        # Status doesn't create anything
+        assert not connection.dialect.has_table(connection, "schema_version")
+    migrations.upgrade(engine, [FIRST])
+    with engine.connect() as connection:
+        assert migrations.pending(connection, [FIRST, SECOND]) == [SECOND]
+
+
+def test_migrations_are_ordered():
+    versions = [m.version for m in migrations.MIGRATIONS]
+    assert versions == list(range(1, len(versions) + 1))
+    assert migrations.HEAD == versions[-1]
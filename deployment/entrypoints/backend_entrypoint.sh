@@ -5,6 +5,15 @@ set -e
 source $VIRTUAL_ENV/bin/activate
 cd /backend/api
 
+# Metrics of all workers are aggregated from files here,
+#   files of previous run would be counted again, so start empty
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Schema is migrated once here, workers only check its version,
+#   so they start without DDL or sync database driver
+python -m backend.tools.migrate upgrade
 
 #gunicorn app:app \
 #--workers 4 \
@@ -13,6 +22,7 @@ cd /backend/api
 
 
 gunicorn app:app \
+--config gunicorn_conf.py \
 --workers 5 \
 --worker-class uvicorn.workers.UvicornWorker \
 --bind 0.0.0.0:$APP_PORT --log-level 'debug'
@@ -1,15 +1,269 @@
+"""
+Weighted read/write/update/delete mix against known dataset.
+At test start master (or local runner) removes `locust-*` projects of
+    previous runs, seeds `--seed-projects` projects from fixed seed
+    and sends their ids to workers.
+Reads pick ids Zipf distributed, `--cache-bust` fraction of them skips
+    API cache, so both cached and database paths are measured.
+Deletes only remove projects the same user created, seeded set stays.
+Headless run exports CSV and exits 1 when `--max-p95`, `--min-rps`
+    or `--max-fail-ratio` is breached, see `make locust-headless`.
+"""
+
+import logging
 import random
+import time
+import typing
+
+import requests
+import workload
+from gevent.pool import Pool
+from locust import HttpUser, between, events, task
+from locust.runners import MasterRunner, WorkerRunner
+
+logger = logging.getLogger(__name__)
+
+SEEDED_IDS: list[int] = []
+ZIPF: typing.Optional[workload.Zipf] = None  # Set once ids are known
+SEED_CONCURRENCY: int = 8
+CLEANUP_ATTEMPTS: int = 5
+
+
+@events.init_command_line_parser.add_listener
+def add_arguments(parser) -> None:
+    workload_group = parser.add_argument_group("Workload")
+    workload_group.add_argument(
+        "--seed-projects",
+        type=int,
+        default=500,
+        env_var="LOCUST_SEED_PROJECTS",
+        help="Projects created before test, reads and updates target them",
+    )
+    workload_group.add_argument(
+        "--zipf-s",
+        type=float,
+        default=1.1,
+        env_var="LOCUST_ZIPF_S",
+        help="Skew of read ids, higher means fewer hot projects",
+    )
+    workload_group.add_argument(
+        "--cache-bust",
+        type=float,
+        default=0.5,
+        env_var="LOCUST_CACHE_BUST",
+        help="Fraction of reads sent with `Cache-Control: no-cache`",
+    )
+    thresholds = parser.add_argument_group("Thresholds")
+    thresholds.add_argument(
+        "--max-p95",
+        type=float,
+        default=None,
+        env_var="LOCUST_MAX_P95",
+        help="Fail run when p95 of all requests exceeds it, ms",
+    )
+    thresholds.add_argument(
+        "--min-rps",
+        type=float,
+        default=None,
+        env_var="LOCUST_MIN_RPS",
+        help="Fail run when average RPS falls below it",
+    )
+    thresholds.add_argument(
+        "--max-fail-ratio",
+        type=float,
+        default=0.01,
+        env_var="LOCUST_MAX_FAIL_RATIO",
+        help="Fail run when more requests fail",
+    )
+
+
+def _use_ids(environment, ids: list[int]) -> None:
+    global ZIPF
+    SEEDED_IDS[:] = ids
+    if not ids:
+        ZIPF = None
+        return
+    # Hot ids spread over dataset, not just first created
+    ranked = list(ids)
+    random.Random(0).shuffle(ranked)
+    ZIPF = workload.Zipf(ranked, s=environment.parsed_options.zipf_s)
+
+
+@events.init.add_listener
+def on_init(environment, **kwargs) -> None:
+    if isinstance(environment.runner, WorkerRunner):
+        environment.runner.register_message(
+            "seeded_ids",
+            lambda message, **_: _use_ids(environment, message.data),
+        )
+
+
+def _cleanup(session: requests.Session, host: str) -> None:
+    """Removes projects of previous runs, retries ones locked by
+    writes still in flight (`skipped`)."""
+    removed = 0
+    for _ in range(CLEANUP_ATTEMPTS):
+        response = session.delete(
+            f"{host}/projects", params={"name_prefix": workload.NAME_PREFIX}
+        )
+        response.raise_for_status()
+        result = response.json()
+        removed += len(result["project_ids"])
+        if not result["skipped"]:
+            break
+        time.sleep(1)
+    else:
+        raise RuntimeError(
+            f"{len(result['skipped'])} projects of previous runs stay locked"
+        )
+    logger.info("Removed %d projects of previous runs", removed)
+
+
+def _seed(host: str, count: int) -> list[int]:
+    session = requests.Session()
+    _cleanup(session, host)
+
+    def create(project: tuple[dict, dict]) -> int:
+        params, body = project
+        created = session.post(f"{host}/project/", params=params, json=body)
+        created.raise_for_status()
+        return created.json()["Project_id"]
+
+    pool = Pool(SEED_CONCURRENCY)
+    ids = list(pool.imap(create, workload.seed_projects(count)))
+    logger.info("Seeded %d projects", len(ids))
+    return ids
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs) -> None:
+    if isinstance(environment.runner, WorkerRunner):
+        return
+    options = environment.parsed_options
+    ids = _seed(environment.host, options.seed_projects)
+    _use_ids(environment, ids)
+    if isinstance(environment.runner, MasterRunner):
+        environment.runner.send_message("seeded_ids", ids)
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs) -> None:
+    if isinstance(environment.runner, WorkerRunner):
+        return
+    options = environment.parsed_options
+    total = environment.stats.total
+    breaches = workload.check_thresholds(
+        p95_ms=total.get_response_time_percentile(0.95) or 0,
+        rps=total.total_rps,
+        fail_ratio=total.fail_ratio,
+        max_p95_ms=options.max_p95,
+        min_rps=options.min_rps,
+        max_fail_ratio=options.max_fail_ratio,
+    )
+    for breach in breaches:
+        logger.error("Threshold breached: %s", breach)
+    if breaches:
+        environment.process_exit_code = 1
+
+
+class ProjectUser(HttpUser):
+    wait_time = between(0.1, 1.0)
+
+    def on_start(self) -> None:
+        self.rng = random.Random()
+        self.created: list[int] = []
+
+    def _read_headers(self) -> dict:
+        if self.rng.random() < self.environment.parsed_options.cache_bust:
+            return {"Cache-Control": "no-cache"}
+        return {}
+
+    @task(40)
+    def read_project(self) -> None:
+        if ZIPF is None:
+            return
+        project_id = ZIPF.sample(self.rng)
+        self.client.get(
+            f"/project/{project_id}",
+            headers=self._read_headers(),
+            name="/project/{project_id}",
+        )
+
+    @task(15)
+    def list_projects(self) -> None:
+        size = self.rng.choice((10, 25, 50, 100))
+        params = {
+            "page": self.rng.randint(1, max(1, len(SEEDED_IDS) // size)),
+            "size": size,
+            "sort": self.rng.choice(("project_id", "area", "-area")),
+            "include_geometry": self.rng.random() < 0.5,
+        }
+        with self.client.get(
+            "/projects/list",
+            params=params,
+            headers=self._read_headers(),
+            name="/projects/list",
+            catch_response=True,
+        ) as response:
+            if response.status_code == 418:
+                # Page past end, data shrank under concurrent deletes
+                response.success()
+
+    @task(5)
+    def search_projects(self) -> None:
+        latitude = self.rng.uniform(-60, 60)
+        longitude = self.rng.uniform(-170, 170)
+        bbox = (longitude, latitude, longitude + 10, latitude + 10)
+        self.client.get(
+            "/projects/search",
+            params={"bbox": ",".join(f"{value:.4f}" for value in bbox)},
+            headers=self._read_headers(),
+            name="/projects/search",
+        )
 
-from locust import HttpUser, task
+    @task(5)
+    def containing_projects(self) -> None:
+        self.client.get(
+            "/projects/containing",
+            params={
+                "lat": self.rng.uniform(-60, 60),
+                "lon": self.rng.uniform(-170, 170),
+            },
+            headers=self._read_headers(),
+            name="/projects/containing",
+        )
 
+    @task(15)
+    def create_project(self) -> None:
+        params, body = workload.project(
+            self.rng, f"{workload.NAME_PREFIX}{self.rng.randint(0, 10**9)}"
+        )
+        response = self.client.post(
+            "/project/", params=params, json=body, name="/project/"
+        )
+        if response.ok:
+            self.created.append(response.json()["Project_id"])
 
-class LocustTestAPI(HttpUser):
-    @task
-    def test_get_project(self):
-        project_id = random.randint(11,60)
-        self.client.get(f"/project/{project_id}")
+    @task(10)
+    def update_project(self) -> None:
+        if ZIPF is None:
+            return
+        project_id = ZIPF.sample(self.rng)
+        params, body = workload.project(
+            self.rng, f"{workload.SEED_NAME_PREFIX}{project_id}"
+        )
+        self.client.put(
+            f"/project/{project_id}",
+            params=params,
+            json=body,
+            name="/project/{project_id}",
+        )
 
-    @task
-    def test_get_projects(self):
-        query_params = {"page": 2, "size": 10}
-        self.client.get(f"/projects/list", params=query_params)
\ No newline at end of file
+    @task(10)
+    def delete_project(self) -> None:
+        if not self.created:
+            return
+        project_id = self.created.pop(self.rng.randrange(len(self.created)))
+        self.client.delete(
+            f"/project/{project_id}", name="/project/{project_id}"
+        )
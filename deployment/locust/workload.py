@@ -0,0 +1,114 @@
+"""
+Building blocks of `locustfile.py`, no locust imports here.
+Everything is driven by `random.Random` instances, so seeded dataset
+    is the same on every run and workers don't share random state.
+"""
+
+import bisect
+import itertools
+import math
+import random
+import typing
+from datetime import datetime, timedelta
+
+# Vertex counts of generated geometries with their weights,
+#   most projects are small, few are large enough to hurt
+GEOMETRY_SIZES: tuple[tuple[int, float], ...] = (
+    (8, 0.55),
+    (64, 0.30),
+    (512, 0.12),
+    (4_096, 0.03),
+)
+NAME_PREFIX: str = "locust-"
+SEED_NAME_PREFIX: str = "locust-seed-"
+
+
+class Zipf:
+    """
+    Samples from `items`, k-th item with probability ~ 1 / k^s.
+    Few projects get most reads, like real traffic, so cache hit ratio
+        and hot row contention are what production sees.
+    """
+
+    def __init__(self, items: typing.Sequence, s: float = 1.1) -> None:
+        self.items = list(items)
+        self.cumulative = list(
+            itertools.accumulate(
+                1 / rank**s for rank in range(1, len(self.items) + 1)
+            )
+        )
+
+    def sample(self, rng: random.Random) -> typing.Any:
+        point = rng.random() * self.cumulative[-1]
+        return self.items[bisect.bisect(self.cumulative, point)]
+
+
+def vertex_count(rng: random.Random) -> int:
+    sizes, weights = zip(*GEOMETRY_SIZES)
+    return rng.choices(sizes, weights=weights)[0]
+
+
+def ring(rng: random.Random, vertices: int) -> list[list[float]]:
+    """Star shaped ring of [lat, lon] pairs, as API request expects."""
+    latitude, longitude = rng.uniform(-60, 60), rng.uniform(-170, 170)
+    radius = rng.uniform(0.01, 2.0)
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(vertices))
+    return [
+        [
+            round(latitude + radius * rng.uniform(0.5, 1) * math.sin(a), 6),
+            round(longitude + radius * rng.uniform(0.5, 1) * math.cos(a), 6),
+        ]
+        for a in angles
+    ]
+
+
+def project(
+    rng: random.Random,
+    name: str,
+    vertices: typing.Optional[int] = None,
+) -> tuple[dict, dict]:
+    """
+    Query params and JSON body of `POST /project/` and `PUT /project/{id}`.
+    :return: (params, body)
+    """
+    end = datetime(2024, 1, 1) - timedelta(days=rng.randint(0, 3_000))
+    start = end - timedelta(days=rng.randint(1, 2_000))
+    params = {
+        "name": name[:32],
+        "date_range": [start.isoformat(), end.isoformat()],
+        "description": f"Load test project {rng.randint(0, 10**9)}",
+    }
+    body = {
+        "type": "Feature",
+        "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [[ring(rng, vertices or vertex_count(rng))]],
+        },
+    }
+    return params, body
+
+
+def seed_projects(count: int, seed: int = 0) -> typing.Iterator[tuple]:
+    """Known dataset, same `count` and `seed` always yield same projects."""
+    rng = random.Random(seed)
+    for number in range(count):
+        yield project(rng, f"{SEED_NAME_PREFIX}{number}")
+
+
+def check_thresholds(
+    p95_ms: float,
+    rps: float,
+    fail_ratio: float,
+    max_p95_ms: typing.Optional[float],
+    min_rps: typing.Optional[float],
+    max_fail_ratio: typing.Optional[float],
+) -> list[str]:
+    """:return: Human readable breaches, empty when run is within limits."""
+    breaches = []
+    if max_p95_ms is not None and p95_ms > max_p95_ms:
+        breaches.append(f"p95 {p95_ms:.0f} ms > {max_p95_ms:.0f} ms")
+    if min_rps is not None and rps < min_rps:
+        breaches.append(f"RPS {rps:.1f} < {min_rps:.1f}")
+    if max_fail_ratio is not None and fail_ratio > max_fail_ratio:
+        breaches.append(f"fail ratio {fail_ratio:.2%} > {max_fail_ratio:.2%}")
+    return breaches